@@ -0,0 +1,91 @@
+"""
+Benchmark quantized embedding storage against the float32 path.
+
+Generates synthetic class and document embeddings (documents are noisy mixtures
+of classes, like sentence embeddings of related texts) and compares, per
+quantization mode:
+
+- memory of the document embeddings,
+- time of scoring all documents against all classes the way the classifier does,
+  dequantizing one chunk of documents at a time before a float32 matmul,
+- maximum absolute error of the cosine similarities,
+- agreement of the most similar class with the float32 result.
+
+Quantization only saves memory, scoring is never faster than float32.
+
+Usage:
+    python -m benchmarks.bench_quantization --documents 100000 --classes 500
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from wrench.grouper.teleclass.core.quantization import dequantize, quantize
+
+# documents dequantized at once, the classifier's default chunk size
+CHUNK_SIZE = 4096
+
+
+def normalize(vectors: np.ndarray) -> np.ndarray:
+    """Scale vectors to unit length."""
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def main() -> None:
+    """Run the benchmark and print one result row per quantization mode."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--documents", type=int, default=100_000)
+    parser.add_argument("--classes", type=int, default=500)
+    parser.add_argument("--dimension", type=int, default=768)
+    parser.add_argument(
+        "--noise", type=float, default=3.0, help="norm of the noise per document"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    classes = normalize(rng.normal(size=(args.classes, args.dimension))).astype(
+        np.float32
+    )
+    labels = rng.integers(0, args.classes, size=(args.documents, 2))
+    documents = (
+        classes[labels[:, 0]]
+        + 0.5 * classes[labels[:, 1]]
+        + args.noise
+        * rng.normal(size=(args.documents, args.dimension))
+        / np.sqrt(args.dimension)
+    ).astype(np.float32)
+    reference = normalize(documents) @ classes.T
+    reference_top = reference.argmax(axis=1)
+
+    print(
+        f"{args.documents} documents, {args.classes} classes, "
+        f"dimension {args.dimension}\n"
+    )
+    print(f"{'mode':<8} {'MB':>8} {'score s':>8} {'max err':>9} {'top-1':>8}")
+    for mode in ("none", "float16", "int8"):
+        values, scales = quantize(documents, mode)  # type: ignore[arg-type]
+        nbytes = values.nbytes + (scales.nbytes if scales is not None else 0)
+
+        start = time.perf_counter()
+        scores = np.empty_like(reference)
+        for offset in range(0, len(values), CHUNK_SIZE):
+            chunk = slice(offset, offset + CHUNK_SIZE)
+            docs = dequantize(
+                values[chunk], scales[chunk] if scales is not None else None
+            )
+            scores[chunk] = normalize(docs) @ classes.T
+        elapsed = time.perf_counter() - start
+
+        error = np.abs(scores - reference).max()
+        agreement = np.mean(scores.argmax(axis=1) == reference_top)
+        print(
+            f"{mode:<8} {nbytes / 1e6:>8.1f} {elapsed:>8.3f} "
+            f"{error:>9.2e} {agreement:>8.2%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
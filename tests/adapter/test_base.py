@@ -0,0 +1,86 @@
+import json
+
+import pytest
+from ollama import ChatResponse, Message
+from pydantic import ValidationError
+
+from wrench.adapter.base import BaseCatalogAdapter
+from wrench.common.prompt_cache import PromptCache
+from wrench.grouper.base import Group
+from wrench.models import CatalogEntry
+
+ENTRY = {"name": "Air quality in City X", "description": "NO2 measurements."}
+
+
+class FakeClient:
+    """Answers chat requests with the given contents, one per request."""
+
+    def __init__(self, *contents):
+        self.contents = list(contents)
+        self.calls = 0
+
+    def chat(self, model, messages, format):
+        content = self.contents[self.calls]
+        self.calls += 1
+        return ChatResponse(
+            model=model, message=Message(role="assistant", content=content)
+        )
+
+
+class Adapter(BaseCatalogAdapter):
+    def create_service_entry(self, metadata):
+        raise NotImplementedError
+
+    def create_group_entry(self, service_entry, group):
+        return self._generate_catalog_data(service_entry, group)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return PromptCache(tmp_path / "prompts.sqlite")
+
+
+def make_adapter(client, cache):
+    adapter = Adapter("http://localhost:11434", "llama3", prompt_cache=cache)
+    adapter.llm = client
+    return adapter
+
+
+def create_entry(adapter):
+    service = CatalogEntry(name="City X FROST Server", description="Sensors")
+    group = Group(name="NO2", items=['{"@iot.id": 1}'])
+    return adapter.create_group_entry(service, group)
+
+
+def test_cached_entries_do_not_reach_the_llm(cache):
+    client = FakeClient(json.dumps(ENTRY))
+
+    first = create_entry(make_adapter(client, cache))
+    second = create_entry(make_adapter(client, cache))
+
+    assert first == second == CatalogEntry(**ENTRY)
+    assert client.calls == 1
+    assert len(cache) == 1
+
+
+def test_malformed_responses_are_not_cached(cache):
+    client = FakeClient('{"name": "Air quality"}', json.dumps(ENTRY))
+    adapter = make_adapter(client, cache)
+
+    with pytest.raises(ValidationError):
+        create_entry(adapter)
+    assert len(cache) == 0
+
+    assert create_entry(adapter) == CatalogEntry(**ENTRY)
+    assert client.calls == 2
+
+
+def test_malformed_cached_entries_are_requested_again(cache, mocker):
+    put = mocker.spy(cache, "put")
+    create_entry(make_adapter(FakeClient(json.dumps(ENTRY)), cache))
+    cache.put(put.call_args.args[0], "not json")
+    client = FakeClient(json.dumps(ENTRY))
+
+    assert create_entry(make_adapter(client, cache)) == CatalogEntry(**ENTRY)
+    assert client.calls == 1
+    assert cache.get(put.call_args.args[0]) == json.dumps(ENTRY)
@@ -0,0 +1,84 @@
+import json
+
+import pytest
+
+from wrench.adapter.base import AdapterConfig
+from wrench.adapter.sensorthings_to_sddi import SensorThingsSDDIAdapter
+from wrench.grouper.base import Group
+from wrench.harvester.sensorthings.construct import fast_construct
+from wrench.harvester.sensorthings.models import Thing
+from wrench.models import CatalogEntry, CommonMetadata
+
+THINGS = [
+    {
+        "@iot.id": 72,
+        "name": "Bicycle Count XYZ",
+        "description": "Bicycle Count (Location: XYZ)",
+        "properties": {"topic": "Bicycle count"},
+        "Locations": [
+            {
+                "@iot.id": 3,
+                "name": "XYZ",
+                "description": "Crossing XYZ",
+                "encodingType": "application/geo+json",
+                "location": {"type": "Point", "coordinates": [11.5, 48.1]},
+            },
+            {
+                "@iot.id": 4,
+                "name": "XZ",
+                "description": "Crossing XZ",
+                "encodingType": "application/geo+json",
+                "location": {"type": "Point", "coordinates": [11.6, 48.2]},
+            },
+        ],
+    },
+    {"@iot.id": "counter-2", "name": "Counter", "description": "No location"},
+]
+
+
+def make_adapter(mocker, trusted_items):
+    adapter = SensorThingsSDDIAdapter(
+        AdapterConfig(
+            llm_host="http://localhost:11434",
+            llm_model="llama3",
+            trusted_items=trusted_items,
+        )
+    )
+    mocker.patch.object(
+        adapter,
+        "_generate_catalog_data",
+        return_value=CatalogEntry(name="Bicycle counts", description="Counts"),
+    )
+    return adapter
+
+
+def create_group_entry(adapter):
+    service = adapter.create_service_entry(
+        CommonMetadata(
+            identifier="example",
+            title="Example",
+            description="Example server",
+            endpoint_url="https://example.com/v1.1",
+            source_type="sensorthings",
+        )
+    )
+    group = Group(
+        name="Bicycle count",
+        items=[json.dumps(thing) for thing in THINGS],
+        parent_classes={"mobility"},
+    )
+    return adapter.create_group_entry(service, group)
+
+
+@pytest.mark.parametrize("item", [json.dumps(thing) for thing in THINGS])
+def test_trusted_items_construct_validated_things(item):
+    assert fast_construct(Thing, json.loads(item)) == Thing.model_validate_json(item)
+
+
+def test_trusted_items_create_the_same_group_entry(mocker):
+    validated = create_group_entry(make_adapter(mocker, trusted_items=False))
+    trusted = create_group_entry(make_adapter(mocker, trusted_items=True))
+
+    assert trusted.model_dump() == validated.model_dump()
+    assert json.loads(trusted.spatial)["coordinates"] == [[11.5, 48.1], [11.6, 48.2]]
+    assert "counter-2" in trusted.resources[0]["url"]
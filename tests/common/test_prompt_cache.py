@@ -0,0 +1,63 @@
+import pytest
+
+from wrench.common.prompt_cache import PromptCache, prompt_key
+
+
+def messages(text):
+    return [{"role": "user", "content": text}]
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return PromptCache(tmp_path / "prompts.sqlite")
+
+
+def test_prompt_key_depends_on_request():
+    key = prompt_key("llama3", messages("a"), {"temperature": 0})
+
+    assert key == prompt_key("llama3", messages("a"), {"temperature": 0})
+    assert key != prompt_key("llama3", messages("b"), {"temperature": 0})
+    assert key != prompt_key("llama3", messages("a"), {"temperature": 1})
+    assert key != prompt_key("mistral", messages("a"), {"temperature": 0})
+    assert key != prompt_key("llama3", messages("a"), {"temperature": 0}, "json")
+
+
+def test_get_and_put(cache):
+    assert cache.get("key") is None
+
+    cache.put("key", "response")
+
+    assert cache.get("key") == "response"
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_delete(cache):
+    cache.put("key", "response")
+
+    cache.delete("key")
+    cache.delete("missing")
+
+    assert cache.get("key") is None
+    assert len(cache) == 0
+
+
+def test_responses_are_persisted(tmp_path, cache):
+    cache.put("key", "response")
+    cache.close()
+
+    assert PromptCache(tmp_path / "prompts.sqlite").get("key") == "response"
+
+
+def test_least_recently_used_responses_are_evicted(tmp_path):
+    # room for two entries of 1000 bytes plus their keys
+    cache = PromptCache(tmp_path / "prompts.sqlite", max_size_mb=2100 / 1024**2)
+    cache.put("a", "x" * 1000)
+    cache.put("b", "x" * 1000)
+    cache.get("a")
+
+    cache.put("c", "x" * 1000)
+
+    assert len(cache) == 2
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
@@ -0,0 +1,112 @@
+import numpy as np
+import pytest
+
+from wrench.grouper.teleclass.classifier.ann import IVFIndex
+from wrench.grouper.teleclass.classifier.similarity import SimilarityClassifier
+from wrench.grouper.teleclass.core.config import ClassifierConfig
+from wrench.grouper.teleclass.core.models import EnrichedClass
+from wrench.grouper.teleclass.core.taxonomy_manager import TaxonomyManager
+
+
+@pytest.fixture
+def vectors():
+    rng = np.random.default_rng(0)
+    centers = rng.normal(size=(20, 32))
+    return (
+        centers[rng.integers(0, 20, 2000)] + 0.3 * rng.normal(size=(2000, 32))
+    ).astype(np.float32)
+
+
+def test_search_recall(vectors):
+    index = IVFIndex(vectors, n_probe=4)
+    assert index.n_lists == 44
+
+    queries = vectors[:100] + 0.05
+    ids, scores = index.search(queries, k=10)
+    assert ids.shape == scores.shape == (100, 10)
+    assert np.all(np.diff(scores, axis=1) <= 0)
+
+    normalized = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    exact = np.argsort(-(queries @ normalized.T), axis=1)[:, :10]
+    recall = np.mean([len(set(a) & set(b)) / 10 for a, b in zip(ids, exact)])
+    assert recall > 0.9
+
+
+def test_search_pads_missing_neighbours():
+    index = IVFIndex(np.eye(3), n_lists=3, n_probe=1)
+    ids, scores = index.search(np.array([[1.0, 0.0, 0.0]]), k=5)
+    assert ids.tolist() == [[0, -1, -1, -1, -1]]
+    assert np.isneginf(scores[0, 1:]).all()
+    assert scores[0, 0] == pytest.approx(1.0)
+
+
+def test_empty_index():
+    with pytest.raises(ValueError):
+        IVFIndex(np.empty((0, 4)))
+
+
+def test_classifier_with_ann_index(taxonomy_manager, encoder, enriched_classes):
+    texts = ["air", "noise noise air", "traffic", "parking", "air traffic"]
+    exact = SimilarityClassifier(taxonomy_manager, encoder, enriched_classes)
+    config = ClassifierConfig(ann={"enabled": True, "min_classes": 1, "top_k": 2})
+    approximate = SimilarityClassifier(
+        taxonomy_manager, encoder, enriched_classes, config=config
+    )
+
+    assert approximate.ann_index is not None
+    assert exact.ann_index is None
+    assert approximate.predict_many(texts) == exact.predict_many(texts)
+
+
+class ArrayEncoder:
+    """Passes through precomputed embeddings."""
+
+    def encode(self, sentences, **kwargs):
+        return np.asarray(sentences, dtype=np.float32)
+
+
+@pytest.mark.parametrize("mode", ["top1", "beam"])
+def test_candidate_walk_matches_exact_scoring(mode):
+    rng = np.random.default_rng(1)
+    taxonomy = [
+        {
+            "name": f"c{i}",
+            "description": "",
+            "children": [
+                {
+                    "name": f"c{i}.{j}",
+                    "description": "",
+                    "children": [
+                        {"name": f"c{i}.{j}.{k}", "description": ""} for k in range(3)
+                    ],
+                }
+                for j in range(3)
+            ],
+        }
+        for i in range(4)
+    ]
+    taxonomy_manager = TaxonomyManager.from_config(taxonomy)
+    classes = [
+        EnrichedClass(class_name=name, terms=set(), embeddings=rng.normal(size=8))
+        for name in taxonomy_manager.get_all_classes()
+    ]
+    documents = rng.normal(size=(50, 8))
+    settings = {"mode": mode, "beam_width": 2}
+    exact = SimilarityClassifier(
+        taxonomy_manager, ArrayEncoder(), classes, config=ClassifierConfig(**settings)
+    )
+    # retrieving every class, the candidate walk must match exact scoring
+    approximate = SimilarityClassifier(
+        taxonomy_manager,
+        ArrayEncoder(),
+        classes,
+        config=ClassifierConfig(
+            ann={"enabled": True, "min_classes": 1, "top_k": 52, "n_probe": 100},
+            **settings,
+        ),
+    )
+
+    assert approximate.children is None
+    assert approximate.predict_embeddings(documents) == exact.predict_embeddings(
+        documents
+    )
@@ -0,0 +1,86 @@
+import numpy as np
+import pytest
+
+from wrench.grouper.teleclass.classifier.similarity import SimilarityClassifier
+from wrench.grouper.teleclass.core.config import ClassifierConfig
+
+
+@pytest.fixture
+def classifier(taxonomy_manager, encoder, enriched_classes):
+    return SimilarityClassifier(
+        taxonomy_manager=taxonomy_manager,
+        encoder=encoder,
+        enriched_classes=enriched_classes,
+        chunk_size=2,
+    )
+
+
+def test_predict_walks_hierarchy(classifier):
+    assert classifier.predict("noise barrier") == {"environment", "noise"}
+    assert classifier.predict("traffic jam") == {"mobility", "traffic"}
+
+
+def test_predict_many_matches_single_predictions(classifier):
+    texts = ["air", "noise", "traffic", "parking", "air traffic traffic"]
+    assert classifier.predict_many(texts) == [classifier.predict(t) for t in texts]
+    assert classifier.encoder.calls == 1 + len(texts)
+
+
+def test_predict_embeddings_in_chunks(classifier):
+    embeddings = np.eye(4, dtype=np.float32)
+    predictions = classifier.predict_embeddings(embeddings)
+    assert [p - {"environment", "mobility"} for p in predictions] == [
+        {"air quality"},
+        {"noise"},
+        {"traffic"},
+        {"parking"},
+    ]
+
+
+def test_classes_without_embeddings_are_not_reachable(
+    taxonomy_manager, encoder, enriched_classes
+):
+    classes = [ec for ec in enriched_classes if ec.class_name != "mobility"]
+    classifier = SimilarityClassifier(taxonomy_manager, encoder, classes)
+    assert classifier.predict("parking") == {"environment", "air quality"}
+
+
+@pytest.fixture
+def beam_classifier(taxonomy_manager, encoder, enriched_classes):
+    return SimilarityClassifier(
+        taxonomy_manager,
+        encoder,
+        enriched_classes,
+        config=ClassifierConfig(mode="beam", beam_width=3),
+    )
+
+
+def test_beam_keeps_multiple_paths(beam_classifier):
+    assert beam_classifier.predict_many(["air traffic", "air noise", "parking"]) == [
+        {"environment", "mobility", "air quality", "traffic"},
+        {"environment", "air quality", "noise"},
+        {"mobility", "parking"},
+    ]
+
+
+def test_beam_threshold_selection(taxonomy_manager, encoder, enriched_classes):
+    config = ClassifierConfig(mode="beam", selection="threshold", threshold=0.6)
+    classifier = SimilarityClassifier(
+        taxonomy_manager, encoder, enriched_classes, config=config
+    )
+    assert classifier.predict("air air noise") == {"environment", "air quality"}
+    # the most similar class is kept even below the threshold
+    assert classifier.predict("air traffic") == {"environment", "air quality"}
+
+
+def test_beam_width_one_matches_top1(
+    classifier, taxonomy_manager, encoder, enriched_classes
+):
+    beam = SimilarityClassifier(
+        taxonomy_manager,
+        encoder,
+        enriched_classes,
+        config=ClassifierConfig(mode="beam", beam_width=1),
+    )
+    texts = ["air", "air noise noise", "traffic parking parking", "air traffic"]
+    assert beam.predict_many(texts) == classifier.predict_many(texts)
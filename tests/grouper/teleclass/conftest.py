@@ -0,0 +1,81 @@
+import numpy as np
+import pytest
+
+from wrench.grouper.teleclass.core.encoder import cosine_similarity
+from wrench.grouper.teleclass.core.models import EnrichedClass
+from wrench.grouper.teleclass.core.taxonomy_manager import TaxonomyManager
+
+VOCABULARY = ["air", "noise", "traffic", "parking"]
+
+TAXONOMY = [
+    {
+        "name": "environment",
+        "description": "Environmental monitoring",
+        "children": [
+            {"name": "air quality", "description": "Air pollutants"},
+            {"name": "noise", "description": "Noise levels"},
+        ],
+    },
+    {
+        "name": "mobility",
+        "description": "Mobility and transport",
+        "children": [
+            {"name": "traffic", "description": "Traffic counts"},
+            {"name": "parking", "description": "Parking occupancy"},
+        ],
+    },
+]
+
+CLASS_EMBEDDINGS = {
+    "environment": [1.0, 1.0, 0.0, 0.0],
+    "air quality": [1.0, 0.0, 0.0, 0.0],
+    "noise": [0.0, 1.0, 0.0, 0.0],
+    "mobility": [0.0, 0.0, 1.0, 1.0],
+    "traffic": [0.0, 0.0, 1.0, 0.0],
+    "parking": [0.0, 0.0, 0.0, 1.0],
+}
+
+
+class KeywordEncoder:
+    """Encodes texts as counts of the vocabulary words they contain."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def get_sentence_embedding_dimension(self):
+        return len(VOCABULARY)
+
+    def encode(self, sentences, **kwargs):
+        self.calls += 1
+        texts = [sentences] if isinstance(sentences, str) else sentences
+        embeddings = np.array(
+            [[text.lower().count(word) for word in VOCABULARY] for text in texts],
+            dtype=np.float32,
+        ).reshape(len(texts), len(VOCABULARY))
+        return embeddings[0] if isinstance(sentences, str) else embeddings
+
+    def similarity(self, embeddings1, embeddings2):
+        return cosine_similarity(embeddings1, embeddings2)
+
+
+@pytest.fixture
+def encoder():
+    return KeywordEncoder()
+
+
+@pytest.fixture
+def taxonomy():
+    return TAXONOMY
+
+
+@pytest.fixture
+def taxonomy_manager(taxonomy):
+    return TaxonomyManager.from_config(taxonomy)
+
+
+@pytest.fixture
+def enriched_classes():
+    return [
+        EnrichedClass(class_name=name, terms=set(), embeddings=np.array(embedding))
+        for name, embedding in CLASS_EMBEDDINGS.items()
+    ]
@@ -0,0 +1,106 @@
+import numpy as np
+import pytest
+
+from wrench.grouper.teleclass.core.embeddings import (
+    CachedEncoder,
+    EmbeddingCache,
+    EmbeddingStore,
+)
+
+
+class CountingEncoder:
+    """Encodes a text as (length, number of spaces) and counts encoded texts."""
+
+    def __init__(self):
+        self.encoded = []
+
+    def get_sentence_embedding_dimension(self):
+        return 2
+
+    def encode(
+        self,
+        texts,
+        batch_size,
+        convert_to_numpy,
+        show_progress_bar,
+        normalize_embeddings=False,
+    ):
+        self.encoded.extend(texts)
+        embeddings = np.array(
+            [[len(text), text.count(" ")] for text in texts], dtype=np.float32
+        )
+        if normalize_embeddings:
+            embeddings /= np.linalg.norm(embeddings, axis=1, keepdims=True)
+        return embeddings
+
+
+@pytest.fixture
+def encoder():
+    return CountingEncoder()
+
+
+def test_cached_encoder_encodes_new_texts_only(tmp_path, encoder):
+    cached = CachedEncoder(encoder, EmbeddingStore(tmp_path))
+    first = cached.encode(["air quality", "noise", "air quality"])
+    assert first[:, 0].tolist() == [11, 5, 11]
+    assert encoder.encoded == ["air quality", "noise"]
+
+    single = cached.encode("noise")
+    assert single.tolist() == [5, 0]
+    assert encoder.encoded == ["air quality", "noise"]
+    assert cached.store.hits == 1
+
+
+def test_cached_encoder_keys_embeddings_by_options(tmp_path, encoder):
+    cached = CachedEncoder(encoder, EmbeddingStore(tmp_path))
+    raw = cached.encode("air quality", convert_to_numpy=True)
+
+    normalized = cached.encode("air quality", normalize_embeddings=True)
+
+    assert raw.tolist() == [11, 1]
+    np.testing.assert_allclose(np.linalg.norm(normalized), 1.0)
+    assert encoder.encoded == ["air quality", "air quality"]
+    np.testing.assert_array_equal(
+        cached.encode("air quality", normalize_embeddings=True), normalized
+    )
+    assert len(encoder.encoded) == 2
+
+
+def test_cached_encoder_rejects_tensor_output(tmp_path, encoder):
+    cached = CachedEncoder(encoder, EmbeddingStore(tmp_path))
+
+    with pytest.raises(ValueError, match="convert_to_tensor"):
+        cached.encode("air quality", convert_to_tensor=True)
+
+
+def test_store_persists_between_runs(tmp_path, encoder):
+    cache = EmbeddingCache(tmp_path)
+    cache.wrap(encoder, "org/model").encode(["parking", "traffic flow"])
+    cache.flush()
+
+    encoder.encoded.clear()
+    cached = EmbeddingCache(tmp_path).wrap(encoder, "org/model")
+    assert cached.encode(["traffic flow", "parking"])[:, 0].tolist() == [12, 7]
+    assert encoder.encoded == []
+
+    # stores are separated by model
+    EmbeddingCache(tmp_path).wrap(encoder, "other").encode("parking")
+    assert encoder.encoded == ["parking"]
+
+
+def test_store_evicts_least_recently_used(tmp_path):
+    # room for two 2-dimensional float32 embeddings
+    store = EmbeddingStore(tmp_path, max_size_mb=16 / 1024 / 1024)
+    store.put(["a", "b"], np.ones((2, 2)))
+    store.get(["a"])
+    store.put(["c"], np.zeros((1, 2)))
+
+    assert len(store) == 2
+    assert set(store.get(["a", "b", "c"])) == {"a", "c"}
+
+
+def test_store_rejects_other_dimension(tmp_path):
+    store = EmbeddingStore(tmp_path)
+    store.put(["a"], np.ones((1, 2)))
+    with pytest.raises(ValueError):
+        store.put(["b"], np.ones((1, 3)))
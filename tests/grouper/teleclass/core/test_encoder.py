@@ -0,0 +1,24 @@
+import numpy as np
+import pytest
+
+from wrench.grouper.teleclass.core.encoder import cosine_similarity, get_encoder
+
+
+def test_get_encoder_shares_instances():
+    encoder = get_encoder("shared-model")
+    assert get_encoder("shared-model") is encoder
+    assert get_encoder("other-model") is not encoder
+
+
+def test_similarity_does_not_load_model():
+    encoder = get_encoder("unloaded-model")
+    similarity = encoder.similarity([1.0, 0.0], [[2.0, 0.0], [0.0, 1.0], [1.0, 1.0]])
+
+    assert not encoder.loaded
+    assert similarity.shape == (1, 3)
+    assert similarity[0] == pytest.approx([1.0, 0.0, np.sqrt(0.5)])
+
+
+def test_cosine_similarity_matrix():
+    similarity = cosine_similarity(np.eye(2), np.eye(2))
+    assert similarity.tolist() == [[1.0, 0.0], [0.0, 1.0]]
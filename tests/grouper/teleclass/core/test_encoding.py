@@ -0,0 +1,30 @@
+import numpy as np
+
+from wrench.grouper.teleclass.core.encoding import encode_batched
+
+
+class LengthEncoder:
+    """Encodes a text as its length, recording the batches it receives."""
+
+    def __init__(self):
+        self.batches = []
+
+    def get_sentence_embedding_dimension(self):
+        return 2
+
+    def encode(self, texts, batch_size, convert_to_numpy, show_progress_bar):
+        self.batches.append(list(texts))
+        return np.array([[len(text), 1.0] for text in texts], dtype=np.float32)
+
+
+def test_encode_batched_keeps_input_order():
+    encoder = LengthEncoder()
+    texts = ["a", "abcd", "ab", "abcdef", "abc"]
+    embeddings = encode_batched(encoder, texts, batch_size=2)
+
+    assert embeddings[:, 0].tolist() == [1, 4, 2, 6, 3]
+    assert encoder.batches == [["abcdef", "abcd"], ["abc", "ab"], ["a"]]
+
+
+def test_encode_batched_empty():
+    assert encode_batched(LengthEncoder(), []).shape == (0, 2)
@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+
+from wrench.grouper.teleclass.classifier.similarity import SimilarityClassifier
+from wrench.grouper.teleclass.core.cache import TELEClassCache
+from wrench.grouper.teleclass.core.models import EnrichedClass
+from wrench.grouper.teleclass.core.projection import Projection
+
+
+@pytest.fixture
+def samples():
+    # 200 samples in a 3-dimensional affine subspace of a 16-dimensional space
+    rng = np.random.default_rng(0)
+    basis = rng.normal(size=(3, 16))
+    return (rng.normal(size=(200, 3)) @ basis + rng.normal(size=16)).astype(np.float32)
+
+
+def test_pca_preserves_distances_in_subspace(samples):
+    projection = Projection.fit(samples, dimension=3)
+    projected = projection.transform(samples)
+
+    assert projected.shape == (200, 3)
+    original = np.linalg.norm(samples[:10] - samples[10:20], axis=1)
+    reduced = np.linalg.norm(projected[:10] - projected[10:20], axis=1)
+    assert reduced == pytest.approx(original, rel=1e-3)
+
+
+def test_pca_limited_by_sample_count(samples):
+    assert Projection.fit(samples[:5], dimension=128).dimension == 5
+
+
+def test_random_projection(samples):
+    projection = Projection.fit(samples, dimension=8, method="random")
+    assert projection.transform(samples[0]).shape == (8,)
+    assert not projection.mean.any()
+
+
+def test_cache_stores_projection(tmp_path, samples):
+    cache = TELEClassCache(str(tmp_path))
+    classes = [EnrichedClass(class_name="a", terms=set(), embeddings=np.ones(3))]
+    cache.save_class_embeddings(classes)
+    assert cache.load_projection() is None
+
+    projection = Projection.fit(samples, dimension=3)
+    cache.save_class_embeddings(classes, projection)
+    loaded = cache.load_projection()
+    assert loaded.components == pytest.approx(projection.components)
+    assert loaded.mean == pytest.approx(projection.mean)
+
+
+def test_classifier_projects_documents(taxonomy_manager, encoder, enriched_classes):
+    texts = ["air", "noise noise air", "traffic", "parking", "air traffic"]
+    expected = SimilarityClassifier(
+        taxonomy_manager, encoder, enriched_classes
+    ).predict_many(texts)
+
+    # a permutation of the axes, class embeddings are stored projected
+    projection = Projection(np.zeros(4), np.eye(4)[[2, 0, 3, 1]])
+    projected = [
+        ec.model_copy(update={"embeddings": projection.transform(ec.embeddings)})
+        for ec in enriched_classes
+    ]
+    classifier = SimilarityClassifier(
+        taxonomy_manager, encoder, projected, projection=projection
+    )
+    assert classifier.predict_many(texts) == expected
@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from wrench.grouper.teleclass.core.cache import TELEClassCache
+from wrench.grouper.teleclass.core.embeddings import EmbeddingStore
+from wrench.grouper.teleclass.core.models import EnrichedClass
+from wrench.grouper.teleclass.core.quantization import dequantize, quantize
+
+
+@pytest.fixture
+def embeddings():
+    return np.random.default_rng(0).normal(size=(50, 16)).astype(np.float32)
+
+
+@pytest.mark.parametrize(
+    ("mode", "dtype", "tolerance"),
+    [("none", np.float32, 0), ("float16", np.float16, 1e-2), ("int8", np.int8, 3e-2)],
+)
+def test_quantize_roundtrip(embeddings, mode, dtype, tolerance):
+    values, scales = quantize(embeddings, mode)
+    assert values.dtype == dtype
+    assert (scales is not None) == (mode == "int8")
+    assert np.abs(dequantize(values, scales) - embeddings).max() <= tolerance
+
+
+def test_quantize_single_vector(embeddings):
+    values, scale = quantize(embeddings[0], "int8")
+    assert values.shape == (16,)
+    assert dequantize(values, scale) == pytest.approx(embeddings[0], abs=3e-2)
+
+
+def test_int8_embedding_store(tmp_path, embeddings):
+    store = EmbeddingStore(tmp_path, quantization="int8")
+    keys = [str(i) for i in range(len(embeddings))]
+    store.put(keys, embeddings)
+    store.flush()
+
+    restored = EmbeddingStore(tmp_path, quantization="int8").get(keys)
+    assert np.abs(np.stack([restored[k] for k in keys]) - embeddings).max() < 3e-2
+
+    # a store written with another representation is discarded
+    assert len(EmbeddingStore(tmp_path, quantization="float16")) == 0
+
+
+def test_quantized_class_embedding_cache(tmp_path, embeddings):
+    cache = TELEClassCache(str(tmp_path), quantization="int8")
+    cache.save_class_embeddings(
+        [
+            EnrichedClass(class_name=f"class {i}", terms=set(), embeddings=e)
+            for i, e in enumerate(embeddings[:5])
+        ]
+    )
+    loaded = cache.load_class_embeddings()
+    assert [ec.class_name for ec in loaded] == [f"class {i}" for i in range(5)]
+    assert loaded[0].embeddings.dtype == np.float32
+    assert np.abs(loaded[4].embeddings - embeddings[4]).max() < 3e-2
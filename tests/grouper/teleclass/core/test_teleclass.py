@@ -0,0 +1,130 @@
+import os
+
+import pytest
+
+from wrench.grouper.teleclass.core.config import TELEClassConfig
+from wrench.grouper.teleclass.core.grouping import GroupCollector
+from wrench.grouper.teleclass.core.teleclass import TELEClassGrouper
+from wrench.models import Item
+
+
+@pytest.fixture
+def grouper(tmp_path, taxonomy, encoder, enriched_classes):
+    config = TELEClassConfig(
+        llm={"host": "http://localhost:11434", "model": "llama3"},
+        embedding={"cache": False},
+        cache={"directory": str(tmp_path / "cache")},
+        taxonomy_metadata={"name": "Urban sensors"},
+        taxonomy=taxonomy,
+    )
+    grouper = TELEClassGrouper(config)
+    grouper.encoder = encoder
+    grouper.cache.save_class_embeddings(enriched_classes)
+    return grouper
+
+
+def test_disabled_cache_writes_no_embeddings(tmp_path, taxonomy, encoder, mocker):
+    mocker.patch(
+        "wrench.grouper.teleclass.core.teleclass.get_encoder", return_value=encoder
+    )
+    config = TELEClassConfig(
+        llm={"host": "http://localhost:11434", "model": "llama3"},
+        cache={"enabled": False, "directory": str(tmp_path / "cache")},
+        taxonomy_metadata={"name": "Urban sensors"},
+        taxonomy=taxonomy,
+    )
+
+    grouper = TELEClassGrouper(config)
+    grouper.encoder.encode(["Air sensor", "Parking garage"])
+
+    assert grouper.embedding_cache is None
+    assert not (tmp_path / "cache" / "embeddings").exists()
+
+
+def test_predict_many(grouper):
+    predictions = grouper.predict_many(["Air sensor", "Parking garage"])
+    assert predictions == [{"environment", "air quality"}, {"mobility", "parking"}]
+
+
+def test_classifier_stays_resident(grouper, mocker):
+    load = mocker.spy(grouper.cache, "load_class_embeddings")
+    grouper.predict("noise")
+    grouper.predict("traffic")
+    grouper.predict_many(["air", "parking"])
+    assert load.call_count == 1
+
+
+def test_classifier_reloads_changed_cache(grouper, enriched_classes, mocker):
+    assert grouper.predict("traffic") == {"mobility", "traffic"}
+
+    # swap the embeddings of both leaves under mobility
+    for ec in enriched_classes:
+        if ec.class_name in ("traffic", "parking"):
+            ec.embeddings = ec.embeddings[[0, 1, 3, 2]]
+    grouper.cache.save_class_embeddings(enriched_classes)
+    stat = grouper.cache.embeddings_path.stat()
+    os.utime(grouper.cache.embeddings_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+
+    assert grouper.predict("traffic") == {"mobility", "parking"}
+
+
+def test_classify_stream_micro_batches(grouper, encoder, taxonomy_manager):
+    consumed = []
+
+    def items():
+        for item_id in ["air-1", "parking-1", "noise-1"]:
+            consumed.append(item_id)
+            yield Item(id=item_id)
+
+    collector = GroupCollector(taxonomy_manager)
+    stream = grouper.classify_stream(items(), batch_size=2, collector=collector)
+
+    assert next(stream) == ("air-1", {"environment", "air quality"})
+    assert consumed == ["air-1", "parking-1"]
+    assert list(stream) == [
+        ("parking-1", {"mobility", "parking"}),
+        ("noise-1", {"environment", "noise"}),
+    ]
+    assert encoder.calls == 2
+    assert {group.name: len(group.items) for group in collector.groups()} == {
+        "air quality": 1,
+        "parking": 1,
+        "noise": 1,
+    }
+
+
+def test_classify_stream_flushes_embeddings_when_done(grouper, mocker):
+    grouper.embedding_cache = mocker.Mock()
+    items = [Item(id=f"air-{i}") for i in range(5)]
+
+    stream = grouper.classify_stream(items, batch_size=1)
+    next(stream)
+    grouper.embedding_cache.flush.assert_not_called()
+
+    assert len(list(stream)) == 4
+    grouper.embedding_cache.flush.assert_called_once()
+
+
+def test_run_closes_llm_enricher(grouper, mocker):
+    close = mocker.patch.object(grouper.llm_enricher, "close")
+    mocker.patch.object(grouper, "_perform_llm_enrichment", side_effect=ConnectionError)
+
+    with pytest.raises(ConnectionError):
+        grouper.run([])
+
+    close.assert_called_once()
+
+
+def test_group_items_streams_items(grouper):
+    grouper.config.classifier.stream_batch_size = 1
+    grouper.predict("air")
+
+    groups = grouper.group_items([Item(id="air-1"), Item(id="air-2")])
+
+    assert len(groups) == 1
+    assert groups[0].name == "air quality"
+    assert groups[0].parent_classes == {"environment"}
+    assert groups[0].items == [
+        Item(id="air-1").model_dump_json(),
+        Item(id="air-2").model_dump_json(),
+    ]
@@ -0,0 +1,175 @@
+import threading
+import warnings
+
+import numpy as np
+import pytest
+
+from wrench.grouper.teleclass.core.config import CorpusConfig
+from wrench.grouper.teleclass.core.models import Document, EnrichedClass
+from wrench.grouper.teleclass.enrichment import corpus
+from wrench.grouper.teleclass.enrichment.corpus import CorpusEnricher, share_array
+
+DOCUMENTS = {
+    "air quality": [
+        "Air quality sensor measuring particulate matter near the main road",
+        "Particulate matter and nitrogen dioxide air quality monitoring station",
+    ],
+    "noise": ["Noise level sensor recording traffic noise at night"],
+    "traffic": [
+        "Traffic counting camera at the main road intersection",
+        "Induction loop traffic counting sensor for vehicles",
+    ],
+}
+
+
+@pytest.fixture
+def collection(encoder):
+    return [
+        Document(
+            id=f"{class_name}-{i}",
+            content=content,
+            embeddings=encoder.encode(content),
+            core_classes={class_name},
+        )
+        for class_name, contents in DOCUMENTS.items()
+        for i, content in enumerate(contents)
+    ]
+
+
+@pytest.fixture(params=["yake", "tfidf"])
+def enricher(request, taxonomy_manager, encoder):
+    config = CorpusConfig(top_n=3, keyphrase={"backend": request.param})
+    return CorpusEnricher(config, taxonomy_manager, encoder)
+
+
+def test_enrich_adds_terms_from_class_documents(enricher, collection):
+    enriched_classes = [
+        EnrichedClass(class_name=name, terms=set()) for name in DOCUMENTS
+    ]
+
+    result = enricher.enrich(enriched_classes, collection).ClassEnrichment
+
+    for ec in result:
+        class_text = " ".join(DOCUMENTS[ec.class_name]).lower()
+        assert 0 < len(ec.terms) <= 3
+        assert all(term.term.lower() in class_text for term in ec.terms)
+        assert all(0 <= term.distinctiveness <= 1 for term in ec.terms)
+        assert ec.embeddings.shape == (len(ec.terms), 4)
+
+
+def test_enrich_requires_core_classes(enricher, collection):
+    collection[0].core_classes = None
+
+    with pytest.raises(ValueError, match="Core classes"):
+        enricher.enrich([EnrichedClass(class_name="noise", terms=set())], collection)
+
+
+def test_calculate_distinctiveness_requires_index(enricher):
+    with pytest.raises(RuntimeError):
+        enricher.calculate_distinctiveness(["air"], "air quality", [])
+
+
+def test_enrich_encodes_terms_and_class_names_once(enricher, collection, encoder):
+    enriched_classes = [
+        EnrichedClass(class_name=name, terms=set()) for name in DOCUMENTS
+    ]
+
+    result = enricher.enrich(enriched_classes, collection).ClassEnrichment
+
+    # one batch of deduplicated terms and one batch of class names
+    assert encoder.calls - len(collection) == 2
+    for ec in result:
+        terms = [term_score.term for term_score in ec.terms]
+        np.testing.assert_array_equal(ec.embeddings, encoder.encode(terms))
+
+
+def test_index_class_documents(enricher, collection):
+    collection[0].core_classes = {"air quality", "environment"}
+
+    assert enricher.index_class_documents(collection) == {
+        "air quality": [0, 1],
+        "environment": [0],
+        "noise": [2],
+        "traffic": [3, 4],
+    }
+
+
+def test_get_sibling_classes(enricher):
+    assert enricher.get_sibling_classes("air quality") == ["noise"]
+    assert enricher.get_sibling_classes("mobility") == ["environment"]
+
+
+def enrich_terms(taxonomy_manager, encoder, collection, workers):
+    enricher = CorpusEnricher(
+        CorpusConfig(top_n=3, workers=workers), taxonomy_manager, encoder
+    )
+    result = enricher.enrich(
+        [EnrichedClass(class_name=name, terms=set()) for name in DOCUMENTS],
+        collection,
+    )
+    return {
+        ec.class_name: {
+            (t.term, t.popularity, t.distinctiveness, t.semantic_similarity)
+            for t in ec.terms
+        }
+        for ec in result.ClassEnrichment
+    }
+
+
+def test_parallel_enrichment_matches_serial(taxonomy_manager, encoder, collection):
+    assert enrich_terms(taxonomy_manager, encoder, collection, workers=2) == (
+        enrich_terms(taxonomy_manager, encoder, collection, workers=1)
+    )
+
+
+def test_parallel_enrichment_does_not_fork_threads(
+    taxonomy_manager, encoder, collection
+):
+    # stands in for the threads an encoder starts before the enrichment
+    stop = threading.Event()
+    thread = threading.Thread(target=stop.wait)
+    thread.start()
+    try:
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always")
+            terms = enrich_terms(taxonomy_manager, encoder, collection, workers=2)
+    finally:
+        stop.set()
+        thread.join()
+
+    assert not [w for w in caught if "fork" in str(w.message)]
+    assert terms == enrich_terms(taxonomy_manager, encoder, collection, workers=1)
+
+
+def test_enrich_starts_one_worker_pool(taxonomy_manager, encoder, collection, mocker):
+    pool = mocker.patch.object(
+        corpus, "ProcessPoolExecutor", side_effect=corpus.ProcessPoolExecutor
+    )
+
+    enrich_terms(taxonomy_manager, encoder, collection, workers=2)
+
+    assert pool.call_count == 1
+
+
+def test_worker_state_leaves_out_unread_state(enricher, collection):
+    enricher.enrich(
+        [EnrichedClass(class_name=name, terms=set()) for name in DOCUMENTS],
+        collection,
+    )
+
+    state = enricher._worker_state()
+
+    assert enricher.keyphrase_extractor.cache
+    assert not state.keyphrase_extractor.cache
+    assert state.keyphrase_extractor.cache_path is None
+    assert state.encoder is None
+    assert state.semantic_similarities is None
+    assert state.contents == []
+    assert state.corpus_index is enricher.corpus_index
+
+
+def test_share_array():
+    array = np.arange(6, dtype=np.float32).reshape(2, 3)
+
+    with share_array(array) as shared:
+        np.testing.assert_array_equal(shared.attach(), array)
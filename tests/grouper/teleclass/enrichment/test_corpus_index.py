@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+
+from wrench.grouper.teleclass.enrichment.corpus_index import CorpusIndex, tokenize
+
+CLASS_DOCS = {
+    "air quality": ["PM10 air sensor", "Air quality station, NO2 air sensor"],
+    "noise": ["Noise sensor at the main station"],
+    "traffic": ["Traffic counter", "Traffic light sensor"],
+}
+
+
+@pytest.fixture
+def index():
+    documents = [doc for docs in CLASS_DOCS.values() for doc in docs]
+    class_doc_ids = {
+        name: [documents.index(doc) for doc in docs]
+        for name, docs in CLASS_DOCS.items()
+    }
+    return CorpusIndex(documents, class_doc_ids)
+
+
+def test_tokenize():
+    assert tokenize("Air-quality, PM10!") == ["air", "quality", "pm10"]
+
+
+def test_term_frequencies_match_phrases_on_token_boundaries(index):
+    tf = index.term_frequencies(
+        ["air sensor", "sensor", "station", "air sens", "unknown"],
+        ["air quality", "noise", "missing"],
+    )
+    np.testing.assert_array_equal(
+        tf,
+        [[2, 0, 0], [2, 1, 0], [1, 1, 0], [0, 0, 0], [0, 0, 0]],
+    )
+
+
+def test_distinctiveness(index):
+    scores = index.distinctiveness(
+        ["air sensor", "station", "traffic"], "air quality", ["noise", "traffic"]
+    )
+
+    assert scores[0] > 0.5
+    # shared with a sibling, but more frequent in the class
+    assert 1 / 3 < scores[1] < scores[0]
+    assert scores[2] < 1 / 3
+
+
+def test_distinctiveness_without_siblings(index):
+    np.testing.assert_allclose(
+        index.distinctiveness(["air", "noise"], "air quality", []), [1.0, 1.0]
+    )
+
+
+def test_document_frequencies_count_each_document_once(index):
+    df = index.document_frequencies(
+        ["air", "air sensor", "traffic", "station"], ["air quality", "traffic"]
+    )
+    np.testing.assert_array_equal(df, [[2, 0], [2, 0], [0, 2], [1, 0]])
+
+
+def test_documents_of_several_classes_count_for_each():
+    index = CorpusIndex(["air sensor", "noise"], {"a": [0, 1], "b": [0]})
+
+    np.testing.assert_array_equal(
+        index.term_frequencies(["sensor", "noise"], ["a", "b"]), [[1, 1], [1, 0]]
+    )
+    np.testing.assert_array_equal(index.lengths, [3, 2])
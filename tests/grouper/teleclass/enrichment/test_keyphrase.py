@@ -0,0 +1,102 @@
+import pytest
+
+from wrench.grouper.teleclass.core.config import KeyphraseConfig
+from wrench.grouper.teleclass.enrichment.keyphrase import (
+    TFIDFExtractor,
+    YAKEExtractor,
+    create_extractor,
+)
+
+CLASS_DOCS = [
+    "Air quality sensor for particulate matter",
+    "Particulate matter sensor at the station",
+]
+SIBLING_DOCS = ["Noise sensor at the station", "Noise level sensor"]
+
+
+def test_tfidf_prefers_phrases_rare_in_siblings():
+    extractor = TFIDFExtractor(top_n=2)
+
+    assert extractor.extract(CLASS_DOCS, SIBLING_DOCS) == [
+        "particulate matter",
+        "matter",
+    ]
+
+
+def test_tfidf_skips_stopwords_and_numbers():
+    phrases = dict(TFIDFExtractor().extract_document("The sensor of 2024 at the"))
+
+    assert "sensor" in phrases
+    assert not {"the", "of", "2024", "sensor of", "the sensor"} & phrases.keys()
+
+
+def test_document_results_are_cached_by_content(mocker):
+    extractor = TFIDFExtractor()
+    extract_document = mocker.spy(extractor, "extract_document")
+
+    extractor.extract(CLASS_DOCS, SIBLING_DOCS)
+    extractor.extract(SIBLING_DOCS, CLASS_DOCS)
+
+    assert extract_document.call_count == 4
+    assert extractor.missing(CLASS_DOCS + ["new"]) == ["new"]
+
+
+def test_cache_is_persisted(tmp_path):
+    config = KeyphraseConfig(backend="yake")
+    extractor = create_extractor(config, cache_dir=tmp_path)
+    assert isinstance(extractor, YAKEExtractor)
+    expected = extractor.extract(CLASS_DOCS)
+    extractor.save()
+
+    reloaded = create_extractor(config, cache_dir=tmp_path)
+
+    assert reloaded.cache_key(CLASS_DOCS[0]) in reloaded.cache
+    assert reloaded.missing(CLASS_DOCS) == []
+    assert reloaded.extract(CLASS_DOCS) == expected
+
+
+@pytest.mark.parametrize("cache", [True, False])
+def test_create_extractor_without_cache(tmp_path, cache):
+    config = KeyphraseConfig(backend="tfidf", cache=cache)
+
+    extractor = create_extractor(config, cache_dir=tmp_path)
+
+    assert isinstance(extractor, TFIDFExtractor)
+    assert (extractor.cache_path is not None) == cache
+
+
+def test_cache_is_keyed_by_extractor_settings(tmp_path):
+    extractor = create_extractor(KeyphraseConfig(backend="yake"), cache_dir=tmp_path)
+    extractor.extract(CLASS_DOCS)
+    extractor.save()
+
+    def missing(config, max_ngram=3):
+        reloaded = create_extractor(config, max_ngram, cache_dir=tmp_path)
+        return reloaded.missing(CLASS_DOCS)
+
+    assert missing(KeyphraseConfig(backend="yake")) == []
+    assert missing(KeyphraseConfig(backend="yake", top_n=2)) == CLASS_DOCS
+    assert missing(KeyphraseConfig(backend="yake"), max_ngram=2) == CLASS_DOCS
+
+
+def test_tfidf_cache_ignores_top_n():
+    extractor = TFIDFExtractor(top_n=2)
+
+    assert extractor.cache_key("text") == TFIDFExtractor(top_n=5).cache_key("text")
+    assert extractor.cache_key("text") != TFIDFExtractor(max_ngram=2).cache_key("text")
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    extractor = TFIDFExtractor(cache_path=tmp_path / "cache.json", max_size_mb=1e-3)
+    documents = [f"sensor {i} station" for i in range(20)]
+    extractor.extract(documents[:2])
+    extractor.extract(documents[2:])
+    extractor.extract(documents[-1:])
+    extractor.save()
+
+    reloaded = TFIDFExtractor(cache_path=tmp_path / "cache.json", max_size_mb=1e-3)
+
+    assert 1 < len(extractor.cache) < len(documents)
+    assert extractor.missing(documents[:2]) == documents[:2]
+    assert extractor.missing(documents[-1:]) == []
+    assert list(reloaded.cache) == list(extractor.cache)
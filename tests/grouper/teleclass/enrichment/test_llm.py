@@ -0,0 +1,181 @@
+import json
+import threading
+
+import pytest
+
+from wrench.common.prompt_cache import PromptCache
+from wrench.grouper.teleclass.core.config import LLMConfig
+from wrench.grouper.teleclass.core.models import Document, EnrichedClass
+from wrench.grouper.teleclass.enrichment.llm import LLMEnricher
+
+
+class FakeClient:
+    """Generates terms naming the class, and selects "noise" as core class."""
+
+    def __init__(self, valid_json=True):
+        self.prompts = []
+        self.valid_json = valid_json
+        self.lock = threading.Lock()
+
+    def chat(self, model, messages, options, format=None):
+        prompt = messages[-1]["content"]
+        with self.lock:
+            self.prompts.append(prompt)
+        if isinstance(format, dict):
+            if "Generate" in prompt:
+                answer = {
+                    name: [f"{name} sensor", f"{name} data"]
+                    for name in format["required"]
+                }
+            else:
+                answer = {
+                    number: ["environment", "noise"] for number in format["required"]
+                }
+            content = json.dumps(answer) if self.valid_json else "noise"
+            return {"message": {"content": content}}
+        if "Generate" in prompt:
+            class_name = prompt.split("'")[1]
+            return {"message": {"content": f"{class_name} sensor, {class_name} data"}}
+        return {"message": {"content": "environment, noise"}}
+
+
+@pytest.fixture
+def client():
+    return FakeClient()
+
+
+def make_enricher(taxonomy_manager, encoder, client, prompt_cache=None, **settings):
+    config = LLMConfig(
+        host="http://localhost:11434", model="llama3", concurrency=4, **settings
+    )
+    enricher = LLMEnricher(config, taxonomy_manager, encoder, prompt_cache=prompt_cache)
+    enricher.executor.client = client
+    return enricher
+
+
+@pytest.fixture
+def enricher(taxonomy_manager, encoder, client):
+    return make_enricher(taxonomy_manager, encoder, client)
+
+
+@pytest.fixture
+def collection(encoder):
+    return [
+        Document(id=str(i), content=text, embeddings=encoder.encode(text))
+        for i, text in enumerate(["noise sensor", "noise level", "air sensor"])
+    ]
+
+
+def new_classes(taxonomy_manager):
+    return [
+        EnrichedClass(class_name=name, terms=set())
+        for name in taxonomy_manager.get_all_classes()
+    ]
+
+
+def assert_terms_name_class(enriched_classes):
+    for ec in enriched_classes:
+        assert {t.term for t in ec.terms} == {
+            f"{ec.class_name} sensor",
+            f"{ec.class_name} data",
+        }
+        assert ec.embeddings.shape == (2, 4)
+
+
+def test_enrich_classes_with_terms(enricher, client, taxonomy_manager):
+    enriched_classes = new_classes(taxonomy_manager)
+
+    result = enricher.enrich_classes_with_terms(enriched_classes)
+
+    assert len(client.prompts) == len(enriched_classes)
+    assert_terms_name_class(result)
+
+
+def test_enrich_sibling_groups_with_one_request(taxonomy_manager, encoder, client):
+    enricher = make_enricher(taxonomy_manager, encoder, client, group_terms=True)
+
+    result = enricher.enrich_classes_with_terms(new_classes(taxonomy_manager))
+
+    # the roots, the children of environment and the children of mobility
+    assert len(client.prompts) == 3
+    assert_terms_name_class(result)
+
+
+def test_unparsable_group_falls_back_to_single_classes(taxonomy_manager, encoder):
+    client = FakeClient(valid_json=False)
+    enricher = make_enricher(taxonomy_manager, encoder, client, group_terms=True)
+    enriched_classes = new_classes(taxonomy_manager)
+
+    result = enricher.enrich_classes_with_terms(enriched_classes)
+
+    assert len(client.prompts) == 3 + len(enriched_classes)
+    assert_terms_name_class(result)
+
+
+def test_assign_classes_to_docs(enricher, client, enriched_classes, collection):
+    result = enricher.assign_classes_to_docs(collection, enriched_classes)
+
+    assert [doc.core_classes for doc in result] == [{"environment", "noise"}] * 3
+    assert len(client.prompts) == 3
+
+
+def test_assign_classes_to_docs_in_batches(
+    taxonomy_manager, encoder, client, enriched_classes, collection
+):
+    enricher = make_enricher(taxonomy_manager, encoder, client, core_class_batch_size=2)
+
+    result = enricher.assign_classes_to_docs(collection, enriched_classes)
+
+    assert [doc.core_classes for doc in result] == [{"environment", "noise"}] * 3
+    assert len(client.prompts) == 2
+    assert "Document 2:" in client.prompts[0]
+
+
+def test_batches_respect_token_budget(taxonomy_manager, encoder, client, collection):
+    enricher = make_enricher(
+        taxonomy_manager,
+        encoder,
+        client,
+        core_class_batch_size=10,
+        core_class_token_budget=1,
+    )
+    candidates = [{0: {"environment"}}] * len(collection)
+
+    assert enricher._batch_documents(collection, candidates) == [[0], [1], [2]]
+
+
+def test_unparsable_batch_falls_back_to_single_documents(
+    taxonomy_manager, encoder, enriched_classes, collection
+):
+    client = FakeClient(valid_json=False)
+    enricher = make_enricher(taxonomy_manager, encoder, client, core_class_batch_size=3)
+
+    result = enricher.assign_classes_to_docs(collection, enriched_classes)
+
+    assert [doc.core_classes for doc in result] == [{"environment", "noise"}] * 3
+    assert len(client.prompts) == 1 + 3
+
+
+def test_unparsable_answers_are_not_cached(
+    taxonomy_manager, encoder, enriched_classes, collection, tmp_path
+):
+    cache = PromptCache(tmp_path / "prompts.sqlite")
+
+    def run():
+        client = FakeClient(valid_json=False)
+        enricher = make_enricher(
+            taxonomy_manager,
+            encoder,
+            client,
+            cache,
+            group_terms=True,
+            core_class_batch_size=3,
+        )
+        enricher.enrich_classes_with_terms(new_classes(taxonomy_manager))
+        enricher.assign_classes_to_docs(collection, enriched_classes)
+        return client.prompts
+
+    run()
+
+    # only the group and batch requests are sent again, the fallbacks are cached
+    assert len(run()) == 3 + 1
@@ -0,0 +1,130 @@
+import threading
+import time
+
+import pytest
+
+from wrench.common.prompt_cache import PromptCache
+from wrench.grouper.teleclass.enrichment.llm_executor import LLMExecutor
+
+
+class FakeClient:
+    """Answers chat requests with the prompt, optionally failing first."""
+
+    def __init__(self, failures=0, delay=0.0):
+        self.failures = failures
+        self.delay = delay
+        self.calls = 0
+        self.active = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+
+    def chat(self, model, messages, options, format):
+        with self.lock:
+            self.calls += 1
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+            fail = self.calls <= self.failures
+        time.sleep(self.delay)
+        with self.lock:
+            self.active -= 1
+        if fail:
+            raise ConnectionError("unavailable")
+        return {"message": {"content": messages[-1]["content"]}}
+
+
+def messages(text):
+    return [{"role": "user", "content": text}]
+
+
+def test_requests_run_concurrently_up_to_the_limit():
+    client = FakeClient(delay=0.05)
+    executor = LLMExecutor(client, "llama3", concurrency=3)
+
+    futures = [executor.submit(messages(str(i))) for i in range(9)]
+
+    assert [f.result()["message"]["content"] for f in futures] == [
+        str(i) for i in range(9)
+    ]
+    assert client.max_active == 3
+
+
+def test_identical_in_flight_requests_are_coalesced():
+    client = FakeClient(delay=0.05)
+    executor = LLMExecutor(client, "llama3")
+
+    first = executor.submit(messages("same"))
+    second = executor.submit(messages("same"))
+
+    assert first is second
+    first.result()
+    executor.chat(messages("same"))
+    assert client.calls == 2
+
+
+def test_failed_requests_are_retried():
+    client = FakeClient(failures=2)
+    executor = LLMExecutor(client, "llama3", retries=2, backoff=0)
+
+    assert executor.chat(messages("hi"))["message"]["content"] == "hi"
+    assert client.calls == 3
+
+
+def test_last_error_is_raised_after_retries():
+    executor = LLMExecutor(FakeClient(failures=5), "llama3", retries=1, backoff=0)
+
+    with pytest.raises(ConnectionError):
+        executor.chat(messages("hi"))
+
+
+def test_cached_requests_do_not_reach_the_llm(tmp_path):
+    client = FakeClient()
+    cache = PromptCache(tmp_path / "prompts.sqlite")
+    LLMExecutor(client, "llama3", cache=cache).chat(messages("hi"))
+
+    response = LLMExecutor(client, "llama3", cache=cache).chat(messages("hi"))
+
+    assert response["message"]["content"] == "hi"
+    assert response.message.content == "hi"
+    assert client.calls == 1
+
+
+def test_rejected_responses_are_not_cached(tmp_path):
+    client = FakeClient()
+    cache = PromptCache(tmp_path / "prompts.sqlite")
+
+    def reject(content):
+        raise ValueError(f"malformed: {content}")
+
+    response = LLMExecutor(client, "llama3", cache=cache).chat(
+        messages("hi"), validate=reject
+    )
+    LLMExecutor(client, "llama3", cache=cache).chat(messages("hi"), validate=reject)
+
+    assert response["message"]["content"] == "hi"
+    assert client.calls == 2
+    assert len(cache) == 0
+
+
+def test_rejected_cached_responses_are_requested_again(tmp_path):
+    client = FakeClient()
+    cache = PromptCache(tmp_path / "prompts.sqlite")
+    LLMExecutor(client, "llama3", cache=cache).chat(messages("hi"))
+
+    def reject(content):
+        raise ValueError(f"malformed: {content}")
+
+    LLMExecutor(client, "llama3", cache=cache).chat(messages("hi"), validate=reject)
+
+    assert client.calls == 2
+    assert len(cache) == 0
+
+
+def test_shutdown_stops_worker_threads():
+    executor = LLMExecutor(FakeClient(), "llama3")
+    executor.chat(messages("hi"))
+
+    executor.shutdown()
+
+    assert not [t for t in threading.enumerate() if t.name.startswith("llm")]
+    assert executor.chat(messages("again"))["message"]["content"] == "again"
+    executor.shutdown()
@@ -0,0 +1,162 @@
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+import requests
+
+from wrench.harvester.sensorthings import SensorThingsConfig, SensorThingsHarvester
+
+BASE_URL = "https://example.com/v1.1"
+
+
+def thing_data(
+    thing_id,
+    coordinates=(),
+    properties=(),
+    times=(),
+    location_ids=None,
+    sensor_id=1,
+):
+    """
+    Builds the JSON of a Thing as returned by a SensorThings server.
+
+    The Thing has a Location per coordinate pair, and a Datastream per observed
+    property, with the phenomenon time of the same position in `times`.
+    """
+    location_ids = location_ids or [
+        f"loc-{thing_id}-{idx}" for idx in range(len(coordinates))
+    ]
+    times = list(times) or [None] * len(properties)
+    return {
+        "@iot.id": thing_id,
+        "name": "Weather station",
+        "description": f"Station {thing_id}",
+        "Locations": [
+            {
+                "@iot.id": location_id,
+                "name": "Location",
+                "description": "Location",
+                "encodingType": "application/geo+json",
+                "location": {"type": "Point", "coordinates": coords},
+            }
+            for location_id, coords in zip(location_ids, coordinates)
+        ],
+        "Datastreams": [
+            {
+                "@iot.id": f"ds-{thing_id}-{idx}",
+                "name": prop,
+                "description": prop,
+                "unitOfMeasurement": {},
+                "phenomenonTime": phenomenon_time,
+                "Sensor": {
+                    "@iot.id": sensor_id,
+                    "name": "Sensor",
+                    "description": "Sensor",
+                    "encodingType": "text/html",
+                    "properties": {"vendor": "ACME"},
+                },
+                "ObservedProperty": {
+                    "@iot.id": prop,
+                    "name": prop,
+                    "description": prop,
+                },
+            }
+            for idx, (phenomenon_time, prop) in enumerate(zip(times, properties))
+        ],
+    }
+
+
+class FakeResponse:
+    def __init__(self, data):
+        self.data = data
+
+    def json(self):
+        return self.data
+
+
+class FakeServer:
+    """
+    Serves pages of Things like a SensorThings server.
+
+    Pages hold `$top` Things, `page_size` if not requested. ObservedProperties
+    are only expanded if requested, and the next link keeps the expansions.
+    """
+
+    def __init__(self, total, page_size, thing=thing_data, before_page=None):
+        self.total = total
+        self.page_size = page_size
+        self.thing = thing
+        self.before_page = before_page
+        self.requested_urls = []
+        self.fail_at = None
+        self.count = True
+
+    @property
+    def requested_skips(self):
+        return [
+            int(parse_qs(urlparse(url).query).get("$skip", ["0"])[0])
+            for url in self.requested_urls
+        ]
+
+    def fetch_page(self, harvester, url):
+        self.requested_urls.append(url)
+        if self.before_page is not None:
+            self.before_page(harvester)
+        params = parse_qs(urlparse(url).query)
+        top = int(params.get("$top", [self.page_size])[0])
+        skip = int(params.get("$skip", ["0"])[0])
+        if skip == self.fail_at:
+            raise requests.ConnectionError("connection reset")
+
+        expand = params.get("$expand", [""])[0]
+        things = [self.thing(i) for i in range(skip, min(skip + top, self.total))]
+        if "ObservedProperty" not in expand:
+            for thing in things:
+                for datastream in thing["Datastreams"]:
+                    del datastream["ObservedProperty"]
+        data = {"value": things}
+        if skip + top < self.total:
+            data["@iot.nextLink"] = (
+                f"{BASE_URL}/Things?$expand={expand}&$skip={skip + top}"
+            )
+        if self.count and "$count" in params:
+            data["@iot.count"] = self.total
+        return FakeResponse(data)
+
+
+@pytest.fixture
+def make_thing():
+    return thing_data
+
+
+@pytest.fixture
+def server_settings():
+    """Size and Things of the fake server, overridden by tests."""
+    return {"total": 10, "page_size": 5}
+
+
+@pytest.fixture
+def server(mocker, server_settings):
+    server = FakeServer(**server_settings)
+
+    def fetch_page(harvester, url):
+        return server.fetch_page(harvester, url)
+
+    mocker.patch.object(SensorThingsHarvester, "_fetch_page", fetch_page)
+    return server
+
+
+@pytest.fixture
+def make_harvester():
+    def make(**settings):
+        settings.setdefault("pagination", {"page_delay": 0})
+        return SensorThingsHarvester(
+            SensorThingsConfig(
+                base_url=BASE_URL,
+                identifier="example",
+                title="Example",
+                description="Example server",
+                **settings,
+            )
+        )
+
+    return make
@@ -0,0 +1,88 @@
+import pytest
+
+from wrench.harvester.sensorthings.checkpoint import HarvestCheckpoint
+
+BASE_URL = "https://example.com/v1.1"
+PAGE_SIZE = 10
+TOTAL = 50
+
+
+def test_checkpoint_writes_every_interval(tmp_path, make_thing):
+    checkpoint = HarvestCheckpoint(tmp_path, f"{BASE_URL}/Things", -1, interval=2)
+    checkpoint.add_page([make_thing(0)], "next-1", 2, None)
+    assert not checkpoint.path.exists()
+
+    checkpoint.add_page([make_thing(1)], "next-2", 3, None)
+    state, items = HarvestCheckpoint(
+        tmp_path, f"{BASE_URL}/Things", -1, interval=2
+    ).load()
+    assert state.next_url == "next-2"
+    assert state.page_count == 3
+    assert [item["@iot.id"] for item in items] == [0, 1]
+
+
+def test_checkpoint_flush_and_clear(tmp_path, make_thing):
+    checkpoint = HarvestCheckpoint(tmp_path, f"{BASE_URL}/Things", 20, interval=5)
+    checkpoint.add_page([make_thing(0)], "next-1", 2, 19)
+    checkpoint.flush()
+
+    state, items = checkpoint.load()
+    assert state.remaining_items == 19
+    assert len(items) == 1
+
+    checkpoint.clear()
+    assert checkpoint.load() == (None, [])
+
+
+def test_checkpoint_keys_by_limit(tmp_path, make_thing):
+    checkpoint = HarvestCheckpoint(tmp_path, f"{BASE_URL}/Things", -1, interval=1)
+    checkpoint.add_page([make_thing(0)], "next-1", 2, None)
+    other = HarvestCheckpoint(tmp_path, f"{BASE_URL}/Things", 5, interval=1)
+    assert other.load() == (None, [])
+
+
+def test_checkpoint_discards_corrupt_state(tmp_path, make_thing):
+    checkpoint = HarvestCheckpoint(tmp_path, f"{BASE_URL}/Things", -1, interval=1)
+    checkpoint.add_page([make_thing(0)], "next-1", 2, None)
+    (checkpoint.path / "page_000000.json").write_text("{broken")
+    assert checkpoint.load() == (None, [])
+    assert not checkpoint.path.exists()
+
+
+@pytest.fixture
+def server_settings():
+    return {"total": TOTAL, "page_size": PAGE_SIZE}
+
+
+@pytest.fixture
+def harvest(make_harvester, tmp_path):
+    def harvest():
+        return make_harvester(
+            checkpoint={"enabled": True, "directory": str(tmp_path), "interval": 2}
+        )
+
+    return harvest
+
+
+@pytest.mark.parametrize("fail_at", [10, 30])
+def test_interrupted_harvest_resumes(server, harvest, tmp_path, fail_at):
+    server.fail_at = fail_at
+    harvester = harvest()
+    assert len(harvester.things) == fail_at
+    assert server.requested_skips == list(range(0, fail_at + 1, PAGE_SIZE))
+
+    server.fail_at = None
+    server.requested_urls.clear()
+    harvester = harvest()
+    assert server.requested_skips == list(range(fail_at, TOTAL, PAGE_SIZE))
+    assert [thing.id for thing in harvester.things] == [str(i) for i in range(TOTAL)]
+
+    # completed harvests remove their checkpoint
+    assert not any(tmp_path.iterdir())
+
+
+def test_completed_harvest_starts_over(server, harvest):
+    harvest()
+    server.requested_urls.clear()
+    harvest()
+    assert server.requested_skips == [0, 10, 20, 30, 40]
@@ -0,0 +1,143 @@
+from datetime import datetime, timezone
+
+import numpy as np
+import pytest
+
+from wrench.exceptions import HarvesterError
+from wrench.harvester.sensorthings.columnar import ThingTable
+from wrench.harvester.sensorthings.models import Thing
+
+JANUARY = "2024-01-01T00:00:00Z/2024-02-01T00:00:00Z"
+
+
+@pytest.fixture
+def things(make_thing):
+    things = [
+        make_thing(1, [[11.5, 48.1]], ["Temperature"], [JANUARY]),
+        make_thing(
+            2,
+            [[11.6, 48.2], [11.7, 48.0]],
+            ["Temperature", "NO2"],
+            ["2023-06-01T00:00:00+02:00/2023-07-01T00:00:00+02:00", None],
+        ),
+        make_thing(3),
+        make_thing(
+            4, [[10.0, 47.5]], ["NO2"], ["2024-05-01T00:00:00Z/2024-05-02T00:00:00Z"]
+        ),
+    ]
+    return [Thing.model_validate(thing) for thing in things]
+
+
+@pytest.fixture
+def table(things):
+    return ThingTable.from_things(things)
+
+
+def test_columns(table):
+    assert len(table) == 4
+    assert list(table.ids) == ["1", "2", "3", "4"]
+    assert table.names.decode() == ["Weather station"] * 4
+    assert len(table.names.values) == 1
+    assert list(table.location_offsets) == [0, 1, 3, 3, 4]
+    assert list(table.datastream_offsets) == [0, 1, 3, 3, 4]
+    assert table.observed_properties.decode() == [
+        "Temperature",
+        "Temperature",
+        "NO2",
+        "NO2",
+    ]
+    assert np.isnan(table.start_times[2])
+
+
+def test_extent(table):
+    assert table.extent() == (10.0, 47.5, 11.7, 48.2)
+
+
+def test_empty_extent():
+    table = ThingTable.from_things([])
+    assert table.extent() == (
+        float("inf"),
+        float("inf"),
+        float("-inf"),
+        float("-inf"),
+    )
+
+
+def test_time_range(table):
+    start, end = table.time_range()
+    assert start == datetime(2023, 5, 31, 22, tzinfo=timezone.utc)
+    assert end == datetime(2024, 5, 2, tzinfo=timezone.utc)
+
+
+def test_filters(table):
+    assert list(table.within(11.65, 47.9, 12.0, 48.05)) == [
+        False,
+        True,
+        False,
+        False,
+    ]
+    assert list(table.observing("NO2")) == [False, True, False, True]
+    assert not table.observing("Humidity").any()
+    active = table.active_between(
+        datetime(2024, 1, 15, tzinfo=timezone.utc),
+        datetime(2024, 6, 1, tzinfo=timezone.utc),
+    )
+    assert list(active) == [True, False, False, True]
+
+
+def test_filter_keeps_child_rows(table):
+    subset = table.filter(table.observing("NO2"))
+    assert list(subset.ids) == ["2", "4"]
+    assert list(subset.location_offsets) == [0, 2, 3]
+    assert list(subset.longitudes) == [11.6, 11.7, 10.0]
+    assert subset.observed_properties.decode() == ["Temperature", "NO2", "NO2"]
+    assert subset.extent() == (10.0, 47.5, 11.7, 48.2)
+
+
+def test_arrow_export(table, tmp_path):
+    pa = pytest.importorskip("pyarrow")
+    pq = pytest.importorskip("pyarrow.parquet")
+
+    arrow_table = table.to_arrow()
+    assert arrow_table.num_rows == 4
+    assert arrow_table.column("observed_properties").to_pylist()[1] == [
+        "Temperature",
+        "NO2",
+    ]
+    assert arrow_table.column("start_time").to_pylist()[2] is None
+
+    table.write_parquet(tmp_path / "things.parquet")
+    assert pq.read_table(tmp_path / "things.parquet").num_rows == 4
+
+    table.write_ipc(tmp_path / "things.arrow")
+    with pa.memory_map(str(tmp_path / "things.arrow")) as source:
+        assert pa.ipc.open_file(source).read_all().equals(arrow_table)
+
+
+@pytest.fixture
+def server_settings(make_thing):
+    """Serves 5 Things per page, alternately observing temperature and NO2."""
+
+    def thing(idx):
+        return make_thing(
+            idx, [[10 + idx / 10, 48]], ["NO2" if idx % 2 else "Temperature"], [JANUARY]
+        )
+
+    return {"total": 10, "page_size": 5, "thing": thing}
+
+
+def test_harvested_table_has_observed_properties(server, make_harvester):
+    harvester = make_harvester(columnar=True)
+
+    assert len(harvester.table) == len(harvester.things) == 10
+    assert list(harvester.table.observing("NO2")) == [False, True] * 5
+
+
+def test_harvest_keeps_only_the_table(server, make_harvester):
+    harvester = make_harvester(columnar=True, keep_things=False)
+
+    assert harvester._things == []
+    assert len(harvester.table) == 10
+    assert harvester.get_metadata().temporal_extent.start_time.year == 2024
+    with pytest.raises(HarvesterError):
+        harvester.get_items()
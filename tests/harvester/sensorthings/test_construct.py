@@ -0,0 +1,80 @@
+import pytest
+from pydantic import ValidationError
+
+from wrench.harvester.sensorthings.construct import TrustedModelFactory, fast_construct
+from wrench.harvester.sensorthings.models import Thing
+
+
+@pytest.fixture
+def thing_data():
+    return {
+        "@iot.id": 72,
+        "@iot.selfLink": "https://example.com/v1.1/Things(72)",
+        "name": "Bicycle Count XYZ",
+        "description": "Bicycle Count (Location: XYZ)",
+        "properties": {"topic": "Bicycle count"},
+        "Locations": [
+            {
+                "@iot.id": 3,
+                "name": "XYZ",
+                "description": "Crossing XYZ",
+                "encodingType": "application/geo+json",
+                "location": {"type": "Point", "coordinates": [11.5, 48.1]},
+            }
+        ],
+        "Datastreams": [
+            {
+                "@iot.id": 9,
+                "name": "Count",
+                "description": "Bicycles per hour",
+                "unitOfMeasurement": {"name": "count"},
+                "phenomenonTime": "2024-01-01T00:00:00Z/2024-02-01T00:00:00Z",
+                "Sensor": {
+                    "@iot.id": 1,
+                    "name": "Counter",
+                    "description": "Induction loop",
+                    "encodingType": "text/html",
+                },
+            }
+        ],
+    }
+
+
+def test_fast_construct_matches_validation(thing_data):
+    constructed = fast_construct(Thing, thing_data)
+    validated = Thing.model_validate(thing_data)
+    assert constructed == validated
+
+
+def test_fast_construct_coerces_ids_and_coordinates(thing_data):
+    thing = fast_construct(Thing, thing_data)
+    assert thing.id == "72"
+    assert thing.datastreams[0].sensor.id == "1"
+    assert thing.location[0].get_coordinates() == (11.5, 48.1)
+
+
+def test_fast_construct_accepts_field_names(thing_data):
+    thing = Thing.model_validate(thing_data)
+    dumped = thing.model_dump(mode="json")
+    assert fast_construct(Thing, dumped) == thing
+
+
+def test_fast_construct_missing_optional_fields():
+    thing = fast_construct(Thing, {"@iot.id": 1, "name": "n", "description": "d"})
+    assert thing.datastreams is None
+    assert thing.properties is None
+
+
+def test_factory_validates_first_item(thing_data):
+    factory = TrustedModelFactory(Thing, sample_rate=0.0)
+    del thing_data["name"]
+    with pytest.raises(ValidationError):
+        factory(thing_data)
+
+
+def test_factory_samples_validation(thing_data):
+    factory = TrustedModelFactory(Thing, sample_rate=0.0)
+    things = [factory(thing_data) for _ in range(5)]
+    assert factory.validated_count == 1
+    assert factory.constructed_count == 4
+    assert all(thing == things[0] for thing in things)
@@ -0,0 +1,120 @@
+import pytest
+
+from wrench.harvester.sensorthings.interning import (
+    EntityInterner,
+    LocationView,
+    SensorView,
+)
+from wrench.harvester.sensorthings.models import Location, Sensor, Thing
+
+
+@pytest.fixture
+def station_data(make_thing):
+    def station_data(thing_id, sensor_id=1):
+        return make_thing(
+            thing_id,
+            [[11.5, 48.1]],
+            ["NO2"] * 3,
+            location_ids=[5],
+            sensor_id=sensor_id,
+        )
+
+    return station_data
+
+
+@pytest.fixture
+def station(station_data):
+    def station(thing_id, sensor_id=1):
+        return Thing.model_validate(station_data(thing_id, sensor_id))
+
+    return station
+
+
+@pytest.fixture
+def interner():
+    return EntityInterner()
+
+
+def test_intern_shares_sub_entities(interner, station):
+    things = [interner.intern_thing(station(i)) for i in range(4)]
+    sensors = {id(ds.sensor) for thing in things for ds in thing.datastreams}
+    properties = {
+        id(ds.observed_property) for thing in things for ds in thing.datastreams
+    }
+    locations = {id(loc) for thing in things for loc in thing.location}
+
+    assert len(sensors) == len(properties) == len(locations) == 1
+    assert len(interner) == 3
+    assert interner.hits == 4 * 7 - 3
+
+
+def test_intern_keeps_distinct_ids(interner, station):
+    first = interner.intern_thing(station(1, sensor_id=1))
+    second = interner.intern_thing(station(2, sensor_id=2))
+    assert first.datastreams[0].sensor is not second.datastreams[0].sensor
+
+
+def test_intern_without_id_uses_content(interner):
+    sensor = Sensor(id="", name="s", description="d", encoding_type="text/html")
+    duplicate = sensor.model_copy()
+    assert interner.intern(duplicate) is duplicate
+    assert interner.intern(sensor) is duplicate
+
+
+def test_interned_thing_serializes_unchanged(interner, station):
+    thing = station(1)
+    expected = thing.model_dump_json()
+    interner.intern_thing(station(0))
+    assert interner.intern_thing(thing).model_dump_json() == expected
+
+
+def test_views_are_read_only(interner, station):
+    interner.intern_thing(station(1))
+    sensors = interner.views(Sensor)
+    locations = interner.views(Location)
+
+    sensor = sensors["1"]
+    assert isinstance(sensor, SensorView)
+    assert sensor.properties["vendor"] == "ACME"
+    assert isinstance(locations["5"], LocationView)
+    assert locations["5"].get_coordinates() == (11.5, 48.1)
+    assert interner.views(Sensor)["1"] is sensor
+
+    with pytest.raises(AttributeError):
+        sensor.name = "changed"
+    with pytest.raises(TypeError):
+        sensor.properties["vendor"] = "changed"
+    assert not hasattr(sensor, "__dict__")
+
+
+def test_location_views(interner, station):
+    interner.intern_thing(station(1))
+
+    locations = interner.location_views()
+
+    assert list(locations) == ["5"]
+    assert locations["5"] is interner.views(Location)["5"]
+    assert locations["5"].get_coordinates() == (11.5, 48.1)
+
+
+@pytest.fixture
+def server_settings(station_data):
+    return {"total": 6, "page_size": 2, "thing": station_data}
+
+
+def test_harvester_interns_every_page(server, make_harvester):
+    seen_before_page = []
+    server.before_page = lambda harvester: seen_before_page.append(
+        len(harvester.interner)
+    )
+
+    harvester = make_harvester(intern_entities=True)
+
+    # the entities of a page are interned before the next page is requested
+    assert seen_before_page == [0, 3, 3]
+    sensors = {id(ds.sensor) for thing in harvester.things for ds in thing.datastreams}
+    assert len(harvester.things) == 6
+    assert len(sensors) == 1
+    assert harvester.get_metadata().spatial_extent == str(
+        harvester._bounding_box(11.5, 48.1, 11.5, 48.1)
+    )
@@ -38,6 +38,19 @@ def test_multiple_expansions(thing_query):
     )
 
 
+def test_nested_expansions_are_ordered(thing_query):
+    query = thing_query.expand("Datastreams", {"Sensor", "ObservedProperty"}).build()
+    assert (
+        unquote_plus(query)
+        == "Things?$expand=Datastreams($expand=ObservedProperty,Sensor)"
+    )
+
+
+def test_order_by(thing_query):
+    query = thing_query.order_by("id").limit(10).skip(20).build()
+    assert unquote_plus(query) == "Things?$top=10&$skip=20&$orderby=id"
+
+
 def test_invalid_expansion(thing_query):
     with pytest.raises(ValueError) as exc_info:
         thing_query.expand("InvalidEntity")
@@ -69,6 +82,16 @@ def test_complex_query(thing_query):
     )
 
 
+def test_skip(thing_query):
+    query = thing_query.limit(50).skip(200).build()
+    assert unquote_plus(query) == "Things?$top=50&$skip=200"
+
+
+def test_count_without_items(thing_query):
+    query = thing_query.count().limit(0).build()
+    assert unquote_plus(query) == "Things?$top=0&$count=true"
+
+
 def test_simple_filter(thing_query):
     query = thing_query.filter(ThingQuery.property("name").eq("test")).build()
     assert unquote_plus(query) == "Things?$filter=name eq 'test'"
@@ -0,0 +1,85 @@
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from wrench.exceptions import HarvesterError
+from wrench.harvester.sensorthings import SensorThingsHarvester
+from wrench.harvester.sensorthings.quickscan import extreme_quantile
+
+TOTAL = 1000
+
+
+@pytest.fixture
+def server_settings(make_thing):
+    def thing(idx):
+        return make_thing(
+            idx,
+            [[10 + idx / TOTAL, 48]],
+            ["Count"],
+            ["2024-01-01T00:00:00Z/2024-02-01T00:00:00Z"],
+        )
+
+    return {"total": TOTAL, "page_size": 100, "thing": thing}
+
+
+@pytest.fixture
+def requested_urls(server):
+    return server.requested_urls
+
+
+@pytest.fixture
+def harvester(server, make_harvester):
+    return make_harvester(harvest_on_init=False, default_limit=150)
+
+
+def test_quick_scan_samples_windows(harvester, requested_urls):
+    result = harvester.quick_scan(sample_size=100, max_requests=4, seed=1)
+
+    assert result.total_count == TOTAL
+    assert result.requests == len(requested_urls) == 5
+    assert len(result.sample) == 100
+    assert len({thing.id for thing in result.sample}) == 100
+    assert result.sample_fraction == pytest.approx(0.1)
+    assert result.metadata.temporal_extent.start_time.year == 2024
+
+
+def test_quick_scan_confidence(harvester):
+    result = harvester.quick_scan(sample_size=60, max_requests=3, seed=2)
+
+    # windows of consecutive Things count as one independent sample each
+    assert result.spatial_confidence.sample_size == 3
+    assert result.temporal_confidence.sample_size == 3
+    assert result.spatial_confidence.quantile == pytest.approx(0.05 ** (1 / 3))
+
+
+def test_quick_scan_orders_windows(harvester, requested_urls):
+    harvester.quick_scan(sample_size=100, max_requests=4, seed=1)
+
+    windows = [parse_qs(urlparse(url).query) for url in requested_urls[1:]]
+    assert all(params["$orderby"] == ["id"] for params in windows)
+
+
+def test_quick_scan_small_server(harvester, mocker):
+    mocker.patch.object(SensorThingsHarvester, "_fetch_count", return_value=3)
+    result = harvester.quick_scan(sample_size=100, max_requests=5)
+    assert sorted(thing.id for thing in result.sample) == ["0", "1", "2"]
+    assert result.requests == 4
+
+
+def test_quick_scan_requires_count(harvester, server):
+    server.count = False
+    with pytest.raises(HarvesterError):
+        harvester.quick_scan()
+
+
+def test_harvest_on_first_access(harvester, requested_urls):
+    assert not requested_urls
+    assert harvester._things is None
+    assert harvester.get_items()[0].id == "0"
+    assert len(harvester.things) == 150
+    assert len(requested_urls) == 2
+
+
+def test_extreme_quantile():
+    assert extreme_quantile(0, 0.95) == 0.0
+    assert 1 - extreme_quantile(100, 0.95) ** 100 == pytest.approx(0.95)
@@ -3,9 +3,10 @@ from pathlib import Path
 
 import yaml
 from ollama import Client
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, ValidationError
 
 from wrench.catalogger.base import BaseCatalogger
+from wrench.common.prompt_cache import PromptCache, prompt_key
 from wrench.grouper.base import Group
 from wrench.harvester.base import BaseHarvester
 from wrench.log import logger
@@ -27,20 +28,40 @@ class AdapterConfig(BaseModel):
         description="Name of Ollama model to use to generate the name and description"
     )
 
+    llm_cache: str | None = Field(
+        default=None,
+        description="SQLite file caching the generated names and descriptions by "
+        "prompt, disabled if not set",
+    )
+
+    llm_cache_max_size_mb: float = Field(
+        default=64, gt=0, description="Maximum size of the cached LLM responses in MB"
+    )
+
+    trusted_items: bool = Field(
+        default=False,
+        description="Construct group items without validation, for trusted sources",
+    )
+
 
 class BaseCatalogAdapter[H: BaseHarvester, C: BaseCatalogger](ABC):
     """H = Type of Harvester, C = Type of Catalogger."""
 
-    def __init__(self, llm_host: str, model: str):
+    def __init__(
+        self, llm_host: str, model: str, prompt_cache: PromptCache | None = None
+    ):
         """
         Initializes the base adapter with the given language model host and model name.
 
         Args:
             llm_host (str): The host address of the language model.
             model (str): The name of the model to be used.
+            prompt_cache (PromptCache | None, optional): Persistent cache of LLM
+                responses. Defaults to None.
         """
         self.llm = Client(host=llm_host)
         self.model = model
+        self.prompt_cache = prompt_cache
         self.logger = logger.getChild(self.__class__.__name__)
 
     @abstractmethod
@@ -123,11 +144,30 @@ class BaseCatalogAdapter[H: BaseHarvester, C: BaseCatalogger](ABC):
                 ),
             },
         ]
+        schema = CatalogEntry.model_json_schema()
+        key = prompt_key(self.model, messages, format=schema)
+        content = self.prompt_cache.get(key) if self.prompt_cache else None
+        if content is not None:
+            try:
+                return CatalogEntry.model_validate_json(content)
+            except ValidationError as e:
+                self.logger.warning("Ignoring malformed cached catalog entry: %s", e)
+
         response = self.llm.chat(
             model=self.model,
             messages=messages,
-            format=CatalogEntry.model_json_schema(),
+            format=schema,
         )
         if not response.message.content:
             raise RuntimeError("LLM returned no messages")
-        return CatalogEntry.model_validate_json(response.message.content)
+        content = response.message.content
+        try:
+            entry = CatalogEntry.model_validate_json(content)
+        except ValidationError:
+            # do not serve the malformed response again
+            if self.prompt_cache is not None:
+                self.prompt_cache.delete(key)
+            raise
+        if self.prompt_cache is not None:
+            self.prompt_cache.put(key, content)
+        return entry
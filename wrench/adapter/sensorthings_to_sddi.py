@@ -15,6 +15,7 @@ Methods:
         Creates a DeviceGroup entry from the given API service and group.
 """
 
+import json
 from pathlib import Path
 
 from geojson import MultiPoint
@@ -22,7 +23,9 @@ from geojson import MultiPoint
 from wrench.adapter.base import AdapterConfig, BaseCatalogAdapter
 from wrench.catalogger.sddi.models import DeviceGroup, OnlineService
 from wrench.catalogger.sddi.register import SDDICatalogger
+from wrench.common.prompt_cache import PromptCache
 from wrench.grouper.base import Group
+from wrench.harvester.sensorthings.construct import fast_construct
 from wrench.harvester.sensorthings.harvester import SensorThingsHarvester
 from wrench.harvester.sensorthings.models import Thing
 from wrench.harvester.sensorthings.querybuilder import ThingQuery
@@ -64,7 +67,15 @@ class SensorThingsSDDIAdapter(
             config = AdapterConfig.from_yaml(config)
 
         self.config = config
-        super().__init__(llm_host=self.config.llm_host, model=self.config.llm_model)
+        super().__init__(
+            llm_host=self.config.llm_host,
+            model=self.config.llm_model,
+            prompt_cache=(
+                PromptCache(self.config.llm_cache, self.config.llm_cache_max_size_mb)
+                if self.config.llm_cache
+                else None
+            ),
+        )
 
     def create_service_entry(self, metadata: CommonMetadata) -> OnlineService:
         # set a default owner for now HANDLE THIS LATER
@@ -114,7 +125,11 @@ class SensorThingsSDDIAdapter(
         ids = []
 
         for item in group.items:
-            thing_with_location = Thing.model_validate_json(item)
+            thing_with_location = (
+                fast_construct(Thing, json.loads(item))
+                if self.config.trusted_items
+                else Thing.model_validate_json(item)
+            )
             ids.append(thing_with_location.id)
             if not thing_with_location.location:
                 continue
@@ -0,0 +1,180 @@
+"""
+Persistent cache of LLM responses.
+
+Responses are stored in a SQLite database, keyed by a hash of the model, the
+generation options, the output format and the full chat messages. A prompt that
+was answered before is therefore never sent to the LLM again, while a changed
+document or class description only misses the cache for its own prompts. When
+the stored responses exceed the size limit, the least recently used ones are
+evicted.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Mapping, Sequence
+
+from wrench.log import logger
+
+
+def prompt_key(
+    model: str,
+    messages: Sequence[Mapping[str, Any]],
+    options: Mapping[str, Any] | None = None,
+    format: str | dict[str, Any] | None = None,
+) -> str:
+    """
+    Hash identifying a chat request.
+
+    Args:
+        model (str): Name of the model.
+        messages (Sequence[Mapping[str, Any]]): The chat messages.
+        options (Mapping[str, Any] | None, optional): Generation options.
+                                                     Defaults to None.
+        format (str | dict[str, Any] | None, optional): Requested output format.
+                                                        Defaults to None.
+
+    Returns:
+        str: Hex digest of the request.
+    """
+    payload = json.dumps(
+        {
+            "model": model,
+            "messages": [dict(message) for message in messages],
+            "options": dict(options or {}),
+            "format": format,
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class PromptCache:
+    """SQLite store of LLM response contents with size-based LRU eviction."""
+
+    def __init__(self, path: str | Path, max_size_mb: float = 64):
+        """
+        Opens (or creates) the cache database.
+
+        Args:
+            path (str | Path): Path of the SQLite database file.
+            max_size_mb (float, optional): Maximum total size of the stored
+                                           responses in MB. Defaults to 64.
+
+        Attributes:
+            hits (int): Number of lookups answered from the cache.
+            misses (int): Number of lookups not found in the cache.
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_size = int(max_size_mb * 1024 * 1024)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(self.path, check_same_thread=False)
+        with self._connection:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    response TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    accessed REAL NOT NULL
+                )
+                """
+            )
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS responses_accessed ON responses(accessed)"
+            )
+        self.logger = logger.getChild(self.__class__.__name__)
+
+    def __len__(self) -> int:
+        """Number of stored responses."""
+        with self._lock:
+            return self._connection.execute(
+                "SELECT COUNT(*) FROM responses"
+            ).fetchone()[0]
+
+    def get(self, key: str) -> str | None:
+        """
+        Look up a response and mark it as recently used.
+
+        Args:
+            key (str): The request key, see `prompt_key`.
+
+        Returns:
+            str | None: The cached response content, None if not cached.
+        """
+        with self._lock, self._connection:
+            row = self._connection.execute(
+                "SELECT response FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self._connection.execute(
+                "UPDATE responses SET accessed = ? WHERE key = ?", (time.time(), key)
+            )
+            return row[0]
+
+    def put(self, key: str, response: str) -> None:
+        """
+        Store a response, evicting the least recently used ones if over the limit.
+
+        Args:
+            key (str): The request key, see `prompt_key`.
+            response (str): The response content.
+        """
+        size = len(key) + len(response.encode("utf-8"))
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?)",
+                (key, response, size, time.time()),
+            )
+            self._evict()
+
+    def delete(self, key: str) -> None:
+        """
+        Remove a response, if it is stored.
+
+        Args:
+            key (str): The request key, see `prompt_key`.
+        """
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM responses WHERE key = ?", (key,))
+
+    def clear(self) -> None:
+        """Remove all stored responses."""
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM responses")
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._connection.close()
+
+    def _evict(self) -> None:
+        """Delete the least recently used responses until the size limit holds."""
+        total = self._connection.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()[0]
+        if total <= self.max_size:
+            return
+
+        evicted: list[tuple[str]] = []
+        for key, size in self._connection.execute(
+            "SELECT key, size FROM responses ORDER BY accessed"
+        ).fetchall():
+            if total <= self.max_size:
+                break
+            evicted.append((key,))
+            total -= size
+
+        self._connection.executemany("DELETE FROM responses WHERE key = ?", evicted)
+        self.logger.debug("Evicted %d cached responses", len(evicted))
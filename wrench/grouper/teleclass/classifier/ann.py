@@ -0,0 +1,158 @@
+"""
+Approximate nearest-neighbour search over class embeddings.
+
+`IVFIndex` is an inverted file index: the normalized vectors are clustered with
+spherical k-means, and a query is only compared to the vectors in the `n_probe`
+lists whose centroids are most similar to it. With about `sqrt(n)` lists, a query
+touches `O(sqrt(n))` vectors instead of all of them. The retrieved candidates are
+scored exactly, so only the candidate generation is approximate.
+"""
+
+import math
+
+import numpy as np
+
+# maximum number of gathered vector elements held at once while scoring
+GATHER_BLOCK_ELEMENTS = 1 << 22
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+def gathered_similarities(
+    queries: np.ndarray, vectors: np.ndarray, ids: np.ndarray
+) -> np.ndarray:
+    """
+    Dot products of every query with its own candidate vectors.
+
+    The candidate vectors are gathered in blocks of queries, so the cost is
+    proportional to the number of candidates, not to the number of vectors.
+
+    Args:
+        queries (np.ndarray): Matrix with one query vector per row.
+        vectors (np.ndarray): Matrix with one vector per row.
+        ids (np.ndarray): Candidate vector indices of shape (len(queries), c),
+                          -1 for missing candidates.
+
+    Returns:
+        np.ndarray: Similarities of shape (len(queries), c), -inf for missing
+        candidates.
+    """
+    scores = np.full(ids.shape, -np.inf, dtype=np.float32)
+    if ids.size == 0:
+        return scores
+    gathered = np.maximum(ids, 0)
+    block = max(1, GATHER_BLOCK_ELEMENTS // (ids.shape[1] * vectors.shape[1]))
+    for start in range(0, len(queries), block):
+        rows = slice(start, start + block)
+        scores[rows] = np.einsum("qd,qcd->qc", queries[rows], vectors[gathered[rows]])
+    scores[ids < 0] = -np.inf
+    return scores
+
+
+class IVFIndex:
+    """Inverted file index for cosine similarity search."""
+
+    def __init__(
+        self,
+        vectors: np.ndarray,
+        n_lists: int | None = None,
+        n_probe: int = 8,
+        n_iter: int = 10,
+        seed: int = 0,
+    ):
+        """
+        Builds the index by clustering the vectors.
+
+        Args:
+            vectors (np.ndarray): Matrix with one vector per row.
+            n_lists (int | None, optional): Number of clusters. Defaults to the
+                                            square root of the number of vectors.
+            n_probe (int, optional): Number of clusters searched per query.
+                                     Defaults to 8.
+            n_iter (int, optional): Number of k-means iterations. Defaults to 10.
+            seed (int, optional): Seed for the centroid initialization.
+                                  Defaults to 0.
+
+        Attributes:
+            centroids (np.ndarray): Normalized cluster centroids.
+            lists (list[np.ndarray]): Vector indices of each cluster.
+
+        Raises:
+            ValueError: If there are no vectors to index.
+        """
+        self.vectors = _normalize(vectors)
+        size = len(self.vectors)
+        if size == 0:
+            raise ValueError("cannot index an empty set of vectors")
+        n_lists = n_lists or math.isqrt(size)
+        self.n_lists = max(1, min(n_lists, size))
+        self.n_probe = max(1, min(n_probe, self.n_lists))
+
+        rng = np.random.default_rng(seed)
+        self.centroids = self.vectors[
+            rng.choice(size, size=self.n_lists, replace=False)
+        ].copy()
+        assignment = np.zeros(size, dtype=np.intp)
+        for _ in range(n_iter):
+            assignment = (self.vectors @ self.centroids.T).argmax(axis=1)
+            sums = np.zeros_like(self.centroids)
+            np.add.at(sums, assignment, self.vectors)
+            empty = np.bincount(assignment, minlength=self.n_lists) == 0
+            # reseed empty clusters with random vectors
+            sums[empty] = self.vectors[rng.choice(size, size=int(empty.sum()))]
+            self.centroids = _normalize(sums)
+
+        order = np.argsort(assignment, kind="stable")
+        bounds = np.searchsorted(assignment[order], np.arange(self.n_lists + 1))
+        self.lists = [order[bounds[i] : bounds[i + 1]] for i in range(self.n_lists)]
+
+        # list members padded to a common length, for gathering probed lists
+        self._members = np.full(
+            (self.n_lists, max(len(members) for members in self.lists)),
+            -1,
+            dtype=np.intp,
+        )
+        for list_id, members in enumerate(self.lists):
+            self._members[list_id, : members.size] = members
+
+    def __len__(self) -> int:
+        """Number of indexed vectors."""
+        return len(self.vectors)
+
+    def search(self, queries: np.ndarray, k: int) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Find the most similar indexed vectors for each query.
+
+        Args:
+            queries (np.ndarray): Matrix with one query vector per row.
+            k (int): Number of neighbours per query.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: Indices and cosine similarities of the
+            neighbours, ordered by similarity, with shape (len(queries), k).
+            Missing neighbours have index -1 and similarity -inf.
+        """
+        queries = _normalize(queries)
+        n_queries = len(queries)
+        probe = np.argpartition(
+            -(queries @ self.centroids.T), self.n_probe - 1, axis=1
+        )[:, : self.n_probe]
+
+        # candidates: the members of the probed lists, scored exactly
+        ids = self._members[probe].reshape(n_queries, -1)
+        scores = gathered_similarities(queries, self.vectors, ids)
+        if ids.shape[1] < k:
+            padding = ((0, 0), (0, k - ids.shape[1]))
+            ids = np.pad(ids, padding, constant_values=-1)
+            scores = np.pad(scores, padding, constant_values=-np.inf)
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        order = np.argsort(-np.take_along_axis(scores, top, axis=1), axis=1)
+        top = np.take_along_axis(top, order, axis=1)
+
+        return np.take_along_axis(ids, top, axis=1), np.take_along_axis(
+            scores, top, axis=1
+        )
@@ -1,7 +1,13 @@
+from typing import Callable
+
 import numpy as np
-from sentence_transformers import SentenceTransformer
 
+from wrench.grouper.teleclass.classifier.ann import IVFIndex, gathered_similarities
+from wrench.grouper.teleclass.core.config import ClassifierConfig
+from wrench.grouper.teleclass.core.encoder import Encoder
 from wrench.grouper.teleclass.core.models import Document, EnrichedClass
+from wrench.grouper.teleclass.core.projection import Projection
+from wrench.grouper.teleclass.core.quantization import dequantize
 from wrench.grouper.teleclass.core.taxonomy_manager import TaxonomyManager
 from wrench.log import logger
 
@@ -17,24 +23,44 @@ class SimilarityClassifier:
     def __init__(
         self,
         taxonomy_manager: TaxonomyManager,
-        encoder: SentenceTransformer,
+        encoder: Encoder,
         enriched_classes: list[EnrichedClass],
+        chunk_size: int = 4096,
+        config: ClassifierConfig | None = None,
+        projection: Projection | None = None,
     ):
         """
         Initialize the classifier with the given taxonomy manager, encoder, and enriched classes.
 
         Args:
             taxonomy_manager (TaxonomyManager): The manager for handling taxonomy-related operations.
-            encoder (SentenceTransformer): The encoder used for transforming sentences into embeddings.
+            encoder (Encoder): The encoder used for transforming sentences into embeddings.
             enriched_classes (list[EnrichedClass]): A list of enriched classes to be used for creating class embeddings.
+            chunk_size (int, optional): Number of documents scored at once. Defaults to 4096.
+            config (ClassifierConfig | None, optional): Prediction mode settings. Defaults to top1 prediction.
+            projection (Projection | None, optional): Projection the class embeddings were reduced with, applied to document embeddings. Defaults to None.
+
+        Attributes:
+            class_names (list[str]): Classes with embeddings, in matrix order.
+            class_matrix (np.ndarray): Normalized class embeddings, one row per class.
+            root_mask (np.ndarray): Boolean mask of the root classes.
+            children (np.ndarray | None): Boolean adjacency matrix, `children[i, j]`
+                                   is set if class `j` is a child of class `i`.
+                                   Only built for exact scoring.
+            ann_index (IVFIndex | None): Index for candidate classes, only built if
+                                         enabled for large taxonomies.
         """
         self.taxonomy_manager = taxonomy_manager
         self.encoder = encoder
         self.enriched_classes = enriched_classes
+        self.chunk_size = chunk_size
+        self.config = config or ClassifierConfig()
+        self.projection = projection
         self.logger = logger.getChild(self.__class__.__name__)
 
         # Update class embeddings from enriched classes
         self.class_embeddings = self._create_class_embeddings()
+        self._build_class_matrix()
 
     def _create_class_embeddings(self) -> dict[str, np.ndarray]:
         """
@@ -74,102 +100,301 @@ class SimilarityClassifier:
                     )
         return class_map
 
-    def _assign_to_level(
-        self, doc_embedding: np.ndarray, candidate_nodes: set[str], level: int = 0
-    ) -> list[str]:
+    def _build_class_matrix(self) -> None:
+        """Stack the class embeddings and index the taxonomy for batch prediction."""
+        self.class_names = list(self.class_embeddings)
+        index = {name: i for i, name in enumerate(self.class_names)}
+
+        matrix = np.stack(
+            [np.asarray(e, dtype=np.float32) for e in self.class_embeddings.values()]
+        )
+        norms = np.maximum(np.linalg.norm(matrix, axis=1, keepdims=True), 1e-12)
+        self.class_matrix = matrix / norms
+
+        taxonomy = self.taxonomy_manager.taxonomy
+        root_nodes = set(self.taxonomy_manager.root_nodes)
+        self.root_mask = np.zeros(len(self.class_names), dtype=bool)
+        edges: list[tuple[int, int]] = []
+        for name, i in index.items():
+            if name in root_nodes:
+                self.root_mask[i] = True
+            if name in taxonomy:
+                edges.extend(
+                    (i, index[child])
+                    for child in taxonomy.successors(name)
+                    if child in index
+                )
+
+        self.children: np.ndarray | None = None
+        self.ann_index: IVFIndex | None = None
+        ann = self.config.ann
+        if not ann.enabled or len(self.class_names) < ann.min_classes:
+            self.children = np.zeros((len(self.class_names),) * 2, dtype=bool)
+            for parent, child in edges:
+                self.children[parent, child] = True
+        else:
+            self.ann_index = IVFIndex(self.class_matrix, ann.n_lists, ann.n_probe)
+            # sorted parent-child codes, looked up for the candidates only
+            self._edges = np.sort(
+                np.array(
+                    [parent * len(index) + child for parent, child in edges],
+                    dtype=np.int64,
+                )
+            )
+            # each class with its ancestors, padded by repeating the class
+            lineages = [
+                [i]
+                + [
+                    index[a]
+                    for a in self.taxonomy_manager.get_ancestors(name)
+                    if a in index
+                ]
+                for name, i in index.items()
+            ]
+            width = max(len(lineage) for lineage in lineages)
+            self._lineage = np.array(
+                [lineage + lineage[:1] * (width - len(lineage)) for lineage in lineages]
+            )
+
+    def predict(self, text: str) -> set[str]:
+        """
+        Predict classes for a document using similarity-based hierarchical mapping.
+
+        Args:
+            text: Input text to classify
+
+        Returns:
+            set of predicted class names
+        """
+        return self.predict_many([text])[0]
+
+    def predict_many(self, texts: list[str]) -> list[set[str]]:
         """
-        Assign document to nodes at the current level using similarity gap detection.
+        Predict classes for several documents, encoding them in one batch.
 
-        This method calculates the similarity between the document embedding and the
-        embeddings of candidate nodes. It then selects the most relevant nodes based
-        on the largest similarity gap.
+        Args:
+            texts: Input texts to classify
+
+        Returns:
+            list with the set of predicted class names for each text
+        """
+        if not texts:
+            return []
+
+        embeddings = self.encoder.encode(texts, convert_to_numpy=True)
+        return self.predict_embeddings(embeddings)
+
+    def predict_embeddings(
+        self, embeddings: np.ndarray, scales: np.ndarray | None = None
+    ) -> list[set[str]]:
+        """
+        Predict classes for already encoded documents.
+
+        All documents of a chunk are scored against all classes with a single
+        matrix multiplication, or with an ANN index against their retrieved
+        classes and ancestors only. The hierarchy is then walked level by level for
+        the whole chunk at once: at each level, every document is assigned the most
+        similar class among its candidates (or several classes in beam mode), and
+        the children of the assigned classes become its candidates for the next
+        level.
 
         Args:
-            doc_embedding (np.ndarray): The embedding of the document to be classified.
-            candidate_nodes (set[str]): A set of candidate node identifiers to which
-                                        the document could be assigned.
-            level (int, optional): The current level in the hierarchy. Defaults to 0.
+            embeddings: Matrix with one document embedding per row, may be quantized
+            scales: Per-document scales of int8 quantized embeddings
 
         Returns:
-            list[str]: A list containing the most relevant node identifier(s) based
-                       on the similarity gap detection.
-        """
-        # Calculate similarities with candidate nodes
-        similarities = []
-
-        for name in candidate_nodes:
-            if name in self.class_embeddings:
-                sim = self.encoder.similarity(
-                    doc_embedding, self.class_embeddings[name]
-                ).numpy()
-                similarities.append((name, sim))
-
-        # Sort by similarity in descending order
-        similarities.sort(key=lambda x: x[1], reverse=True)
-
-        if len(similarities) <= 1:
-            return [similarities[0][0]] if similarities else []
-
-        # Log similarities for this level
-        self.logger.info("Level %s similarities:", level)
-        self.logger.info("-" * 40)
-        for node, sim in similarities:
-            self.logger.info("%-30s %.4f", node, sim)
-        self.logger.info("-" * 40)
-
-        if len(similarities) <= 1:
-            selected = [similarities[0][0]] if similarities else []
-            if selected:
-                self.logger.info(
-                    "only one candidate at level %d, selecting: %s", level, selected[0]
+            list with the set of predicted class names for each document
+        """
+        predictions: list[set[str]] = []
+        for start in range(0, len(embeddings), self.chunk_size):
+            chunk = slice(start, start + self.chunk_size)
+            assigned = self._assign(
+                dequantize(
+                    embeddings[chunk], scales[chunk] if scales is not None else None
                 )
-            return selected
-
-        # Return only the top match
-        top_node = similarities[0][0]
-        self.logger.info("selected top node: %s", top_node)
+            )
+            predictions.extend(
+                {self.class_names[i] for i in indices} for indices in assigned
+            )
+        return predictions
 
-        return [top_node]
+    def _normalize_documents(self, embeddings: np.ndarray) -> np.ndarray:
+        """Project (if configured) and normalize document embeddings."""
+        docs = np.atleast_2d(np.asarray(embeddings, dtype=np.float32))
+        if self.projection is not None:
+            docs = self.projection.transform(docs)
+        return docs / np.maximum(np.linalg.norm(docs, axis=1, keepdims=True), 1e-12)
 
-    def predict(self, text: str) -> set[str]:
+    def _assign(self, embeddings: np.ndarray) -> list[np.ndarray]:
         """
-        Predict classes for a document using similarity-based hierarchical mapping.
+        Walk the hierarchy for a chunk of documents.
+
+        Without an ANN index, every document is scored against all classes. With
+        an index, only the retrieved classes and their ancestors are scored and
+        walked, so the cost per document does not depend on the number of classes.
 
         Args:
-            text: Input text to classify
+            embeddings: Matrix with one document embedding per row
 
         Returns:
-            set of predicted class names
+            Indices of the assigned classes of each document.
         """
-        # Get document embedding
-        doc_embedding = self.encoder.encode(text, convert_to_numpy=True)
+        docs = self._normalize_documents(embeddings)
+        if self.ann_index is not None:
+            return self._assign_candidates(docs, self.ann_index)
+
+        scores = docs @ self.class_matrix.T
+        # built whenever the ANN index is not
+        children = self.children
+        assert children is not None
+
+        def expand(active: np.ndarray, selected: np.ndarray) -> np.ndarray:
+            return children[selected]
 
-        assigned_classes = set()
-        current_level = 0
-        # Start from root
-        current_nodes = set(self.taxonomy_manager.root_nodes)
+        roots = np.repeat(self.root_mask[np.newaxis], len(docs), axis=0)
+        assigned = self._walk(scores, roots, expand)
+        return [np.flatnonzero(row) for row in assigned]
 
-        # Traverse hierarchy level by level
-        while current_nodes and current_level <= self.taxonomy_manager.max_depth:
-            # Get assignments at current level
-            assignments = self._assign_to_level(
-                doc_embedding, current_nodes, current_level
+    def _assign_candidates(
+        self, docs: np.ndarray, ann_index: IVFIndex
+    ) -> list[np.ndarray]:
+        """
+        Walk the hierarchy over the candidate classes retrieved by the ANN index.
+
+        Each document gets its own array of candidate classes: the retrieved
+        classes and their ancestors, without duplicates. Scores and the walk are
+        computed on these arrays only, with parent-child relations looked up in
+        the sorted edge codes.
+
+        Args:
+            docs: Normalized document embeddings
+            ann_index: Index over the class embeddings
+
+        Returns:
+            Indices of the assigned classes of each document.
+        """
+        ids, _ = ann_index.search(docs, self.config.ann.top_k)
+        candidates = self._lineage[np.maximum(ids, 0)]
+        candidates[ids < 0] = -1
+        candidates = np.sort(candidates.reshape(len(docs), -1), axis=1)
+        candidates[:, 1:][candidates[:, 1:] == candidates[:, :-1]] = -1
+
+        scores = gathered_similarities(docs, self.class_matrix, candidates)
+        roots = self.root_mask[np.maximum(candidates, 0)] & (candidates >= 0)
+
+        def expand(active: np.ndarray, selected: np.ndarray) -> np.ndarray:
+            # is each candidate of a document a child of a selected class
+            parents = np.take_along_axis(candidates[active], selected, axis=1)
+            return self._is_edge(
+                parents[:, :, np.newaxis], candidates[active][:, np.newaxis, :]
             )
-            if not assignments:
+
+        assigned = self._walk(scores, roots, expand)
+        return [np.unique(row[mask]) for row, mask in zip(candidates, assigned)]
+
+    def _is_edge(self, parents: np.ndarray, children: np.ndarray) -> np.ndarray:
+        """Whether classes are children of classes, False for missing (-1) ones."""
+        codes = parents.astype(np.int64) * len(self.class_names) + children
+        if not self._edges.size:
+            return np.zeros(codes.shape, dtype=bool)
+        positions = np.minimum(
+            np.searchsorted(self._edges, codes), self._edges.size - 1
+        )
+        return (self._edges[positions] == codes) & (parents >= 0) & (children >= 0)
+
+    def _walk(
+        self,
+        scores: np.ndarray,
+        candidates: np.ndarray,
+        expand: Callable[[np.ndarray, np.ndarray], np.ndarray],
+    ) -> np.ndarray:
+        """
+        Assign classes level by level.
+
+        Args:
+            scores: Similarities of the documents to their classes, -inf where
+                    there is no class
+            candidates: Boolean mask of the root classes among them
+            expand: Maps the active documents and the columns selected for them
+                    to masks of shape (active, selected, columns) of the children
+                    of the selected classes
+
+        Returns:
+            Boolean matrix of the assigned columns, one row per document.
+        """
+        assigned = np.zeros(scores.shape, dtype=bool)
+        beam = self.config.mode == "beam"
+
+        for level in range(self.taxonomy_manager.max_depth + 1):
+            active = np.flatnonzero(candidates.any(axis=1))
+            if active.size == 0:
                 break
 
-            # Add assignments to results
-            assigned_classes.update(assignments)
+            masked = np.where(candidates[active], scores[active], -np.inf)
+            if beam:
+                selected, kept = self._select_beam(masked)
+            else:
+                selected = masked.argmax(axis=1)[:, np.newaxis]
+                # classes skipped by the ANN index have no similarity
+                kept = np.isfinite(np.take_along_axis(masked, selected, axis=1))
+
+            rows = np.repeat(active, kept.sum(axis=1))
+            assigned[rows, selected[kept]] = True
+            self.logger.debug("Level %d: assigned %d documents", level, active.size)
+
+            # children of the assigned classes are the next level's candidates
+            candidates = np.zeros_like(candidates)
+            candidates[active] = (expand(active, selected) & kept[..., np.newaxis]).any(
+                axis=1
+            )
 
-            # Prepare next level candidates (children of assigned nodes)
-            next_nodes = set()
-            for node in assignments:
-                next_nodes.update(self.taxonomy_manager.taxonomy.successors(node))
+        return assigned
 
-            current_nodes = next_nodes
-            current_level += 1
+    def _select_beam(self, masked: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Select up to `beam_width` classes per document at one level.
+
+        The best `beam_width + 1` candidates are ranked by similarity and cut at the
+        largest gap between consecutive similarities, or at the threshold. If a
+        document has fewer candidates, the last one is compared to a similarity of
+        zero, so equally similar candidates are all kept.
+
+        Args:
+            masked: Similarities of the documents to all classes, -inf for classes
+                    which are not candidates at this level.
+
+        Returns:
+            Indices of the ranked classes per document and a mask of the kept ones.
+        """
+        width = self.config.beam_width
+        ranked_count = min(width + 1, masked.shape[1])
+
+        # unordered top candidates, then ordered by similarity
+        top = np.argpartition(-masked, ranked_count - 1, axis=1)[:, :ranked_count]
+        order = np.argsort(-np.take_along_axis(masked, top, axis=1), axis=1)
+        top = np.take_along_axis(top, order, axis=1)
+        similarities = np.take_along_axis(masked, top, axis=1)
+        valid = np.isfinite(similarities)
+
+        if self.config.selection == "gap" and ranked_count > 1:
+            with np.errstate(invalid="ignore"):
+                gaps = similarities[:, :-1] - similarities[:, 1:]
+            # after the last candidate, the gap to a class with zero similarity
+            last = valid[:, :-1] & ~valid[:, 1:]
+            gaps = np.where(
+                valid[:, 1:],
+                gaps,
+                np.where(last, np.maximum(similarities[:, :-1], 0.0), -np.inf),
+            )
+            keep = gaps.argmax(axis=1) + 1
+        elif self.config.selection == "threshold":
+            keep = (valid & (similarities >= self.config.threshold)).sum(axis=1)
+        else:
+            keep = np.ones(len(masked), dtype=int)
 
-        return assigned_classes
+        keep = np.clip(keep, 1, width)
+        kept = (np.arange(ranked_count) < keep[:, np.newaxis]) & valid
+        return top, kept
 
     def evaluate(
         self, test_docs: list[Document], true_labels: list[set[str]]
@@ -185,11 +410,9 @@ class SimilarityClassifier:
             dictionary with evaluation metrics
         """
         self.logger.info("Evaluating model")
-        predictions = []
-        for doc in test_docs:
-            pred = self.predict(doc.content)
+        predictions = self.predict_many([doc.content for doc in test_docs])
+        for doc, pred in zip(test_docs, predictions):
             self.logger.debug("predictions for document %s: %s", doc.id, pred)
-            predictions.append(pred)
 
         # Calculate metrics
         precision = sum(
@@ -1,21 +1,32 @@
 import pickle
 from pathlib import Path
+from typing import Any
 
 import numpy as np
 
 from wrench.grouper.teleclass.core.models import Document, EnrichedClass
+from wrench.grouper.teleclass.core.projection import Projection
+from wrench.grouper.teleclass.core.quantization import (
+    Quantization,
+    dequantize,
+    quantize,
+)
 from wrench.log import logger
 
 
 class TELEClassCache:
     """Handles caching and loading of TELEClass state and results."""
 
-    def __init__(self, cache_dir: str = ".teleclass_cache"):
+    def __init__(
+        self, cache_dir: str = ".teleclass_cache", quantization: Quantization = "none"
+    ):
         """
         Initializes the cache directory and defines paths for cache components.
 
         Args:
             cache_dir (str): Directory for cache files. Defaults to ".teleclass_cache".
+            quantization (Quantization): Representation of the stored class
+                embeddings. Defaults to "none" (float32).
 
         Attributes:
             cache_dir (Path): Path to the cache directory.
@@ -29,10 +40,16 @@ class TELEClassCache:
         self.class_terms_path = self.cache_dir / "class_terms.pkl"
         self.assignments_path = self.cache_dir / "assignments.pkl"
         self.embeddings_path = self.cache_dir / "embeddings.npz"
+        self.quantization = quantization
 
         self.logger = logger.getChild(self.__class__.__name__)
 
-    def save_class_embeddings(self, enriched_classes: list[EnrichedClass]) -> None:
+    def save_class_embeddings(
+        self,
+        enriched_classes: list[EnrichedClass],
+        projection: Projection | None = None,
+    ) -> None:
+        """Save class embeddings, with the projection they were reduced with."""
         class_names: list[str] = []
         class_embeddings: list[np.ndarray] = []
         for cls in enriched_classes:
@@ -42,11 +59,19 @@ class TELEClassCache:
             class_names.append(cls.class_name)
             class_embeddings.append(cls.embeddings)
 
-        np.savez_compressed(
-            self.embeddings_path,
-            class_names=class_names,
-            embeddings=class_embeddings,
-        )
+        arrays: dict[str, Any] = {"class_names": class_names}
+        if projection is not None:
+            arrays["projection_mean"] = projection.mean
+            arrays["projection_components"] = projection.components
+
+        if self.quantization == "none":
+            arrays["embeddings"] = class_embeddings
+        else:
+            values, scales = quantize(np.stack(class_embeddings), self.quantization)
+            arrays["embeddings"] = values
+            if scales is not None:
+                arrays["scales"] = scales
+        np.savez_compressed(self.embeddings_path, **arrays)
 
     def load_class_embeddings(self) -> list[EnrichedClass]:
         if not self.embeddings_path.exists():
@@ -58,6 +83,9 @@ class TELEClassCache:
             data = np.load(self.embeddings_path, allow_pickle=True)
             class_names = data["class_names"]
             embeddings = data["embeddings"]
+            if embeddings.dtype != object:
+                scales = data["scales"] if "scales" in data.files else None
+                embeddings = dequantize(embeddings, scales)
 
             enriched_classes: list[EnrichedClass] = []
             for name, embedding in zip(class_names, embeddings):
@@ -74,6 +102,16 @@ class TELEClassCache:
             self.logger.error(f"Error loading class embeddings: {e}")
             raise ValueError("failed to load embeddings")
 
+    def load_projection(self) -> Projection | None:
+        """Load the projection of the cached class embeddings, if there is one."""
+        if not self.embeddings_path.exists():
+            return None
+
+        with np.load(self.embeddings_path, allow_pickle=True) as data:
+            if "projection_components" not in data.files:
+                return None
+            return Projection(data["projection_mean"], data["projection_components"])
+
     def save_class_terms(self, class_terms: list[EnrichedClass]) -> None:
         """Save enriched classes using pickle (due to complex objects)."""
         with open(self.class_terms_path, "wb") as f:
@@ -1,9 +1,12 @@
 from pathlib import Path
-from typing import Any
+from typing import Any, Literal
 
 import yaml
 from pydantic import BaseModel, Field
 
+from wrench.grouper.teleclass.core.projection import ProjectionMethod
+from wrench.grouper.teleclass.core.quantization import Quantization
+
 
 class LLMConfig(BaseModel):
     """Configuration for the LLM service."""
@@ -16,6 +19,53 @@ class LLMConfig(BaseModel):
     temperature: float = Field(
         default=0.0, description="Temperature for LLM generation"
     )
+    concurrency: int = Field(
+        default=4, ge=1, description="Maximum number of LLM requests in flight"
+    )
+    timeout: float = Field(
+        default=120.0, gt=0, description="Timeout of a single LLM request in seconds"
+    )
+    retries: int = Field(
+        default=2, ge=0, description="Number of retries of a failed LLM request"
+    )
+    cache: bool = Field(
+        default=True,
+        description="Whether to cache LLM responses by prompt in the cache directory",
+    )
+    cache_max_size_mb: float = Field(
+        default=64, gt=0, description="Maximum size of the cached LLM responses in MB"
+    )
+    group_terms: bool = Field(
+        default=False,
+        description="Whether to generate the terms of all children of a parent "
+        "class with one structured request",
+    )
+    core_class_batch_size: int = Field(
+        default=1,
+        ge=1,
+        description="Maximum number of documents per core class selection prompt, "
+        "1 sends one prompt per document",
+    )
+    core_class_token_budget: int = Field(
+        default=4096,
+        ge=1,
+        description="Approximate number of tokens a batched core class selection "
+        "prompt may use",
+    )
+
+
+class ProjectionConfig(BaseModel):
+    """Configuration for dimensionality reduction of embeddings."""
+
+    enabled: bool = Field(
+        default=False, description="Whether to reduce the embedding dimension"
+    )
+    method: ProjectionMethod = Field(
+        default="pca",
+        description="PCA fitted on the training documents and class terms, or a "
+        "random projection",
+    )
+    dimension: int = Field(default=128, ge=1, description="Target dimension")
 
 
 class EmbeddingConfig(BaseModel):
@@ -25,12 +75,110 @@ class EmbeddingConfig(BaseModel):
         default="all-mpnet-base-v2",
         description="Name of the sentence transformer model",
     )
+    batch_size: int = Field(
+        default=64, ge=1, description="Number of texts encoded per batch"
+    )
+    cache: bool = Field(
+        default=True, description="Whether to cache embeddings on disk by content"
+    )
+    cache_max_size_mb: float = Field(
+        default=512,
+        gt=0,
+        description="Maximum size of the embedding cache per model in megabytes",
+    )
+    quantization: Quantization = Field(
+        default="none",
+        description="Representation of cached and in-memory embeddings: float32 "
+        "(none), float16, or int8 with a scale per vector",
+    )
+    projection: ProjectionConfig = Field(default_factory=ProjectionConfig)
+
+
+class KeyphraseConfig(BaseModel):
+    """Configuration for candidate term extraction."""
+
+    backend: Literal["yake", "tfidf"] = Field(
+        default="yake",
+        description="Keyphrase extractor: YAKE, or n-gram TF-IDF against the "
+        "documents of the sibling classes",
+    )
+    top_n: int = Field(
+        default=5, ge=1, description="Number of candidate terms extracted per class"
+    )
+    cache: bool = Field(
+        default=True,
+        description="Whether to persist per-document keyphrases in the cache "
+        "directory, keyed by content hash and extractor settings",
+    )
+    cache_max_size_mb: float = Field(
+        default=64, gt=0, description="Maximum size of the cached keyphrases in MB"
+    )
 
 
 class CorpusConfig(BaseModel):
     """Configuration for corpus enrichment."""
 
     top_n: int = Field(default=5, description="Number of top phrases to extract")
+    keyphrase: KeyphraseConfig = Field(default_factory=KeyphraseConfig)
+    workers: int = Field(
+        default=1,
+        ge=0,
+        description="Number of worker processes enriching classes in parallel, 1 "
+        "runs serially and 0 uses all CPU cores",
+    )
+
+
+class ANNConfig(BaseModel):
+    """Configuration for approximate nearest-neighbour candidate generation."""
+
+    enabled: bool = Field(
+        default=False, description="Whether to retrieve candidate classes by ANN"
+    )
+    min_classes: int = Field(
+        default=1000,
+        ge=1,
+        description="Minimum number of classes for which the index is used, smaller "
+        "taxonomies are scored exactly",
+    )
+    top_k: int = Field(
+        default=32, ge=1, description="Number of nearest classes (or terms) retrieved"
+    )
+    n_lists: int | None = Field(
+        default=None,
+        description="Number of index clusters, defaults to the square root of the "
+        "number of indexed embeddings",
+    )
+    n_probe: int = Field(default=8, ge=1, description="Number of clusters searched")
+
+
+class ClassifierConfig(BaseModel):
+    """Configuration for hierarchical prediction."""
+
+    mode: Literal["top1", "beam"] = Field(
+        default="top1",
+        description="Follow only the most similar class per level (top1), or keep "
+        "several paths per level (beam) for multi-label predictions",
+    )
+    beam_width: int = Field(
+        default=3, ge=1, description="Maximum number of classes kept per level"
+    )
+    selection: Literal["gap", "threshold"] = Field(
+        default="gap",
+        description="How beam candidates are cut: at the largest similarity gap, "
+        "or at a minimum similarity",
+    )
+    threshold: float = Field(
+        default=0.3,
+        description="Minimum similarity of kept classes in threshold selection, the "
+        "most similar class is always kept",
+    )
+    ann: ANNConfig = Field(default_factory=ANNConfig)
+    stream_batch_size: int = Field(
+        default=256,
+        ge=1,
+        description="Number of items encoded and classified per micro-batch when "
+        "classifying a stream of items",
+    )
 
 
 class CacheConfig(BaseModel):
@@ -59,6 +207,7 @@ class TELEClassConfig(BaseModel):
     llm: LLMConfig
     embedding: EmbeddingConfig = Field(default_factory=EmbeddingConfig)
     corpus: CorpusConfig = Field(default_factory=CorpusConfig)
+    classifier: ClassifierConfig = Field(default_factory=ClassifierConfig)
     cache: CacheConfig = Field(default_factory=CacheConfig)
     taxonomy_metadata: TaxonomyMetadata = Field(
         description="Metadata about the taxonomy"
@@ -1,19 +1,58 @@
 import json
 from pathlib import Path
-from typing import Protocol, Union
+from typing import Iterator, Protocol, Union
 
 from pydantic import BaseModel
-from sentence_transformers import SentenceTransformer
 
+from wrench.grouper.teleclass.core.encoder import Encoder
+from wrench.grouper.teleclass.core.encoding import encode_batched
 from wrench.grouper.teleclass.core.models import Document
+from wrench.grouper.teleclass.core.quantization import Quantization, quantize
 from wrench.models import Item
 
 
 class DocumentLoader(Protocol):
-    def load(self, encoder: SentenceTransformer) -> list[Document]:
+    def load(self, encoder: Encoder) -> list[Document]:
         pass
 
 
+def encode_documents(
+    ids: list[str],
+    contents: list[str],
+    encoder: Encoder,
+    batch_size: int = 64,
+    quantization: Quantization = "none",
+) -> list[Document]:
+    """
+    Encode document contents in batches and create the (quantized) documents.
+
+    Args:
+        ids (list[str]): Identifier of each document.
+        contents (list[str]): Content of each document.
+        encoder (Encoder): Encoder for the document contents.
+        batch_size (int, optional): Number of documents encoded per batch.
+                                    Defaults to 64.
+        quantization (Quantization, optional): Representation of the document
+                                    embeddings. Defaults to "none" (float32).
+
+    Returns:
+        list[Document]: The encoded documents.
+    """
+    embeddings, scales = quantize(
+        encode_batched(encoder, contents, batch_size), quantization
+    )
+
+    return [
+        Document(
+            id=doc_id,
+            content=content,
+            embeddings=embeddings[i],
+            embedding_scale=float(scales[i]) if scales is not None else None,
+        )
+        for i, (doc_id, content) in enumerate(zip(ids, contents))
+    ]
+
+
 class JSONDocumentLoader:
     """
     A document loader for JSON files that loads and processes documents into a list of DocumentMeta objects.
@@ -25,24 +64,46 @@ class JSONDocumentLoader:
         __init__(file_path: Union[str, Path]):
             Initializes the JSONDocumentLoader with the given file path.
 
-        load(encoder: SentenceTransformer) -> list[DocumentMeta]:
+        load(encoder: Encoder) -> list[DocumentMeta]:
             Loads the JSON file, processes the documents, and returns a list
             of DocumentMeta objects.
             Raises FileNotFoundError if the JSON file does not exist.
             Raises ValueError if the JSON file does not contain a list of documents.
     """
 
-    def __init__(self, file_path: Union[str, Path]):
+    def __init__(
+        self,
+        file_path: Union[str, Path],
+        batch_size: int = 64,
+        quantization: Quantization = "none",
+    ):
         """
         Initialize the DocumentLoader with the given file path.
 
         Args:
             file_path (Union[str, Path]): The path to the file to be
             loaded. It can be a string or a Path object.
+            batch_size (int, optional): Number of documents encoded per batch.
+                                        Defaults to 64.
+            quantization (Quantization, optional): Representation of the document
+                                        embeddings. Defaults to "none" (float32).
         """
         self.file_path = Path(file_path)
+        self.batch_size = batch_size
+        self.quantization = quantization
+
+    def iter_contents(self) -> Iterator[tuple[str, str]]:
+        """
+        Iterate over the documents of the JSON file without encoding them.
 
-    def load(self, encoder: SentenceTransformer) -> list[Document]:
+        Returns:
+            Iterator[tuple[str, str]]: The id and the serialized content of each
+            document.
+
+        Raises:
+            FileNotFoundError: If the JSON file does not exist.
+            ValueError: If the JSON file does not contain a list of documents.
+        """
         if not self.file_path.exists():
             raise FileNotFoundError(f"JSON file not found: {self.file_path}")
 
@@ -52,14 +113,19 @@ class JSONDocumentLoader:
         if not isinstance(data, list):
             raise ValueError("JSON file must contain a list of documents")
 
-        return [
-            Document(
-                id=str(idx),
-                content=json.dumps(doc),
-                embeddings=encoder.encode(json.dumps(doc), convert_to_numpy=True),
-            )
-            for idx, doc in enumerate(data)
-        ]
+        for idx, doc in enumerate(data):
+            yield str(idx), json.dumps(doc)
+
+    def load(self, encoder: Encoder) -> list[Document]:
+        documents = list(self.iter_contents())
+
+        return encode_documents(
+            [doc_id for doc_id, _ in documents],
+            [content for _, content in documents],
+            encoder,
+            self.batch_size,
+            self.quantization,
+        )
 
 
 class ModelDocumentLoader:
@@ -73,17 +139,26 @@ class ModelDocumentLoader:
         __init__(documents: list[BaseModel]):
             Initializes the ModelDocumentLoader with a list of BaseModel instances.
 
-        load(encoder: SentenceTransformer) -> list[DocumentMeta]:
+        load(encoder: Encoder) -> list[DocumentMeta]:
             Loads the documents, encodes their content using the provided encoder,
             and returns a list of DocumentMeta instances.
     """
 
-    def __init__(self, documents: list[Item]):
+    def __init__(
+        self,
+        documents: list[Item],
+        batch_size: int = 64,
+        quantization: Quantization = "none",
+    ):
         """
         Initialize the DocumentLoader with a list of documents.
 
         Args:
             documents (list[Item]): A list of Item instances.
+            batch_size (int, optional): Number of documents encoded per batch.
+                                        Defaults to 64.
+            quantization (Quantization, optional): Representation of the document
+                                        embeddings. Defaults to "none" (float32).
 
         Raises:
             TypeError: If documents is not a list or if any element
@@ -94,13 +169,14 @@ class ModelDocumentLoader:
         ):
             raise TypeError("documents must be a list of Item instances")
         self.documents = documents
-
-    def load(self, encoder: SentenceTransformer) -> list[Document]:
-        return [
-            Document(
-                id=doc.id,
-                content=doc.model_dump_json(),
-                embeddings=encoder.encode(doc.model_dump_json(), convert_to_numpy=True),
-            )
-            for doc in self.documents
-        ]
+        self.batch_size = batch_size
+        self.quantization = quantization
+
+    def load(self, encoder: Encoder) -> list[Document]:
+        return encode_documents(
+            [doc.id for doc in self.documents],
+            [doc.model_dump_json() for doc in self.documents],
+            encoder,
+            self.batch_size,
+            self.quantization,
+        )
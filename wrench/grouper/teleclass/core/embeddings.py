@@ -0,0 +1,448 @@
+"""
+Persistent, content-addressed embedding cache.
+
+Embeddings are stored per encoder model in a memory-mapped matrix (float32, or
+quantized to float16 or int8), indexed by a hash of the encoded text. Only texts
+that are not in the cache are encoded, so repeated runs over mostly unchanged
+documents, terms and class names skip the bulk of the encoding work. Each store
+is bounded in size and evicts the least recently used embeddings when it is full.
+"""
+
+import hashlib
+import json
+import os
+import re
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Mapping, Sequence
+
+import numpy as np
+
+from wrench.grouper.teleclass.core.encoder import Encoder
+from wrench.grouper.teleclass.core.encoding import encode_batched
+from wrench.grouper.teleclass.core.quantization import (
+    DTYPES,
+    Quantization,
+    dequantize,
+    quantize,
+)
+from wrench.log import logger
+
+# arguments of `SentenceTransformer.encode` that do not change the embeddings
+IGNORED_ENCODE_ARGUMENTS = frozenset({"convert_to_numpy", "show_progress_bar"})
+
+# arguments changing the type of the result, which is always a numpy array
+UNSUPPORTED_ENCODE_ARGUMENTS = frozenset({"convert_to_tensor", "output_value"})
+
+
+class EmbeddingStore:
+    """Memory-mapped embedding matrix of one encoder model with an LRU hash index."""
+
+    def __init__(
+        self,
+        path: str | Path,
+        max_size_mb: float = 512,
+        quantization: Quantization = "none",
+    ):
+        """
+        Opens the store at the given path, loading an existing index.
+
+        Args:
+            path (str | Path): Directory of the store.
+            max_size_mb (float, optional): Maximum size of the embedding matrix in
+                                           megabytes. Defaults to 512.
+            quantization (Quantization, optional): Storage representation of the
+                                           embeddings. Defaults to "none" (float32).
+
+        Attributes:
+            dimension (int | None): Embedding dimension, None until the first write.
+            hits (int): Number of embeddings served from the store.
+            misses (int): Number of requested embeddings not in the store.
+        """
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = int(max_size_mb * 1024 * 1024)
+        self.quantization = quantization
+        self.dtype = DTYPES[quantization]
+        self.dimension: int | None = None
+        self.hits = 0
+        self.misses = 0
+        # hash -> row, ordered from least to most recently used
+        self._index: OrderedDict[str, int] = OrderedDict()
+        self._free_rows: list[int] = []
+        self._size = 0
+        self._vectors: np.memmap | None = None
+        # per-vector scales of int8 embeddings
+        self._scales: np.memmap | None = None
+        self._dirty = False
+        self.logger = logger.getChild(self.__class__.__name__)
+        self._load()
+
+    @property
+    def _index_path(self) -> Path:
+        return self.path / "index.json"
+
+    @property
+    def _vectors_path(self) -> Path:
+        return self.path / "vectors.bin"
+
+    @property
+    def _scales_path(self) -> Path:
+        return self.path / "scales.f32"
+
+    @property
+    def _row_bytes(self) -> int:
+        assert self.dimension is not None
+        scale_bytes = 4 if self.quantization == "int8" else 0
+        return self.dimension * self.dtype.itemsize + scale_bytes
+
+    @property
+    def max_rows(self) -> int:
+        """Maximum number of embeddings the store holds."""
+        if self.dimension is None:
+            return 0
+        return max(1, self.max_bytes // self._row_bytes)
+
+    @property
+    def capacity(self) -> int:
+        """Number of rows currently allocated in the matrix file."""
+        return 0 if self._vectors is None else self._vectors.shape[0]
+
+    @staticmethod
+    def key(text: str, options: Mapping[str, Any] | None = None) -> str:
+        """
+        Content hash used to index a text.
+
+        Args:
+            text (str): The encoded text.
+            options (Mapping[str, Any] | None, optional): Encoding arguments that
+                change the embedding, e.g. `normalize_embeddings`.
+                Defaults to None.
+
+        Returns:
+            str: Hex digest of the text and the options.
+        """
+        content = text
+        if options:
+            content = json.dumps(options, sort_keys=True, default=str) + "\0" + text
+        return hashlib.blake2b(content.encode(), digest_size=16).hexdigest()
+
+    def _load(self) -> None:
+        if not self._index_path.exists():
+            return
+
+        try:
+            index = json.loads(self._index_path.read_text())
+            if index.get("quantization", "none") != self.quantization:
+                raise ValueError("store uses another quantization")
+            self.dimension = int(index["dimension"])
+            capacity = int(index["capacity"])
+            entries = [(str(key), int(row)) for key, row in index["entries"]]
+            expected = capacity * self.dimension * self.dtype.itemsize
+            if self._vectors_path.stat().st_size < expected:
+                raise ValueError("embedding matrix is smaller than its index")
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            self.logger.warning(
+                "Discarding unreadable embedding store %s: %s", self.path, e
+            )
+            self.clear()
+            return
+
+        self._open(capacity)
+        self._index = OrderedDict(entries)
+        used = set(self._index.values())
+        self._size = max(used) + 1 if used else 0
+        self._free_rows = [row for row in range(self._size) if row not in used]
+
+    def _open(self, capacity: int) -> None:
+        """Open the matrix file, growing it to `capacity` rows if necessary."""
+        assert self.dimension is not None
+        self._close()
+        self._vectors = self._map(
+            self._vectors_path, self.dtype, (capacity, self.dimension)
+        )
+        if self.quantization == "int8":
+            self._scales = self._map(
+                self._scales_path, np.dtype(np.float32), (capacity,)
+            )
+
+    @staticmethod
+    def _map(path: Path, dtype: np.dtype, shape: tuple[int, ...]) -> np.memmap:
+        """Memory-map a file, growing it to the given shape if necessary."""
+        size = int(np.prod(shape)) * dtype.itemsize
+        with open(path, "ab") as f:
+            if f.tell() < size:
+                f.truncate(size)
+        return np.memmap(path, dtype=dtype, mode="r+", shape=shape)
+
+    def _close(self) -> None:
+        for vectors in (self._vectors, self._scales):
+            if vectors is not None:
+                vectors.flush()
+        self._vectors = None
+        self._scales = None
+
+    def _allocate_row(self) -> int:
+        if self._free_rows:
+            return self._free_rows.pop()
+
+        if self._size < self.capacity:
+            self._size += 1
+            return self._size - 1
+
+        if self.capacity < self.max_rows:
+            self._open(min(self.max_rows, max(1024, 2 * self.capacity)))
+            self._size += 1
+            return self._size - 1
+
+        # store is full, reuse the row of the least recently used embedding
+        _, row = self._index.popitem(last=False)
+        return row
+
+    def get(self, keys: Sequence[str]) -> dict[str, np.ndarray]:
+        """
+        Look up embeddings by text hash.
+
+        Args:
+            keys (Sequence[str]): Text hashes, see `key`.
+
+        Returns:
+            dict[str, np.ndarray]: Embeddings of all keys found in the store.
+        """
+        found = [key for key in dict.fromkeys(keys) if key in self._index]
+        self.hits += len(found)
+        self.misses += len(set(keys)) - len(found)
+        if not found or self._vectors is None:
+            return {}
+
+        for key in found:
+            self._index.move_to_end(key)
+        self._dirty = True
+
+        rows = np.fromiter((self._index[key] for key in found), dtype=np.intp)
+        scales = self._scales[rows] if self._scales is not None else None
+        return dict(zip(found, dequantize(self._vectors[rows], scales)))
+
+    def put(self, keys: Sequence[str], embeddings: np.ndarray) -> None:
+        """
+        Store embeddings under their text hashes.
+
+        Args:
+            keys (Sequence[str]): Text hashes, see `key`.
+            embeddings (np.ndarray): Matrix with one embedding row per key.
+
+        Raises:
+            ValueError: If the embedding dimension does not match the store.
+        """
+        if len(keys) == 0:
+            return
+
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        if self.dimension is None:
+            self.dimension = embeddings.shape[1]
+        elif embeddings.shape[1] != self.dimension:
+            raise ValueError(
+                f"embedding dimension {embeddings.shape[1]} does not match "
+                f"store dimension {self.dimension}"
+            )
+
+        # more embeddings than fit in the store, keep the last ones
+        keys, embeddings = keys[-self.max_rows :], embeddings[-self.max_rows :]
+        values, scales = quantize(embeddings, self.quantization)
+        for i, key in enumerate(keys):
+            if key in self._index:
+                row = self._index[key]
+                self._index.move_to_end(key)
+            else:
+                row = self._allocate_row()
+                self._index[key] = row
+            self._vectors[row] = values[i]  # type: ignore[index]
+            if self._scales is not None and scales is not None:
+                self._scales[row] = scales[i]
+        self._dirty = True
+
+    def flush(self) -> None:
+        """Write the embedding matrix and the index to disk."""
+        if not self._dirty or self._vectors is None:
+            return
+
+        self._vectors.flush()
+        if self._scales is not None:
+            self._scales.flush()
+        index = {
+            "quantization": self.quantization,
+            "dimension": self.dimension,
+            "capacity": self.capacity,
+            "entries": list(self._index.items()),
+        }
+        tmp_path = self._index_path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(index))
+        os.replace(tmp_path, self._index_path)
+        self._dirty = False
+
+    def clear(self) -> None:
+        """Remove all embeddings from the store."""
+        self._vectors = None
+        self._scales = None
+        self._index.clear()
+        self._free_rows.clear()
+        self._size = 0
+        self.dimension = None
+        self._index_path.unlink(missing_ok=True)
+        self._vectors_path.unlink(missing_ok=True)
+        self._scales_path.unlink(missing_ok=True)
+
+    def __len__(self) -> int:
+        """Number of embeddings in the store."""
+        return len(self._index)
+
+
+class CachedEncoder:
+    """Encoder wrapper that serves embeddings from an `EmbeddingStore`."""
+
+    def __init__(
+        self,
+        encoder: Encoder,
+        store: EmbeddingStore,
+        batch_size: int = 64,
+    ):
+        """
+        Wraps an encoder with a persistent embedding store.
+
+        Args:
+            encoder (Encoder): The model used for texts not in the store.
+            store (EmbeddingStore): The store of the encoder's model.
+            batch_size (int, optional): Number of texts encoded per batch.
+                                        Defaults to 64.
+        """
+        self.encoder = encoder
+        self.store = store
+        self.batch_size = batch_size
+
+    def encode(
+        self,
+        sentences: str | Sequence[str],
+        batch_size: int | None = None,
+        **kwargs: Any,
+    ) -> np.ndarray:
+        """
+        Encode texts, only running the model for texts not in the store.
+
+        Accepts the arguments of `SentenceTransformer.encode`, but always returns
+        numpy arrays. Arguments that change the embeddings are passed to the
+        encoder and are part of the cache key.
+
+        Args:
+            sentences (str | Sequence[str]): A text or a sequence of texts.
+            batch_size (int | None, optional): Number of texts encoded per batch.
+                                               Defaults to the encoder's batch size.
+            **kwargs: Further arguments of `SentenceTransformer.encode`.
+                `convert_to_numpy` and `show_progress_bar` are ignored.
+
+        Returns:
+            np.ndarray: A single embedding for a text, otherwise a matrix with one
+            embedding row per text.
+
+        Raises:
+            ValueError: If an argument would change the type of the result.
+        """
+        unsupported = UNSUPPORTED_ENCODE_ARGUMENTS.intersection(kwargs)
+        if unsupported:
+            raise ValueError(
+                f"Unsupported arguments of the cached encoder: {sorted(unsupported)}"
+            )
+        options = {
+            name: value
+            for name, value in kwargs.items()
+            if name not in IGNORED_ENCODE_ARGUMENTS
+        }
+
+        single = isinstance(sentences, str)
+        texts: list[str] = (
+            [sentences] if isinstance(sentences, str) else list(sentences)
+        )
+        keys = [self.store.key(text, options) for text in texts]
+
+        embeddings = self.store.get(keys)
+        missing = [key for key in dict.fromkeys(keys) if key not in embeddings]
+        if missing:
+            text_by_key = dict(zip(keys, texts))
+            encoded = encode_batched(
+                self.encoder,
+                [text_by_key[key] for key in missing],
+                batch_size or self.batch_size,
+                **options,
+            )
+            self.store.put(missing, encoded)
+            embeddings.update(zip(missing, encoded))
+
+        if not keys:
+            dimension = self.get_sentence_embedding_dimension() or 0
+            return np.empty((0, dimension), dtype=np.float32)
+
+        result = np.stack([embeddings[key] for key in keys])
+        return result[0] if single else result
+
+    def similarity(self, embeddings1: Any, embeddings2: Any) -> np.ndarray:
+        """Compute similarities with the wrapped encoder's similarity function."""
+        return self.encoder.similarity(embeddings1, embeddings2)
+
+    def get_sentence_embedding_dimension(self) -> int | None:
+        """Embedding dimension of the wrapped encoder."""
+        return self.encoder.get_sentence_embedding_dimension()
+
+
+class EmbeddingCache:
+    """Directory of embedding stores, one per encoder model."""
+
+    def __init__(
+        self,
+        directory: str | Path,
+        max_size_mb: float = 512,
+        quantization: Quantization = "none",
+    ):
+        """
+        Initializes the cache directory.
+
+        Args:
+            directory (str | Path): Directory for the embedding stores.
+            max_size_mb (float, optional): Maximum size of each model's store in
+                                           megabytes. Defaults to 512.
+            quantization (Quantization, optional): Storage representation of the
+                                           embeddings. Defaults to "none" (float32).
+        """
+        self.directory = Path(directory)
+        self.max_size_mb = max_size_mb
+        self.quantization: Quantization = quantization
+        self._stores: dict[str, EmbeddingStore] = {}
+
+    def store(self, model_name: str) -> EmbeddingStore:
+        """Get the store of an encoder model, opening it on first use."""
+        if model_name not in self._stores:
+            name = re.sub(r"[^\w.-]", "_", model_name)
+            self._stores[model_name] = EmbeddingStore(
+                self.directory / name, self.max_size_mb, self.quantization
+            )
+        return self._stores[model_name]
+
+    def wrap(
+        self, encoder: Encoder, model_name: str, batch_size: int = 64
+    ) -> CachedEncoder:
+        """
+        Wrap an encoder so it uses the store of its model.
+
+        Args:
+            encoder (Encoder): The encoder to wrap.
+            model_name (str): Name of the encoder's model.
+            batch_size (int, optional): Number of texts encoded per batch.
+                                        Defaults to 64.
+
+        Returns:
+            CachedEncoder: The wrapped encoder.
+        """
+        return CachedEncoder(encoder, self.store(model_name), batch_size)
+
+    def flush(self) -> None:
+        """Write all open stores to disk."""
+        for store in self._stores.values():
+            store.flush()
@@ -0,0 +1,117 @@
+"""
+Shared, lazily loaded sentence encoders.
+
+Every component of the TELEClass package obtains its encoder from `get_encoder`,
+so each model is loaded at most once per process. Models are only loaded when
+the first text has to be encoded; similarities are computed with numpy and never
+require the model.
+"""
+
+import threading
+from typing import TYPE_CHECKING, Any, Protocol, Sequence
+
+import numpy as np
+
+from wrench.log import logger
+
+if TYPE_CHECKING:
+    from sentence_transformers import SentenceTransformer
+
+
+class Encoder(Protocol):
+    """Interface of the text encoders used in the TELEClass package."""
+
+    def encode(self, sentences: str | Sequence[str], **kwargs: Any) -> np.ndarray:
+        """Encode a text or a sequence of texts into embeddings."""
+        ...
+
+    def similarity(self, embeddings1: Any, embeddings2: Any) -> np.ndarray:
+        """Compute the pairwise similarities of two sets of embeddings."""
+        ...
+
+    def get_sentence_embedding_dimension(self) -> int | None:
+        """Dimension of the produced embeddings."""
+        ...
+
+
+def cosine_similarity(embeddings1: Any, embeddings2: Any) -> np.ndarray:
+    """
+    Compute pairwise cosine similarities.
+
+    Args:
+        embeddings1 (Any): An embedding or a matrix of embeddings.
+        embeddings2 (Any): An embedding or a matrix of embeddings.
+
+    Returns:
+        np.ndarray: Matrix of shape (len(embeddings1), len(embeddings2)).
+    """
+    a = np.atleast_2d(np.asarray(embeddings1, dtype=np.float32))
+    b = np.atleast_2d(np.asarray(embeddings2, dtype=np.float32))
+    a = a / np.maximum(np.linalg.norm(a, axis=1, keepdims=True), 1e-12)
+    b = b / np.maximum(np.linalg.norm(b, axis=1, keepdims=True), 1e-12)
+    return a @ b.T
+
+
+class LazyEncoder:
+    """Sentence transformer that is loaded on first use."""
+
+    def __init__(self, model_name: str):
+        """
+        Initializes the encoder without loading the model.
+
+        Args:
+            model_name (str): Name or path of the sentence transformer model.
+        """
+        self.model_name = model_name
+        self._model: "SentenceTransformer | None" = None
+        self._lock = threading.Lock()
+        self.logger = logger.getChild(self.__class__.__name__)
+
+    @property
+    def loaded(self) -> bool:
+        """Whether the model has been loaded."""
+        return self._model is not None
+
+    @property
+    def model(self) -> "SentenceTransformer":
+        """The sentence transformer, loaded on first access."""
+        if self._model is None:
+            with self._lock:
+                if self._model is None:
+                    from sentence_transformers import SentenceTransformer
+
+                    self.logger.info("Loading encoder model %s", self.model_name)
+                    self._model = SentenceTransformer(self.model_name)
+        return self._model
+
+    def encode(self, sentences: str | Sequence[str], **kwargs: Any) -> np.ndarray:
+        """Encode texts with `SentenceTransformer.encode`, loading the model."""
+        return self.model.encode(sentences, **kwargs)  # type: ignore[arg-type]
+
+    def similarity(self, embeddings1: Any, embeddings2: Any) -> np.ndarray:
+        """Compute pairwise cosine similarities without loading the model."""
+        return cosine_similarity(embeddings1, embeddings2)
+
+    def get_sentence_embedding_dimension(self) -> int | None:
+        """Dimension of the produced embeddings, loading the model."""
+        return self.model.get_sentence_embedding_dimension()
+
+
+_encoders: dict[str, LazyEncoder] = {}
+_encoders_lock = threading.Lock()
+
+
+def get_encoder(model_name: str) -> LazyEncoder:
+    """
+    Get the process-wide encoder of a model.
+
+    Args:
+        model_name (str): Name or path of the sentence transformer model.
+
+    Returns:
+        LazyEncoder: The shared encoder, the model is loaded on first encode.
+    """
+    with _encoders_lock:
+        if model_name not in _encoders:
+            _encoders[model_name] = LazyEncoder(model_name)
+        return _encoders[model_name]
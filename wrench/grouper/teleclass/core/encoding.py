@@ -0,0 +1,48 @@
+from typing import Any, Sequence
+
+import numpy as np
+
+from wrench.grouper.teleclass.core.encoder import Encoder
+
+
+def encode_batched(
+    encoder: Encoder, texts: Sequence[str], batch_size: int = 64, **options: Any
+) -> np.ndarray:
+    """
+    Encode texts in batches of similar length.
+
+    Texts are sorted by length so each batch needs little padding, encoded batch
+    by batch and scattered back into the original order.
+
+    Args:
+        encoder (Encoder): The model used for encoding.
+        texts (Sequence[str]): The texts to encode.
+        batch_size (int, optional): Number of texts per batch. Defaults to 64.
+        **options: Further arguments of `SentenceTransformer.encode`, e.g.
+            `normalize_embeddings`.
+
+    Returns:
+        np.ndarray: Matrix with one embedding row per text, in input order.
+    """
+    if not texts:
+        dimension = encoder.get_sentence_embedding_dimension() or 0
+        return np.empty((0, dimension), dtype=np.float32)
+
+    # longest first, so memory problems surface on the first batch
+    order = np.argsort([-len(text) for text in texts], kind="stable")
+    embeddings: np.ndarray | None = None
+
+    for start in range(0, len(texts), batch_size):
+        indices = order[start : start + batch_size]
+        batch = encoder.encode(
+            [texts[i] for i in indices],
+            batch_size=len(indices),
+            convert_to_numpy=True,
+            show_progress_bar=False,
+            **options,
+        )
+        if embeddings is None:
+            embeddings = np.empty((len(texts), batch.shape[1]), dtype=batch.dtype)
+        embeddings[indices] = batch
+
+    return embeddings  # type: ignore[return-value]
@@ -0,0 +1,55 @@
+from wrench.grouper.base import Group
+from wrench.grouper.teleclass.core.taxonomy_manager import TaxonomyManager
+
+
+class GroupCollector:
+    """
+    Incrementally builds the leaf-to-items groups from class predictions.
+
+    Predictions can be added one item at a time, e.g. while consuming a
+    classification stream, and the groups can be read at any point.
+
+    Attributes:
+        taxonomy_manager (TaxonomyManager): Taxonomy the predictions refer to.
+        items (dict[str, list[str]]): Items collected per leaf class, in the
+            order the leaf classes were first predicted.
+    """
+
+    def __init__(self, taxonomy_manager: TaxonomyManager):
+        """
+        Initializes an empty collector.
+
+        Args:
+            taxonomy_manager (TaxonomyManager): Taxonomy the predictions refer to.
+        """
+        self.taxonomy_manager = taxonomy_manager
+        self._leaf_nodes = taxonomy_manager.get_leaf_nodes()
+        self.items: dict[str, list[str]] = {}
+
+    def add(self, item: str, classes: set[str]) -> None:
+        """
+        Add an item to the groups of its predicted leaf classes.
+
+        Args:
+            item (str): The item content stored in the groups.
+            classes (set[str]): The classes predicted for the item.
+        """
+        for leaf_class in classes & self._leaf_nodes:
+            self.items.setdefault(leaf_class, []).append(item)
+
+    def groups(self) -> list[Group]:
+        """
+        Build the groups collected so far.
+
+        Returns:
+            list[Group]: One group per predicted leaf class, with its ancestors as
+            parent classes.
+        """
+        return [
+            Group(
+                name=leaf_class,
+                items=list(items),
+                parent_classes=self.taxonomy_manager.get_ancestors(leaf_class),
+            )
+            for leaf_class, items in self.items.items()
+        ]
@@ -10,6 +10,8 @@ class Document(BaseModel):
     model_config = ConfigDict(arbitrary_types_allowed=True)
     id: str = ""
     embeddings: np.ndarray
+    # scale of int8 quantized embeddings, embeddings * scale restores the vector
+    embedding_scale: float | None = None
     content: str
     # Core classes set after LLM enrichment
     core_classes: set[str] | None = None
@@ -0,0 +1,86 @@
+"""
+Linear dimensionality reduction of embeddings.
+
+A `Projection` maps embeddings to fewer dimensions, either with PCA fitted on the
+training documents and class terms, or with a Gaussian random projection, which
+approximately preserves angles without any fitting. Class embeddings are stored
+projected, and document embeddings are projected before they are compared to
+them.
+"""
+
+from typing import Literal
+
+import numpy as np
+
+ProjectionMethod = Literal["pca", "random"]
+
+
+class Projection:
+    """Affine projection `(x - mean) @ components.T`."""
+
+    def __init__(self, mean: np.ndarray, components: np.ndarray):
+        """
+        Initializes the projection.
+
+        Args:
+            mean (np.ndarray): Vector subtracted before projecting.
+            components (np.ndarray): Matrix with one projection axis per row.
+        """
+        self.mean = np.asarray(mean, dtype=np.float32)
+        self.components = np.asarray(components, dtype=np.float32)
+
+    @property
+    def dimension(self) -> int:
+        """Dimension of projected embeddings."""
+        return self.components.shape[0]
+
+    @classmethod
+    def fit(
+        cls,
+        samples: np.ndarray,
+        dimension: int,
+        method: ProjectionMethod = "pca",
+        seed: int = 0,
+    ) -> "Projection":
+        """
+        Fit a projection on sample embeddings.
+
+        PCA keeps the directions of largest variance. It can keep at most as many
+        components as there are samples, so small training sets produce fewer
+        than `dimension` dimensions.
+
+        Args:
+            samples (np.ndarray): Matrix with one sample embedding per row.
+            dimension (int): Target dimension.
+            method (ProjectionMethod, optional): "pca" or "random". Defaults to "pca".
+            seed (int, optional): Seed of the random projection. Defaults to 0.
+
+        Returns:
+            Projection: The fitted projection.
+        """
+        samples = np.atleast_2d(np.asarray(samples, dtype=np.float32))
+        dimension = min(dimension, samples.shape[1])
+
+        if method == "random":
+            rng = np.random.default_rng(seed)
+            components = rng.normal(size=(dimension, samples.shape[1])) / np.sqrt(
+                dimension
+            )
+            return cls(np.zeros(samples.shape[1]), components)
+
+        mean = samples.mean(axis=0)
+        _, _, vt = np.linalg.svd(samples - mean, full_matrices=False)
+        return cls(mean, vt[:dimension])
+
+    def transform(self, embeddings: np.ndarray) -> np.ndarray:
+        """
+        Project embeddings.
+
+        Args:
+            embeddings (np.ndarray): An embedding or a matrix of embeddings.
+
+        Returns:
+            np.ndarray: The projected embedding(s) as float32.
+        """
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        return (embeddings - self.mean) @ self.components.T
@@ -0,0 +1,67 @@
+"""
+Quantized embedding storage.
+
+Embeddings can be stored as float16, or as int8 with one float32 scale per
+vector (symmetric quantization, `vector ~= values * scale`). Both cut storage of
+float32 embeddings by a factor of two or four. Quantization only reduces storage:
+embeddings are dequantized to float32, one chunk at a time, before similarities
+are computed.
+"""
+
+from typing import Literal
+
+import numpy as np
+
+Quantization = Literal["none", "float16", "int8"]
+
+DTYPES: dict[str, np.dtype] = {
+    "none": np.dtype(np.float32),
+    "float16": np.dtype(np.float16),
+    "int8": np.dtype(np.int8),
+}
+
+
+def quantize(
+    embeddings: np.ndarray, quantization: Quantization
+) -> tuple[np.ndarray, np.ndarray | None]:
+    """
+    Quantize embeddings.
+
+    Args:
+        embeddings (np.ndarray): An embedding or a matrix with one embedding per row.
+        quantization (Quantization): Target representation.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray | None]: The quantized values and, for int8,
+        the scale of each vector (a scalar for a single embedding).
+    """
+    embeddings = np.asarray(embeddings, dtype=np.float32)
+    if quantization == "none":
+        return embeddings, None
+    if quantization == "float16":
+        return embeddings.astype(np.float16), None
+
+    scales = np.abs(embeddings).max(axis=-1, keepdims=True) / 127.0
+    scales = np.where(scales > 0, scales, 1.0).astype(np.float32)
+    values = np.clip(np.rint(embeddings / scales), -127, 127).astype(np.int8)
+    return values, scales.squeeze(-1)
+
+
+def dequantize(
+    values: np.ndarray, scales: np.ndarray | float | None = None
+) -> np.ndarray:
+    """
+    Restore float32 embeddings from quantized values.
+
+    Args:
+        values (np.ndarray): Quantized embedding(s).
+        scales (np.ndarray | float | None, optional): Per-vector scales of int8
+            values, a single float for a single vector. Defaults to None.
+
+    Returns:
+        np.ndarray: The float32 embedding(s).
+    """
+    embeddings = np.asarray(values, dtype=np.float32)
+    if scales is not None:
+        embeddings = embeddings * np.asarray(scales, dtype=np.float32)[..., np.newaxis]
+    return embeddings
@@ -1,11 +1,11 @@
 import json
-from collections import defaultdict
+from itertools import chain, count, islice
 from pathlib import Path
-from typing import Union
+from typing import Iterable, Iterator, Union
 
 import numpy as np
-from sentence_transformers import SentenceTransformer
 
+from wrench.common.prompt_cache import PromptCache
 from wrench.grouper.base import BaseGrouper, Group
 from wrench.grouper.teleclass.classifier.similarity import SimilarityClassifier
 from wrench.grouper.teleclass.core.cache import TELEClassCache
@@ -14,19 +14,31 @@ from wrench.grouper.teleclass.core.document_loader import (
     DocumentLoader,
     JSONDocumentLoader,
     ModelDocumentLoader,
+    encode_documents,
 )
+from wrench.grouper.teleclass.core.embeddings import EmbeddingCache
+from wrench.grouper.teleclass.core.encoder import Encoder, get_encoder
+from wrench.grouper.teleclass.core.grouping import GroupCollector
 from wrench.grouper.teleclass.core.models import (
     CorpusEnrichmentResult,
     Document,
     EnrichedClass,
     LLMEnrichmentResult,
 )
+from wrench.grouper.teleclass.core.projection import Projection
+from wrench.grouper.teleclass.core.quantization import dequantize
 from wrench.grouper.teleclass.core.taxonomy_manager import TaxonomyManager
 from wrench.grouper.teleclass.enrichment.corpus import CorpusEnricher
 from wrench.grouper.teleclass.enrichment.llm import LLMEnricher
 from wrench.log import logger
 from wrench.models import Item
 
+# number of documents used for training when none is given explicitly
+TRAINING_SAMPLE_SIZE = 20
+
+# number of streamed micro-batches between writes of the embedding cache index
+STREAM_FLUSH_INTERVAL = 100
+
 
 class TELEClassGrouper(BaseGrouper):
     """Main class for taxonomy-enhanced text classification.
@@ -37,11 +49,16 @@ class TELEClassGrouper(BaseGrouper):
     Attributes:
         config (TELEClassConfig): Configuration settings for the classifier.
         taxonomy_manager (TaxonomyManager): Manages taxonomy operations and relationships.
-        encoder (SentenceTransformer): Model for encoding text into embeddings.
+        encoder (Encoder): Shared model for encoding text into embeddings, loaded
+            on first use.
         llm_enricher (LLMEnricher): Handles LLM-based enrichment operations.
         corpus_enricher (CorpusEnricher): Handles corpus-based enrichment operations.
         enriched_classes (list[EnrichedClass]): List of classes with their enriched terms.
         cache (TELEClassCache, optional): Caches intermediate results if enabled.
+        classifier_manager (SimilarityClassifier | None): Resident classifier built
+            from the cached class embeddings, None until first use.
+        embedding_cache (EmbeddingCache | None): Persistent embedding cache shared
+            by all encoders, None if disabled.
         logger (Logger): Logger instance for this class.
     """
 
@@ -64,13 +81,44 @@ class TELEClassGrouper(BaseGrouper):
         self.config = config
         # Initialize components
         self.taxonomy_manager = TaxonomyManager.from_config(config.taxonomy)
-        self.encoder = SentenceTransformer(config.embedding.model_name)
+        self.embedding_cache = (
+            EmbeddingCache(
+                Path(config.cache.directory) / "embeddings",
+                config.embedding.cache_max_size_mb,
+                config.embedding.quantization,
+            )
+            if config.cache.enabled and config.embedding.cache
+            else None
+        )
+        encoder = get_encoder(config.embedding.model_name)
+        self.encoder: Encoder = (
+            self.embedding_cache.wrap(
+                encoder, config.embedding.model_name, config.embedding.batch_size
+            )
+            if self.embedding_cache is not None
+            else encoder
+        )
         # Initialize enrichers
         self.llm_enricher = LLMEnricher(
-            config=config.llm, taxonomy_manager=self.taxonomy_manager
+            config=config.llm,
+            taxonomy_manager=self.taxonomy_manager,
+            encoder=self.encoder,
+            ann_config=config.classifier.ann,
+            prompt_cache=(
+                PromptCache(
+                    Path(config.cache.directory) / "prompts.sqlite",
+                    config.llm.cache_max_size_mb,
+                )
+                if config.cache.enabled and config.llm.cache
+                else None
+            ),
         )
         self.corpus_enricher = CorpusEnricher(
-            config=config.corpus, encoder_model=config.embedding.model_name
+            config=config.corpus,
+            taxonomy_manager=self.taxonomy_manager,
+            encoder=self.encoder,
+            batch_size=config.embedding.batch_size,
+            cache_dir=Path(config.cache.directory) if config.cache.enabled else None,
         )
 
         # initialize empty set of terms for all classes, embeddings are not yet set here
@@ -81,7 +129,12 @@ class TELEClassGrouper(BaseGrouper):
             for class_name, class_description in self.taxonomy_manager.get_all_classes_with_description().items()
         ]
         # Initialize cache
-        self.cache = TELEClassCache(config.cache.directory)
+        self.cache = TELEClassCache(
+            config.cache.directory, config.embedding.quantization
+        )
+        self.classifier_manager: SimilarityClassifier | None = None
+        # modification time of the class embeddings the classifier was built from
+        self._classifier_mtime: int | None = None
 
         self.logger = logger.getChild(self.__class__.__name__)
 
@@ -100,13 +153,23 @@ class TELEClassGrouper(BaseGrouper):
             FileNotFoundError: If the input file path doesn't exist.
             ValueError: If the JSON file format is invalid.
         """
+        batch_size = self.config.embedding.batch_size
+        quantization = self.config.embedding.quantization
         loader: DocumentLoader = (
-            JSONDocumentLoader(source)
+            JSONDocumentLoader(source, batch_size, quantization)
             if isinstance(source, (str, Path))
-            else ModelDocumentLoader(source)
+            else ModelDocumentLoader(source, batch_size, quantization)
         )
 
-        return loader.load(self.encoder)
+        documents = loader.load(self.encoder)
+        self._flush_embeddings()
+
+        return documents
+
+    def _flush_embeddings(self) -> None:
+        """Write newly cached embeddings to disk."""
+        if self.embedding_cache is not None:
+            self.embedding_cache.flush()
 
     # for testing and evaluation
     def _load_labels(self, source: Union[str]) -> list[set[str]]:
@@ -134,7 +197,9 @@ class TELEClassGrouper(BaseGrouper):
 
         return [set(d["label"]) for d in data]
 
-    def run(self, documents: list[Document], sample_size: int = 20) -> None:
+    def run(
+        self, documents: list[Document], sample_size: int = TRAINING_SAMPLE_SIZE
+    ) -> None:
         """
         Executes the training process on a given list of documents.
 
@@ -170,14 +235,20 @@ class TELEClassGrouper(BaseGrouper):
 
             self.logger.info("Finished corpus-based enrichment step.")
 
-            self._save_class_embeddings()
+            self._save_class_embeddings(documents)
 
-            self.cache.save_class_embeddings(self.enriched_classes)
+            # rebuild the resident classifier from the new class embeddings
+            self.classifier_manager = None
+            self._get_classifier()
 
         except Exception as e:
             self.logger.error("Training failed: %s", e)
             raise
 
+        finally:
+            self.llm_enricher.close()
+            self._flush_embeddings()
+
     def _perform_llm_enrichment(
         self, collection: list[Document]
     ) -> LLMEnrichmentResult:
@@ -243,14 +314,79 @@ class TELEClassGrouper(BaseGrouper):
 
         return corpus_enrichment_result
 
-    def _save_class_embeddings(self):
-        """Averages class term embeddings to create class representation."""
+    def _save_class_embeddings(self, documents: list[Document]):
+        """
+        Averages class term embeddings to create class representation.
+
+        If a projection is configured, it is fitted on the training documents and
+        the class terms, and the class embeddings are stored projected.
+        """
+        projection = (
+            self._fit_projection(documents)
+            if self.config.embedding.projection.enabled
+            else None
+        )
         for ec in self.enriched_classes:
             if ec.embeddings is not None:
                 # Use pre-computed embeddings
                 ec.embeddings = np.mean(ec.embeddings, axis=0)
+                if projection is not None:
+                    ec.embeddings = projection.transform(ec.embeddings)
+
+        self.cache.save_class_embeddings(self.enriched_classes, projection)
+
+    def _fit_projection(self, documents: list[Document]) -> Projection:
+        """Fit the configured projection on document and class term embeddings."""
+        config = self.config.embedding.projection
+        samples = [
+            np.atleast_2d(dequantize(doc.embeddings, doc.embedding_scale))
+            for doc in documents
+        ] + [
+            np.atleast_2d(ec.embeddings)
+            for ec in self.enriched_classes
+            if ec.embeddings is not None
+        ]
+        projection = Projection.fit(
+            np.concatenate(samples), config.dimension, config.method
+        )
+        self.logger.info(
+            "Projecting embeddings to %d dimensions (%s)",
+            projection.dimension,
+            config.method,
+        )
+        return projection
+
+    def _get_classifier(self) -> SimilarityClassifier:
+        """
+        Get the resident classifier, building it from the cached class embeddings.
+
+        The classifier is kept between calls and only rebuilt after training or
+        when the class embeddings in the cache were changed on disk.
+
+        Returns:
+            SimilarityClassifier: The classifier for the current class embeddings.
+
+        Raises:
+            FileNotFoundError: If no class embeddings have been cached yet.
+        """
+        try:
+            mtime = self.cache.embeddings_path.stat().st_mtime_ns
+        except FileNotFoundError:
+            mtime = None
+
+        stale = mtime is not None and mtime != self._classifier_mtime
+        if self.classifier_manager is None or stale:
+            self.logger.debug("Loading classifier from cached class embeddings")
+            self.classifier_manager = SimilarityClassifier(
+                taxonomy_manager=self.taxonomy_manager,
+                encoder=self.encoder,
+                enriched_classes=self.cache.load_class_embeddings(),
+                config=self.config.classifier,
+                projection=self.cache.load_projection(),
+            )
+            self._classifier_mtime = mtime
 
-        self.cache.save_class_embeddings(self.enriched_classes)
+        return self.classifier_manager
 
     def predict(self, text: str) -> set[str]:
         """
@@ -262,21 +398,28 @@ class TELEClassGrouper(BaseGrouper):
         Returns:
             set[str]: A set of predicted classes for the input text.
         """
-        enriched_classes = self.cache.load_class_embeddings()
+        return self._get_classifier().predict(text)
 
-        # initialize classifier manager
-        self.classifier_manager = SimilarityClassifier(
-            taxonomy_manager=self.taxonomy_manager,
-            encoder=self.encoder,
-            enriched_classes=enriched_classes,
-        )
+    def predict_many(self, texts: list[str]) -> list[set[str]]:
+        """
+        Predict classes for several texts at once.
 
-        return self.classifier_manager.predict(text)
+        Args:
+            texts (list[str]): The input texts to classify.
+
+        Returns:
+            list[set[str]]: The set of predicted classes for each input text.
+        """
+        return self._get_classifier().predict_many(texts)
 
     def group_items(self, items: Union[str, Path, list[Item]]) -> list[Group]:
         """
         Groups a collection of documents into predefined categories.
 
+        The items are classified as a stream of micro-batches, so only one batch
+        of embeddings is held in memory at a time. If the classifier has not been
+        trained yet, it is trained on the first items.
+
         Args:
             items (Union[str, Path, list[BaseModel]]): The items to classify.
                 This can be a path to a file or directory, a string containing
@@ -291,38 +434,115 @@ class TELEClassGrouper(BaseGrouper):
         )
 
         try:
-            docs = self._load_items(items)
-            self.logger.debug("Loaded %d items", len(docs))
-            if not hasattr(self, "classifier_manager"):
-                self.run(docs)
+            contents = self._iter_contents(items)
+            if self.classifier_manager is None:
+                sample = list(islice(contents, TRAINING_SAMPLE_SIZE))
+                self.run(self._encode_contents(sample))
+                contents = chain(sample, contents)
 
-            leaf_nodes = self.taxonomy_manager.get_leaf_nodes()
-            leaf_classifications = defaultdict(list)
-
-            for d in docs:
-                self.logger.debug("Processing document %s", d.id)
-                classes = self.predict(text=d.content)
-                self.logger.debug("Predicted classes: %s", classes)
-                leaf_predictions = classes & leaf_nodes
-                for leaf_class in leaf_predictions:
-                    leaf_classifications[leaf_class].append(d.content)
-
-            groups = []
-            for leaf_class, class_docs in leaf_classifications.items():
-                groups.append(
-                    Group(
-                        name=leaf_class,
-                        items=class_docs,
-                        parent_classes=self.taxonomy_manager.get_ancestors(leaf_class),
-                    )
-                )
+            collector = GroupCollector(self.taxonomy_manager)
+            for doc, classes in self._classify_contents(contents):
+                self.logger.debug("Predicted classes for %s: %s", doc.id, classes)
+                collector.add(doc.content, classes)
 
-            return groups
+            return collector.groups()
 
         except Exception as e:
             self.logger.exception("Classification failed with error: %s", str(e))
             raise
 
+    def classify_stream(
+        self,
+        items: Iterable[Item],
+        batch_size: int | None = None,
+        collector: GroupCollector | None = None,
+    ) -> Iterator[tuple[str, set[str]]]:
+        """
+        Classify a stream of items in micro-batches.
+
+        Items are consumed lazily, one micro-batch at a time, and each batch is
+        encoded and classified before the next one is read. The classifier must
+        have been trained (or its class embeddings cached) before.
+
+        Args:
+            items (Iterable[Item]): The items to classify, e.g. a generator.
+            batch_size (int | None, optional): Number of items per micro-batch.
+                Defaults to `ClassifierConfig.stream_batch_size`.
+            collector (GroupCollector | None, optional): If given, every
+                classified item is added to it, so the groups are built while
+                the stream is consumed. Defaults to None.
+
+        Yields:
+            tuple[str, set[str]]: The id and the predicted classes of each item,
+            in input order.
+        """
+        contents = ((item.id, item.model_dump_json()) for item in items)
+        for doc, classes in self._classify_contents(contents, batch_size):
+            if collector is not None:
+                collector.add(doc.content, classes)
+            yield doc.id, classes
+
+    def _iter_contents(
+        self, source: Union[str, Path, Iterable[Item]]
+    ) -> Iterator[tuple[str, str]]:
+        """Iterate over the ids and contents of the items of a source."""
+        if isinstance(source, (str, Path)):
+            yield from JSONDocumentLoader(source).iter_contents()
+        else:
+            for item in source:
+                yield item.id, item.model_dump_json()
+
+    def _encode_contents(self, contents: list[tuple[str, str]]) -> list[Document]:
+        """Encode item contents into documents."""
+        documents = encode_documents(
+            [content_id for content_id, _ in contents],
+            [content for _, content in contents],
+            self.encoder,
+            self.config.embedding.batch_size,
+            self.config.embedding.quantization,
+        )
+        return documents
+
+    def _classify_contents(
+        self, contents: Iterable[tuple[str, str]], batch_size: int | None = None
+    ) -> Iterator[tuple[Document, set[str]]]:
+        """
+        Encode and classify item contents one micro-batch at a time.
+
+        The embedding cache rewrites its whole index when flushed, so it is
+        flushed every `STREAM_FLUSH_INTERVAL` batches and when the stream ends
+        instead of after every batch.
+        """
+        batch_size = batch_size or self.config.classifier.stream_batch_size
+        contents = iter(contents)
+        try:
+            for batch_number in count(1):
+                batch = list(islice(contents, batch_size))
+                if not batch:
+                    break
+                docs = self._encode_contents(batch)
+                predictions = self._get_classifier().predict_embeddings(
+                    *self._stack_embeddings(docs)
+                )
+                yield from zip(docs, predictions)
+                if batch_number % STREAM_FLUSH_INTERVAL == 0:
+                    self._flush_embeddings()
+        finally:
+            self._flush_embeddings()
+
+    @staticmethod
+    def _stack_embeddings(
+        docs: list[Document],
+    ) -> tuple[np.ndarray, np.ndarray | None]:
+        """Stack document embeddings, with their scales if they are int8."""
+        if not docs:
+            return np.empty((0, 0), dtype=np.float32), None
+
+        embeddings = np.stack([d.embeddings for d in docs])
+        if docs[0].embedding_scale is None:
+            return embeddings, None
+        return embeddings, np.array([d.embedding_scale for d in docs], np.float32)
+
     def evaluate_classifier(self, documents: Union[str, Path, list[Item]]):
         """
         Evaluates the classifier using the provided documents.
@@ -339,11 +559,9 @@ class TELEClassGrouper(BaseGrouper):
         try:
             docs = self._load_items(documents)
             labels = self._load_labels("./test_script/labels.json")
-            if not hasattr(self, "classifier_manager"):
+            if self.classifier_manager is None:
                 self.run(docs)
-            result = self.classifier_manager.evaluate(
-                test_docs=docs, true_labels=labels
-            )
+            result = self._get_classifier().evaluate(test_docs=docs, true_labels=labels)
             self.logger.info(result)
 
         except Exception as e:
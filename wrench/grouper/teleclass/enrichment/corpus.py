@@ -1,52 +1,188 @@
-import math
+import copy
+import multiprocessing
+import os
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from multiprocessing import shared_memory
+from pathlib import Path
+from typing import Callable, Iterator, NamedTuple, TypeVar
 
 import numpy as np
-import yake
-from rank_bm25 import BM25Okapi
-from sentence_transformers import SentenceTransformer
 
 from wrench.grouper.teleclass.core.config import CorpusConfig
+from wrench.grouper.teleclass.core.encoder import Encoder
+from wrench.grouper.teleclass.core.encoding import encode_batched
 from wrench.grouper.teleclass.core.models import (
     CorpusEnrichmentResult,
     Document,
     EnrichedClass,
     TermScore,
 )
+from wrench.grouper.teleclass.core.taxonomy_manager import TaxonomyManager
 from wrench.log import logger
 
 from .base import Enricher
+from .corpus_index import CorpusIndex
+from .keyphrase import KeyphraseExtractor, create_extractor
+
+# maximum number of words of extracted key phrases
+MAX_NGRAM = 3
+
+A = TypeVar("A")
+T = TypeVar("T")
+
+# enricher received by a worker process when it starts
+_shared_enricher: "CorpusEnricher | None" = None
+
+# shared memory blocks attached by a worker process, by name
+_attached_arrays: dict[str, tuple[shared_memory.SharedMemory, np.ndarray]] = {}
+
+
+class SharedArray(NamedTuple):
+    """Reference to a numpy array in shared memory, sent to worker processes."""
+
+    name: str
+    shape: tuple[int, ...]
+    dtype: str
+
+    def attach(self) -> np.ndarray:
+        """Map the array into this process, once per process."""
+        if self.name not in _attached_arrays:
+            block = shared_memory.SharedMemory(name=self.name)
+            _attached_arrays[self.name] = (
+                block,
+                np.ndarray(self.shape, self.dtype, buffer=block.buf),
+            )
+        return _attached_arrays[self.name][1]
+
+
+@contextmanager
+def share_array(array: np.ndarray) -> Iterator[SharedArray]:
+    """
+    Copy an array into shared memory for the duration of the context.
+
+    Args:
+        array (np.ndarray): The array to share.
+
+    Yields:
+        SharedArray: Reference workers attach the array with, read-only.
+    """
+    block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    try:
+        np.ndarray(array.shape, array.dtype, buffer=block.buf)[...] = array
+        yield SharedArray(block.name, array.shape, array.dtype.str)
+    finally:
+        block.close()
+        block.unlink()
+
+
+class ScoringTask(NamedTuple):
+    """
+    The candidate terms of a class, scored by `CorpusEnricher._score_class_terms`.
+
+    Attributes:
+        class_name (str): The class the terms are scored for.
+        terms (list[str]): The candidate terms.
+        siblings (list[str]): Sibling classes with documents.
+        rows (list[int]): Row of each term in the semantic similarities.
+        column (int): Column of the class in the semantic similarities.
+        similarities (SharedArray | None): The semantic similarities in shared
+            memory, None to read them from the enricher.
+    """
+
+    class_name: str
+    terms: list[str]
+    siblings: list[str]
+    rows: list[int]
+    column: int
+    similarities: SharedArray | None
+
+
+def _init_worker(enricher: "CorpusEnricher") -> None:
+    """Store the enricher sent by the parent process in a new worker."""
+    global _shared_enricher
+    _shared_enricher = enricher
+
+
+def _call_shared(method: str, argument: object):
+    """Call a method of the enricher received from the parent process."""
+    return getattr(_shared_enricher, method)(argument)
+
+
+def _worker_context() -> multiprocessing.context.BaseContext:
+    """
+    Get the start method for worker processes.
+
+    Workers are never forked from the enricher's process, which already runs
+    threads of the encoder (torch, tokenizers) that a fork would copy in an
+    arbitrary state. A fork server is started from a single-threaded process
+    instead, or processes are spawned where it is unavailable.
+    """
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("forkserver")
+    return multiprocessing.get_context("spawn")
 
 
 class CorpusEnricher(Enricher):
     def __init__(
         self,
         config: CorpusConfig,
-        encoder_model: str,
+        taxonomy_manager: TaxonomyManager,
+        encoder: Encoder,
+        batch_size: int = 64,
+        cache_dir: Path | None = None,
     ):
         """
-        Initializes the Corpus class with the given configuration and encoder model.
+        Initializes the Corpus class with the given configuration and encoder.
 
         Args:
             config (CorpusConfig): The configuration object for the corpus.
-            encoder_model (str): The name or path of the encoder model to be used.
+            taxonomy_manager (TaxonomyManager): The taxonomy defining the sibling
+                                                classes.
+            encoder (Encoder): The shared encoder for terms and class names.
+            batch_size (int, optional): Number of terms encoded per batch.
+                                        Defaults to 64.
+            cache_dir (Path | None, optional): Directory the per-document
+                                        keyphrases are persisted in. Defaults to
+                                        None (not persisted).
 
         Attributes:
-            encoder (SentenceTransformer): The model for encoding text.
-            keyword_model (yake.KeywordExtractor): The YAKE keyword extractor.
+            taxonomy_manager (TaxonomyManager): The taxonomy defining the sibling
+                classes.
+            encoder (Encoder): The model for encoding text.
+            keyphrase_extractor (KeyphraseExtractor): The configured extractor of
+                candidate terms.
             class_terms (list[EnrichedClass]): A list to store enriched class terms.
+            corpus_index (CorpusIndex | None): Index of the documents of every
+                class, built by `enrich`.
+            term_positions (dict[str, int]): Row of each term in `term_embeddings`.
+            term_embeddings (np.ndarray | None): Embeddings of all candidate and
+                existing class terms, encoded once by `enrich`.
+            class_positions (dict[str, int]): Column of each class in
+                `semantic_similarities`.
+            semantic_similarities (np.ndarray | None): Similarity of every term
+                to every class name.
+            workers (int): Number of worker processes enriching classes.
             logger (Logger): Logger instance specific to this class.
         """
-        self.encoder = SentenceTransformer(encoder_model)
-        self.keyword_model = yake.KeywordExtractor(
-            lan="en",
-            n=3,
-            dedupLim=0.9,
-            dedupFunc="seqm",
-            windowsSize=1,
-            top=5,
-            features=None,
+        self.taxonomy_manager = taxonomy_manager
+        self.encoder = encoder
+        self.batch_size = batch_size
+        self.keyphrase_extractor: KeyphraseExtractor = create_extractor(
+            config.keyphrase, MAX_NGRAM, cache_dir
         )
         self.class_terms: list[EnrichedClass] = []
+        self.corpus_index: CorpusIndex | None = None
+        self.term_positions: dict[str, int] = {}
+        self.term_embeddings: np.ndarray | None = None
+        self.class_positions: dict[str, int] = {}
+        self.semantic_similarities: np.ndarray | None = None
+        self.contents: list[str] = []
+        self.class_doc_ids: dict[str, list[int]] = {}
+        self.candidate_terms: dict[str, list[str]] = {}
+        self.workers = config.workers or os.cpu_count() or 1
         self.top_k = config.top_n or 3
         self.logger = logger.getChild(self.__class__.__name__)
 
@@ -70,159 +206,428 @@ class CorpusEnricher(Enricher):
         Raises:
             ValueError: If core classes for a document are not defined.
         """
+        self.class_doc_ids = self.index_class_documents(collection)
+        self.contents = [doc.content for doc in collection]
+        # tokenize the corpus once for all classes and terms
+        self.corpus_index = CorpusIndex(
+            self.contents, self.class_doc_ids, max_ngram=MAX_NGRAM
+        )
+        class_names = [ec.class_name for ec in enriched_classes]
+
+        with self._worker_pool(max(len(collection), len(class_names))) as pool:
+            self.logger.info("Extracting candidate terms")
+            self.extract_document_phrases(pool)
+            self.candidate_terms = {
+                class_name: self._extract_class_terms(class_name)
+                for class_name in class_names
+            }
+            self.encode_terms(enriched_classes, self.candidate_terms)
+
+            self.logger.info("Scoring candidate terms")
+            term_scores = self._score_classes(pool, class_names)
+
+        for ec, class_term_scores in zip(enriched_classes, term_scores):
+            ec.terms.update(class_term_scores)
+            ec.embeddings = self.term_embeddings[  # type: ignore[index]
+                [self.term_positions[term_score.term] for term_score in ec.terms]
+            ]
+
+        return CorpusEnrichmentResult(ClassEnrichment=enriched_classes)
+
+    def encode_terms(
+        self,
+        enriched_classes: list[EnrichedClass],
+        candidate_terms: dict[str, list[str]],
+    ) -> None:
+        """
+        Encode all terms and class names at once and compute their similarities.
+
+        Candidate terms are deduplicated across classes and encoded in one
+        batched pass together with the existing class terms, so the embeddings
+        can be reused for the class embeddings. Each class name is encoded once.
+
+        Args:
+            enriched_classes (list[EnrichedClass]): The classes to be enriched.
+            candidate_terms (dict[str, list[str]]): Candidate terms of each class.
+        """
+        vocabulary: dict[str, None] = {}
         for ec in enriched_classes:
-            self.logger.info("Enriching class %s", ec.class_name)
-            class_docs: list[str] = []
-            for doc in collection:
-                if not doc.core_classes:
-                    raise ValueError(
-                        f"Core classes for document {str(doc.id)} not defined"
-                    )
-                if ec.class_name in doc.core_classes:
-                    class_docs.append(doc.content)
-            # Get sibling data
-            sibling_docs = self.get_sibling_data(ec.class_name, collection)
+            vocabulary.update((term, None) for term in candidate_terms[ec.class_name])
+            vocabulary.update((term_score.term, None) for term_score in ec.terms)
+
+        self.logger.info("Encoding %d terms", len(vocabulary))
+        self.term_positions = {term: i for i, term in enumerate(vocabulary)}
+        self.term_embeddings = encode_batched(
+            self.encoder, list(vocabulary), self.batch_size
+        )
+
+        class_names = [ec.class_name for ec in enriched_classes]
+        self.class_positions = {name: i for i, name in enumerate(class_names)}
+        class_embeddings = encode_batched(self.encoder, class_names, self.batch_size)
+        self.semantic_similarities = np.asarray(
+            self.encoder.similarity(self.term_embeddings, class_embeddings)
+        ).reshape(len(vocabulary), len(class_names))
 
-            term_scores = self.enrich_class(ec.class_name, class_docs, sibling_docs)
+    def extract_document_phrases(self, pool: ProcessPoolExecutor | None = None) -> None:
+        """
+        Extract the keyphrases of all uncached documents and persist the cache.
+
+        Documents are processed in worker processes if a pool is given, so that
+        the per-class extraction afterwards only aggregates cached results.
 
-            ec.terms.update(term_scores)
-            ec.embeddings = self.encoder.encode(
-                [term_score.term for term_score in ec.terms]
+        Args:
+            pool (ProcessPoolExecutor | None, optional): Worker pool started by
+                `_worker_pool`. Defaults to None (serial).
+        """
+        extractor = self.keyphrase_extractor
+        missing = extractor.missing(self.contents)
+        self.logger.info(
+            "Extracting keyphrases of %d of %d documents",
+            len(missing),
+            len(self.contents),
+        )
+        extractor.update(
+            missing,
+            self._map_parallel(pool, self._extract_document_phrases, missing),
+        )
+        if missing:
+            extractor.save()
+
+    def _extract_document_phrases(self, text: str) -> list[tuple[str, float]]:
+        """Extract the scored keyphrases of a single document."""
+        return self.keyphrase_extractor.extract_document(text)
+
+    def _documents_of(self, class_names: list[str]) -> list[str]:
+        """Get the distinct documents assigned to any of the classes."""
+        doc_ids = {
+            doc_id
+            for class_name in class_names
+            for doc_id in self.class_doc_ids.get(class_name, [])
+        }
+        return [self.contents[doc_id] for doc_id in sorted(doc_ids)]
+
+    def _sibling_classes_with_documents(self, class_name: str) -> list[str]:
+        """Get the sibling classes of a class that have assigned documents."""
+        return [
+            sibling
+            for sibling in self.get_sibling_classes(class_name)
+            if sibling in self.class_doc_ids
+        ]
+
+    def _extract_class_terms(self, class_name: str) -> list[str]:
+        """Extract the sorted candidate terms from the documents of a class."""
+        return sorted(
+            self.extract_candidate_terms(
+                self._documents_of([class_name]),
+                self._documents_of(self._sibling_classes_with_documents(class_name)),
             )
+        )
 
-        return CorpusEnrichmentResult(ClassEnrichment=enriched_classes)
+    def _score_classes(
+        self, pool: ProcessPoolExecutor | None, class_names: list[str]
+    ) -> list[set[TermScore]]:
+        """
+        Score the candidate terms of every class, in worker processes if enabled.
+
+        Workers read the semantic similarities from shared memory, and each task
+        only carries the terms, siblings and similarity positions of its class.
+        """
+        if self.semantic_similarities is None:
+            raise RuntimeError("Terms not encoded, call encode_terms first")
+
+        def tasks(similarities: SharedArray | None) -> list[ScoringTask]:
+            return [
+                ScoringTask(
+                    class_name,
+                    self.candidate_terms[class_name],
+                    self._sibling_classes_with_documents(class_name),
+                    [self.term_positions[t] for t in self.candidate_terms[class_name]],
+                    self.class_positions[class_name],
+                    similarities,
+                )
+                for class_name in class_names
+            ]
+
+        if pool is None:
+            return [self._score_class_terms(task) for task in tasks(None)]
+        with share_array(self.semantic_similarities) as similarities:
+            return self._map_parallel(
+                pool, self._score_class_terms, tasks(similarities)
+            )
 
-    def get_sibling_data(
-        self, class_name: str, collection: list[Document]
-    ) -> list[str]:
-        """Get documents assigned to sibling classes."""
-        sibling_docs: list[str] = []
-        for doc in collection:
+    def _score_class_terms(self, task: ScoringTask) -> set[TermScore]:
+        """Score the candidate terms of a class against its siblings."""
+        self.logger.info("Enriching class %s", task.class_name)
+        similarities = (
+            task.similarities.attach()
+            if task.similarities is not None
+            else self.semantic_similarities
+        )
+        return self._rank_terms(
+            task.terms,
+            self.calculate_popularity(task.terms, task.class_name),
+            self.calculate_distinctiveness(task.terms, task.class_name, task.siblings),
+            similarities[task.rows, task.column],  # type: ignore[index]
+        )
+
+    @contextmanager
+    def _worker_pool(self, tasks: int) -> Iterator[ProcessPoolExecutor | None]:
+        """
+        Start the worker processes of one enrichment, if enabled.
+
+        Every worker receives `_worker_state` once when it starts: the keyphrase
+        extractor without its cache and the corpus index. Data built later is
+        sent with the tasks that read it, or shared through shared memory.
+
+        Args:
+            tasks (int): Upper bound of the number of tasks of one phase.
+
+        Yields:
+            ProcessPoolExecutor | None: The pool, None to run serially.
+        """
+        workers = min(self.workers, tasks)
+        if workers <= 1:
+            yield None
+            return
+
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=_worker_context(),
+            initializer=_init_worker,
+            initargs=(self._worker_state(),),
+        ) as pool:
+            yield pool
+
+    def _map_parallel(
+        self,
+        pool: ProcessPoolExecutor | None,
+        function: Callable[[A], T],
+        arguments: list[A],
+    ) -> list[T]:
+        """
+        Apply a method to documents or scoring tasks, in the worker pool if given.
+
+        Only the arguments and results are sent between processes. Results are
+        returned in the order of `arguments`, independent of the number of
+        workers. Without a pool, or if it breaks, the arguments are processed
+        serially.
+
+        Args:
+            pool (ProcessPoolExecutor | None): Worker pool started by
+                `_worker_pool`, None to run serially.
+            function (Callable[[A], T]): A method of this enricher that only
+                reads the state sent to the workers.
+            arguments (list[A]): The documents or tasks to process.
+
+        Returns:
+            list[T]: The result for each argument.
+        """
+        if pool is not None and len(arguments) > 1:
+            workers = min(self.workers, len(arguments))
+            try:
+                return list(
+                    pool.map(
+                        _call_shared,
+                        [function.__name__] * len(arguments),
+                        arguments,
+                        chunksize=max(1, len(arguments) // (4 * workers)),
+                    )
+                )
+            except BrokenProcessPool as e:
+                self.logger.warning("Worker pool failed (%s), continuing serially", e)
+
+        return [function(argument) for argument in arguments]
+
+    def _worker_state(self) -> "CorpusEnricher":
+        """
+        Copy the state the workers read: the keyphrase extractor and the index.
+
+        The encoder, the corpus, the term embeddings and the cached keyphrases
+        are left out, since workers only extract keyphrases of single documents
+        and score terms against the corpus index.
+        """
+        state = copy.copy(self)
+        state.encoder = None  # type: ignore[assignment]
+        state.keyphrase_extractor = self.keyphrase_extractor.without_cache()
+        state.contents = []
+        state.class_doc_ids = {}
+        state.candidate_terms = {}
+        state.term_positions = {}
+        state.class_positions = {}
+        state.term_embeddings = None
+        state.semantic_similarities = None
+        return state
+
+    @staticmethod
+    def index_class_documents(collection: list[Document]) -> dict[str, list[int]]:
+        """
+        Build the inverted index from core classes to documents in one pass.
+
+        Args:
+            collection (list[Document]): The documents with their core classes.
+
+        Returns:
+            dict[str, list[int]]: Positions in the collection of the documents
+            assigned to each core class.
+
+        Raises:
+            ValueError: If core classes for a document are not defined.
+        """
+        class_doc_ids: defaultdict[str, list[int]] = defaultdict(list)
+        for doc_id, doc in enumerate(collection):
             if not doc.core_classes:
-                continue
+                raise ValueError(f"Core classes for document {str(doc.id)} not defined")
+            for class_name in doc.core_classes:
+                class_doc_ids[class_name].append(doc_id)
 
-            for cls in doc.core_classes:
-                if cls != class_name:
-                    sibling_docs.append(doc.content)
+        return dict(class_doc_ids)
 
-        return sibling_docs
+    def get_sibling_classes(self, class_name: str) -> list[str]:
+        """
+        Get the sibling classes of a class in the taxonomy.
 
-    def calculate_popularity(self, term: str, documents: list[str]) -> float:
-        """Calculate popularity for multi-word terms with more precise matching."""
-        term = term.lower().strip()
-        term_words = term.split()
+        Classes sharing a parent are siblings, and top-level classes are siblings
+        of each other.
 
-        df = 0
-        for doc in documents:
-            doc = doc.lower()
-            if len(term_words) == 1:
-                # Single word - match as whole word
-                if term in doc.split():
-                    df += 1
-            else:
-                # Multi-word phrase - exact phrase match
-                if term in doc:
-                    df += 1
+        Args:
+            class_name (str): The class to get the siblings of.
 
-        return math.log(1 + df)
+        Returns:
+            list[str]: The sibling classes, sorted by name.
+        """
+        if class_name in self.taxonomy_manager.root_nodes:
+            siblings = set(self.taxonomy_manager.root_nodes)
+            siblings.discard(class_name)
+        else:
+            siblings = self.taxonomy_manager.get_siblings(class_name)
+
+        return sorted(siblings)
+
+    def calculate_popularity(self, terms: list[str], class_name: str) -> np.ndarray:
+        """
+        Calculate the popularity of terms in the documents of a class.
+
+        The popularity is `log(1 + df)`, with df the number of class documents
+        containing the term, looked up in the prebuilt corpus index.
+
+        Args:
+            terms (list[str]): Candidate terms of the class.
+            class_name (str): The class the terms are scored for.
+
+        Returns:
+            np.ndarray: The popularity of each term.
+
+        Raises:
+            RuntimeError: If the corpus index has not been built by `enrich`.
+        """
+        if self.corpus_index is None:
+            raise RuntimeError("Corpus index not built, call enrich first")
+
+        return np.log1p(
+            self.corpus_index.document_frequencies(terms, [class_name])[:, 0]
+        )
 
     def calculate_distinctiveness(
-        self, term: str, class_docs: list[str], sibling_docs: list[str]
-    ) -> float:
-        """Calculate distinctiveness using BM25 scores with phrase preservation."""
-        term = term.lower().strip()
-
-        # Prepare documents with phrase preservation
-        def prepare_doc(doc: str) -> list[str]:
-            # Keep the phrase together in tokenization
-            doc = doc.lower()
-            # Replace term with a single token if it appears
-            if term in doc:
-                doc = doc.replace(term, term.replace(" ", "_"))
-            return doc.split()
-
-        # Tokenize documents preserving phrases
-        tokenized_class_docs = [prepare_doc(doc) for doc in class_docs]
-        class_bm25 = BM25Okapi(tokenized_class_docs)
-        # Use the term as a single token
-        term_token = term.replace(" ", "_")
-        class_score = class_bm25.get_scores([term_token])[0]
-
-        # Calculate scores for sibling classes
-        sibling_scores = []
-        for sib_docs in sibling_docs:
-            tokenized_sib_docs = [prepare_doc(doc) for doc in sib_docs]
-            sib_bm25 = BM25Okapi(tokenized_sib_docs)
-            sib_score = sib_bm25.get_scores([term_token])[0]
-            sibling_scores.append(sib_score)
-
-        # Apply softmax
-        all_scores = np.array([class_score] + sibling_scores)
-        # Add small epsilon to prevent division by zero
-        exp_scores = np.exp(all_scores - np.max(all_scores))
-        softmax_scores = exp_scores / (exp_scores.sum() + 1e-10)
-
-        return softmax_scores[0]
-
-    def calculate_semantic_similarity(self, term: str, class_name: str) -> float:
-        """Calculate semantic similarity using sentence transformer embeddings."""
-        term_embedding = self.encoder.encode(term)
-        class_embedding = self.encoder.encode(class_name)
-
-        similarity = self.encoder.similarity(term_embedding, class_embedding).item()
-
-        return similarity
-
-    def extract_key_phrases(self, text: str) -> list[str]:
-        """
-        Extracts key phrases from the given text using a keyword extraction model.
+        self, terms: list[str], class_name: str, sibling_classes: list[str]
+    ) -> np.ndarray:
+        """
+        Calculate the distinctiveness of terms for a class among its siblings.
+
+        The distinctiveness of a term is the softmax of its BM25 score in the
+        documents of the class over the scores in the documents of each sibling
+        class. All terms are scored at once against the prebuilt corpus index.
+
+        Args:
+            terms (list[str]): Candidate terms of the class.
+            class_name (str): The class the terms are scored for.
+            sibling_classes (list[str]): The classes it is compared to.
+
+        Returns:
+            np.ndarray: The distinctiveness of each term.
+
+        Raises:
+            RuntimeError: If the corpus index has not been built by `enrich`.
+        """
+        if self.corpus_index is None:
+            raise RuntimeError("Corpus index not built, call enrich first")
+
+        return self.corpus_index.distinctiveness(terms, class_name, sibling_classes)
+
+    def calculate_semantic_similarity(
+        self, terms: list[str], class_name: str
+    ) -> np.ndarray:
+        """
+        Calculate the similarity of terms to a class name.
+
+        The similarities are looked up in the matrix computed by `encode_terms`.
 
         Args:
-            text (str): The input text from which to extract key phrases.
+            terms (list[str]): Candidate terms of the class.
+            class_name (str): The class the terms are scored for.
 
         Returns:
-            list[str]: A list of extracted key phrases.
+            np.ndarray: The similarity of each term to the class name.
+
+        Raises:
+            RuntimeError: If the terms have not been encoded by `encode_terms`.
         """
-        keywords = self.keyword_model.extract_keywords(text)
+        if self.semantic_similarities is None:
+            raise RuntimeError("Terms not encoded, call encode_terms first")
 
-        return [keyword for keyword, _ in keywords]
+        rows = [self.term_positions[term] for term in terms]
+        return self.semantic_similarities[rows, self.class_positions[class_name]]
 
-    def extract_candidate_terms(self, class_docs: list[str]) -> set[str]:
-        """Extract candidate terms from IoT data."""
-        terms = set()
-        # Extract terms from descriptions
-        text = " ".join(class_docs)
-        words = self.extract_key_phrases(text)
+    def extract_candidate_terms(
+        self, class_docs: list[str], sibling_docs: list[str] | None = None
+    ) -> set[str]:
+        """
+        Extract candidate terms from the documents of a class.
 
-        # Add single words
-        terms.update(words)
+        Args:
+            class_docs (list[str]): The documents of the class.
+            sibling_docs (list[str] | None, optional): The documents of its sibling
+                classes, used as background by the TF-IDF extractor.
+                Defaults to None.
 
-        return terms
+        Returns:
+            set[str]: The candidate terms.
+        """
+        return set(self.keyphrase_extractor.extract(class_docs, sibling_docs or []))
 
     def enrich_class(
         self,
         class_name: str,
-        class_docs: list[str],
-        sibling_docs: list[str],
+        candidate_terms: list[str],
+        sibling_classes: list[str],
     ) -> set[TermScore]:
-        """Enrich a class with terms from IoT data."""
-        # Convert IoT data to text documents
+        """Score the candidate terms of a class and keep the top-k terms."""
+        return self._rank_terms(
+            candidate_terms,
+            self.calculate_popularity(candidate_terms, class_name),
+            self.calculate_distinctiveness(
+                candidate_terms, class_name, sibling_classes
+            ),
+            self.calculate_semantic_similarity(candidate_terms, class_name),
+        )
 
-        # Extract candidate terms
-        self.logger.info("Extracting candidate terms")
-        candidate_terms = self.extract_candidate_terms(class_docs)
+    def _rank_terms(
+        self,
+        candidate_terms: list[str],
+        popularity_scores: np.ndarray,
+        distinctiveness_scores: np.ndarray,
+        semantic_similarity_scores: np.ndarray,
+    ) -> set[TermScore]:
+        """Combine the component scores of terms and keep the top-k terms."""
         self.logger.debug("Candidate terms: %s", candidate_terms)
 
-        # Score terms
         scores = []
-        for term in candidate_terms:
-            # Calculate component scores
+        for term, popularity, distinctiveness, semantic_similarity in zip(
+            candidate_terms,
+            popularity_scores,
+            distinctiveness_scores,
+            semantic_similarity_scores,
+        ):
             self.logger.info("Calculating component scores for term: %s", term)
-            popularity = self.calculate_popularity(term, class_docs)
-            distinctiveness = self.calculate_distinctiveness(
-                term, class_docs, sibling_docs
-            )
-            semantic_similarity = self.calculate_semantic_similarity(term, class_name)
 
             self.logger.debug(
                 "\nPopularity: %10.3f\nDistinctiveness: %10.3f\nSemantic Similarity: %10.3f\n",  # noqa: E501
@@ -233,9 +638,9 @@ class CorpusEnricher(Enricher):
 
             term_score = TermScore(
                 term=term,
-                popularity=popularity,
-                distinctiveness=distinctiveness,
-                semantic_similarity=semantic_similarity,
+                popularity=float(popularity),
+                distinctiveness=float(distinctiveness),
+                semantic_similarity=float(semantic_similarity),
             )
 
             self.logger.debug("\nAffinity Score: %s", term_score.affinity_score)
@@ -0,0 +1,194 @@
+"""
+Token index of the class documents used in corpus-based enrichment.
+
+Every document is tokenized once and counted into one pseudo-document per class
+it is assigned to, holding the frequencies of all token n-grams (phrases) up to a maximum
+length, and the number of its documents containing each n-gram. Candidate terms
+are then scored against any group of classes by looking up their counts, without
+re-tokenizing documents or rebuilding an index per term, so scoring is linear in
+the corpus size instead of terms times corpus size.
+"""
+
+import re
+from collections import Counter, defaultdict
+from typing import Iterator, Mapping, Sequence
+
+import numpy as np
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> list[str]:
+    """Split a text into lowercase word tokens."""
+    return _TOKEN_PATTERN.findall(text.lower())
+
+
+def ngrams(tokens: Sequence[str], max_n: int) -> Iterator[tuple[str, ...]]:
+    """
+    Iterate over all token n-grams of a token sequence.
+
+    Args:
+        tokens (Sequence[str]): The tokens of a text.
+        max_n (int): Maximum number of tokens per n-gram.
+
+    Returns:
+        Iterator[tuple[str, ...]]: The n-grams, shortest first.
+    """
+    for n in range(1, max_n + 1):
+        for start in range(len(tokens) - n + 1):
+            yield tuple(tokens[start : start + n])
+
+
+class CorpusIndex:
+    """
+    BM25 index with one pseudo-document per class.
+
+    Attributes:
+        classes (list[str]): The indexed classes.
+        counts (list[Counter[tuple[str, ...]]]): Frequency of every n-gram in the
+            documents of each class.
+        document_counts (list[Counter[tuple[str, ...]]]): Number of documents of
+            each class that contain every n-gram.
+        lengths (np.ndarray): Number of tokens in the documents of each class.
+    """
+
+    def __init__(
+        self,
+        documents: Sequence[str],
+        class_doc_ids: Mapping[str, Sequence[int]],
+        max_ngram: int = 3,
+        k1: float = 1.5,
+        b: float = 0.75,
+    ):
+        """
+        Tokenizes every document once and counts its n-grams for its classes.
+
+        Args:
+            documents (Sequence[str]): Contents of the documents.
+            class_doc_ids (Mapping[str, Sequence[int]]): Positions in `documents`
+                of the documents of each class.
+            max_ngram (int, optional): Maximum number of tokens of an indexed
+                phrase, longer terms are never found. Defaults to 3.
+            k1 (float, optional): BM25 term frequency saturation. Defaults to 1.5.
+            b (float, optional): BM25 length normalization. Defaults to 0.75.
+        """
+        self.max_ngram = max_ngram
+        self.k1 = k1
+        self.b = b
+        self.classes = list(class_doc_ids)
+        self._positions = {name: i for i, name in enumerate(self.classes)}
+        self.counts: list[Counter[tuple[str, ...]]] = [Counter() for _ in self.classes]
+        self.document_counts: list[Counter[tuple[str, ...]]] = [
+            Counter() for _ in self.classes
+        ]
+        self.lengths = np.zeros(len(self.classes), dtype=np.float32)
+
+        doc_classes: defaultdict[int, list[int]] = defaultdict(list)
+        for name, doc_ids in class_doc_ids.items():
+            for doc_id in doc_ids:
+                doc_classes[doc_id].append(self._positions[name])
+
+        for doc_id, positions in doc_classes.items():
+            tokens = tokenize(documents[doc_id])
+            doc_ngrams = Counter(ngrams(tokens, max_ngram))
+            for position in positions:
+                self.counts[position].update(doc_ngrams)
+                self.document_counts[position].update(doc_ngrams.keys())
+                self.lengths[position] += len(tokens)
+
+    def term_frequencies(
+        self, terms: Sequence[str], classes: Sequence[str]
+    ) -> np.ndarray:
+        """
+        Count the occurrences of terms in the documents of classes.
+
+        Args:
+            terms (Sequence[str]): Words or phrases, matched on token boundaries.
+            classes (Sequence[str]): Class names, classes without documents have
+                no occurrences.
+
+        Returns:
+            np.ndarray: Matrix of shape (len(terms), len(classes)).
+        """
+        return self._lookup(self.counts, terms, classes)
+
+    def document_frequencies(
+        self, terms: Sequence[str], classes: Sequence[str]
+    ) -> np.ndarray:
+        """
+        Count the documents of classes that contain terms.
+
+        Args:
+            terms (Sequence[str]): Words or phrases, matched on token boundaries.
+            classes (Sequence[str]): Class names, classes without documents have
+                no occurrences.
+
+        Returns:
+            np.ndarray: Matrix of shape (len(terms), len(classes)).
+        """
+        return self._lookup(self.document_counts, terms, classes)
+
+    def _lookup(
+        self,
+        tables: list[Counter[tuple[str, ...]]],
+        terms: Sequence[str],
+        classes: Sequence[str],
+    ) -> np.ndarray:
+        """Look up the counts of terms in the count tables of classes."""
+        empty: Counter[tuple[str, ...]] = Counter()
+        rows = [
+            tables[self._positions[name]] if name in self._positions else empty
+            for name in classes
+        ]
+        keys = [tuple(tokenize(term)) for term in terms]
+        return np.array(
+            [[row[key] for row in rows] for key in keys], dtype=np.float32
+        ).reshape(len(terms), len(classes))
+
+    def bm25(self, terms: Sequence[str], classes: Sequence[str]) -> np.ndarray:
+        """
+        Score terms against the pseudo-documents of a group of classes.
+
+        Document frequencies and the average length are computed within the
+        group. The idf is `log(1 + (N - df + 0.5) / (df + 0.5))`, which stays
+        positive even when a term occurs in most classes of a small group.
+
+        Args:
+            terms (Sequence[str]): Words or phrases to score.
+            classes (Sequence[str]): Class names forming the group.
+
+        Returns:
+            np.ndarray: BM25 scores of shape (len(terms), len(classes)).
+        """
+        tf = self.term_frequencies(terms, classes)
+        lengths = np.array(
+            [
+                self.lengths[self._positions[name]] if name in self._positions else 0
+                for name in classes
+            ],
+            dtype=np.float32,
+        )
+        avgdl = max(float(lengths.mean()), 1.0) if len(classes) else 1.0
+
+        df = (tf > 0).sum(axis=1, keepdims=True)
+        idf = np.log1p((len(classes) - df + 0.5) / (df + 0.5))
+        norm = self.k1 * (1 - self.b + self.b * lengths / avgdl)
+        return idf * tf * (self.k1 + 1) / (tf + norm)
+
+    def distinctiveness(
+        self, terms: Sequence[str], class_name: str, siblings: Sequence[str]
+    ) -> np.ndarray:
+        """
+        Softmax of the BM25 score of each term in a class over its siblings.
+
+        Args:
+            terms (Sequence[str]): Words or phrases to score.
+            class_name (str): The class the terms are scored for.
+            siblings (Sequence[str]): The classes it is compared to.
+
+        Returns:
+            np.ndarray: Distinctiveness of each term, 1.0 without siblings.
+        """
+        scores = self.bm25(terms, [class_name, *siblings])
+        exp_scores = np.exp(scores - scores.max(axis=1, keepdims=True))
+        return exp_scores[:, 0] / exp_scores.sum(axis=1)
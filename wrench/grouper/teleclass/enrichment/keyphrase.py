@@ -0,0 +1,398 @@
+"""
+Candidate term extraction for corpus-based enrichment.
+
+Extractors score the phrases of every document separately, so the cost grows
+linearly with the corpus, and per-document results are cached by a hash of the
+content and the extractor settings: documents that did not change are never
+processed again, also across runs if the cache is persisted. The cache is bounded
+in size and evicts the least recently used results. The phrases of a class are
+ranked by aggregating the results of its documents.
+
+Two backends are available: YAKE, and a fast statistical backend counting token
+n-grams and ranking them by TF-IDF against the documents of the sibling classes.
+"""
+
+import copy
+import hashlib
+import heapq
+import json
+from abc import ABC, abstractmethod
+from collections import OrderedDict, defaultdict
+from pathlib import Path
+from typing import Any, Sequence
+
+import numpy as np
+import yake
+
+from wrench.grouper.teleclass.core.config import KeyphraseConfig
+from wrench.log import logger
+
+from .corpus_index import tokenize
+
+STOPWORDS = frozenset(
+    """
+    a about above after again against all am an and any are as at be because been
+    before being below between both but by can could did do does doing down during
+    each few for from further had has have having he her here hers herself him
+    himself his how i if in into is it its itself just me more most my myself no
+    nor not now of off on once only or other our ours ourselves out over own same
+    she should so some such than that the their theirs them themselves then there
+    these they this those through to too under until up very was we were what when
+    where which while who whom why will with would you your yours yourself
+    yourselves id null none true false http https www com
+    """.split()
+)
+
+
+STOPWORD_ARRAY = np.array(sorted(STOPWORDS))
+
+
+def content_hash(text: str, salt: str = "") -> str:
+    """Hash identifying a document content, salted by the extractor settings."""
+    return hashlib.sha256((salt + text).encode("utf-8")).hexdigest()
+
+
+class KeyphraseExtractor(ABC):
+    """
+    Base class of keyphrase extractors with a per-document result cache.
+
+    Attributes:
+        top_n (int): Number of candidate phrases returned per class.
+        max_ngram (int): Maximum number of words per phrase.
+        cache (OrderedDict[str, list[tuple[str, float]]]): Scored phrases of
+            each document, keyed by `cache_key` and ordered from least to most
+            recently used.
+        cache_path (Path | None): File the cache is persisted to, if any.
+        max_size (int): Maximum size of the cached results in bytes.
+    """
+
+    def __init__(
+        self,
+        top_n: int = 5,
+        max_ngram: int = 3,
+        cache_path: Path | None = None,
+        max_size_mb: float = 64,
+    ):
+        """
+        Initializes the extractor and loads the persisted cache.
+
+        Args:
+            top_n (int, optional): Number of candidate phrases returned per class.
+                                   Defaults to 5.
+            max_ngram (int, optional): Maximum number of words per phrase.
+                                       Defaults to 3.
+            cache_path (Path | None, optional): File the per-document results are
+                                   persisted to. Defaults to None (in memory).
+            max_size_mb (float, optional): Maximum size of the cached results in
+                                   MB. Defaults to 64.
+        """
+        self.top_n = top_n
+        self.max_ngram = max_ngram
+        self.cache_path = cache_path
+        self.max_size = int(max_size_mb * 1024 * 1024)
+        self.cache: OrderedDict[str, list[tuple[str, float]]] = OrderedDict()
+        self.logger = logger.getChild(self.__class__.__name__)
+        self._salt = json.dumps(self.settings, sort_keys=True)
+        self._sizes: dict[str, int] = {}
+        self._size = 0
+
+        if cache_path is not None and cache_path.exists():
+            try:
+                with open(cache_path, "r") as f:
+                    for key, phrases in json.load(f).items():
+                        self._store(key, [(phrase, score) for phrase, score in phrases])
+            except (OSError, ValueError) as e:
+                self.logger.warning("Ignoring unreadable keyphrase cache: %s", e)
+
+    @property
+    def settings(self) -> dict[str, Any]:
+        """Parameters the per-document results depend on."""
+        return {"max_ngram": self.max_ngram}
+
+    def cache_key(self, text: str) -> str:
+        """Key of the results of a document extracted with these settings."""
+        return content_hash(text, self._salt)
+
+    @abstractmethod
+    def extract_document(self, text: str) -> list[tuple[str, float]]:
+        """
+        Score the candidate phrases of a single document.
+
+        Args:
+            text (str): The document content.
+
+        Returns:
+            list[tuple[str, float]]: Phrases with scores, higher is better.
+        """
+
+    def missing(self, documents: Sequence[str]) -> list[str]:
+        """
+        Get the distinct documents without cached results.
+
+        Args:
+            documents (Sequence[str]): Document contents.
+
+        Returns:
+            list[str]: The documents that still have to be extracted.
+        """
+        missing = {self.cache_key(text): text for text in documents}
+        return [text for key, text in missing.items() if key not in self.cache]
+
+    def update(
+        self, documents: Sequence[str], results: Sequence[list[tuple[str, float]]]
+    ) -> None:
+        """
+        Store the extraction results of documents in the cache.
+
+        Args:
+            documents (Sequence[str]): Document contents.
+            results (Sequence[list[tuple[str, float]]]): Result of each document.
+        """
+        for text, phrases in zip(documents, results):
+            self._store(self.cache_key(text), phrases)
+
+    def document_phrases(self, text: str) -> list[tuple[str, float]]:
+        """Get the scored phrases of a document, extracting them on a cache miss."""
+        key = self.cache_key(text)
+        phrases = self.cache.get(key)
+        if phrases is None:
+            phrases = self.extract_document(text)
+            self._store(key, phrases)
+        else:
+            self.cache.move_to_end(key)
+        return phrases
+
+    def extract(
+        self, documents: Sequence[str], background: Sequence[str] = ()
+    ) -> list[str]:
+        """
+        Extract the candidate phrases of a class.
+
+        Phrase scores are summed over the documents of the class.
+
+        Args:
+            documents (Sequence[str]): The documents of the class.
+            background (Sequence[str], optional): Documents of the sibling
+                classes, not used by this extractor. Defaults to ().
+
+        Returns:
+            list[str]: The `top_n` best phrases.
+        """
+        scores: defaultdict[str, float] = defaultdict(float)
+        for text in documents:
+            for phrase, score in self.document_phrases(text):
+                scores[phrase] += score
+
+        return heapq.nlargest(self.top_n, scores, key=scores.__getitem__)
+
+    def without_cache(self) -> "KeyphraseExtractor":
+        """Copy this extractor with an empty in-memory cache, e.g. for workers."""
+        extractor = copy.copy(self)
+        extractor.cache_path = None
+        extractor.cache = OrderedDict()
+        extractor._sizes = {}
+        extractor._size = 0
+        return extractor
+
+    def save(self) -> None:
+        """Persist the per-document results, if a cache path is set."""
+        if self.cache_path is None:
+            return
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.cache_path, "w") as f:
+            json.dump(self.cache, f)
+
+    def _store(self, key: str, phrases: list[tuple[str, float]]) -> None:
+        """Cache the results of a document, evicting the least recently used."""
+        self._size -= self._sizes.pop(key, 0)
+        self.cache[key] = phrases
+        self.cache.move_to_end(key)
+        # approximate size of the entry in the persisted JSON
+        self._sizes[key] = len(key) + sum(len(phrase) + 32 for phrase, _ in phrases)
+        self._size += self._sizes[key]
+
+        while self._size > self.max_size and len(self.cache) > 1:
+            evicted, _ = self.cache.popitem(last=False)
+            self._size -= self._sizes.pop(evicted)
+
+
+class YAKEExtractor(KeyphraseExtractor):
+    """Extracts the YAKE keywords of every document."""
+
+    def __init__(
+        self,
+        top_n: int = 5,
+        max_ngram: int = 3,
+        cache_path: Path | None = None,
+        max_size_mb: float = 64,
+    ):
+        """
+        Initializes the YAKE keyword extractor.
+
+        Args:
+            top_n (int, optional): Number of candidate phrases returned per class
+                                   and per document. Defaults to 5.
+            max_ngram (int, optional): Maximum number of words per phrase.
+                                       Defaults to 3.
+            cache_path (Path | None, optional): File the per-document results are
+                                   persisted to. Defaults to None (in memory).
+            max_size_mb (float, optional): Maximum size of the cached results in
+                                   MB. Defaults to 64.
+        """
+        self.yake_options: dict[str, Any] = {
+            "lan": "en",
+            "n": max_ngram,
+            "dedupLim": 0.9,
+            "dedupFunc": "seqm",
+            "windowsSize": 1,
+            "top": top_n,
+        }
+        super().__init__(top_n, max_ngram, cache_path, max_size_mb)
+        self.keyword_model = yake.KeywordExtractor(**self.yake_options, features=None)
+
+    @property
+    def settings(self) -> dict[str, Any]:
+        """YAKE options, including the number of keywords kept per document."""
+        return self.yake_options
+
+    def extract_document(self, text: str) -> list[tuple[str, float]]:
+        """Extract YAKE keywords, scored so that higher is better."""
+        return [
+            (keyword, 1.0 / (1.0 + score))
+            for keyword, score in self.keyword_model.extract_keywords(text)
+        ]
+
+
+class TFIDFExtractor(KeyphraseExtractor):
+    """
+    Ranks token n-grams by TF-IDF against the documents of the sibling classes.
+
+    Phrases starting or ending with a stopword and purely numeric phrases are
+    discarded. The score of a phrase is `(1 + log tf) * (1 + log((1 + B) / (1 +
+    df)))`, with tf its frequency in the class documents, B the number of
+    background documents and df the number of background documents containing it.
+
+    Counting is vectorized: the tokens of a document are mapped to ids, its
+    n-grams are rows of token ids counted with `np.unique`, and the counts of
+    the documents of a class are aggregated with `np.unique` and `np.bincount`.
+    """
+
+    def extract_document(self, text: str) -> list[tuple[str, float]]:
+        """Count the candidate n-grams of a document."""
+        tokens = tokenize(text)
+        if not tokens:
+            return []
+
+        vocabulary, token_ids = np.unique(np.array(tokens), return_inverse=True)
+        stopword = np.isin(vocabulary, STOPWORD_ARRAY)
+        numeric = np.char.isdigit(vocabulary)
+        lengths = np.char.str_len(vocabulary)
+
+        grams = []
+        for n in range(1, min(self.max_ngram, len(tokens)) + 1):
+            windows = np.lib.stride_tricks.sliding_window_view(token_ids, n)
+            candidate = (
+                ~stopword[windows[:, 0]]
+                & ~stopword[windows[:, -1]]
+                & ~numeric[windows].all(axis=1)
+                & (lengths[windows].sum(axis=1) > 1)
+            )
+            # pad shorter n-grams with -1, so all n-grams are rows of one matrix
+            padded = np.full((int(candidate.sum()), self.max_ngram), -1)
+            padded[:, :n] = windows[candidate]
+            grams.append(padded)
+
+        unique_grams, counts = np.unique(
+            np.concatenate(grams), axis=0, return_counts=True
+        )
+        return [
+            (" ".join(vocabulary[gram[gram >= 0]]), float(count))
+            for gram, count in zip(unique_grams, counts)
+        ]
+
+    def _phrase_arrays(
+        self, documents: Sequence[str]
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Concatenate the cached n-gram counts of documents.
+
+        Args:
+            documents (Sequence[str]): Document contents.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray, np.ndarray]: The phrases, their counts
+            and the position in `documents` of the document of each phrase.
+        """
+        results = [self.document_phrases(text) for text in documents]
+        phrases = [phrase for result in results for phrase, _ in result]
+        counts = [count for result in results for _, count in result]
+        owners = np.repeat(np.arange(len(results)), [len(r) for r in results])
+        return np.array(phrases, dtype=str), np.array(counts, np.float64), owners
+
+    def extract(
+        self, documents: Sequence[str], background: Sequence[str] = ()
+    ) -> list[str]:
+        """
+        Extract the phrases of a class that are frequent but rare in its siblings.
+
+        Args:
+            documents (Sequence[str]): The documents of the class.
+            background (Sequence[str], optional): Documents of the sibling
+                classes. Defaults to ().
+
+        Returns:
+            list[str]: The `top_n` phrases with the highest TF-IDF.
+        """
+        class_phrases, class_counts, _ = self._phrase_arrays(documents)
+        if not len(class_phrases):
+            return []
+        phrases, inverse = np.unique(class_phrases, return_inverse=True)
+        frequencies = np.bincount(inverse, weights=class_counts)
+
+        # every phrase occurs once per document in the cached results
+        background_phrases, _, _ = self._phrase_arrays(background)
+        known, known_counts = np.unique(background_phrases, return_counts=True)
+        positions = np.minimum(np.searchsorted(known, phrases), len(known) - 1)
+        document_frequencies = np.zeros(len(phrases))
+        if len(known):
+            found = known[positions] == phrases
+            document_frequencies[found] = known_counts[positions[found]]
+
+        scores = (1 + np.log(frequencies)) * (
+            1 + np.log((1 + len(background)) / (1 + document_frequencies))
+        )
+        # prefer longer phrases on ties, then alphabetical order
+        words = np.char.count(phrases, " ")
+        order = np.lexsort((phrases, -words, -scores))
+        return phrases[order[: self.top_n]].tolist()
+
+
+EXTRACTORS: dict[str, type[KeyphraseExtractor]] = {
+    "yake": YAKEExtractor,
+    "tfidf": TFIDFExtractor,
+}
+
+
+def create_extractor(
+    config: KeyphraseConfig, max_ngram: int = 3, cache_dir: Path | None = None
+) -> KeyphraseExtractor:
+    """
+    Create the configured keyphrase extractor.
+
+    Args:
+        config (KeyphraseConfig): The keyphrase extraction configuration.
+        max_ngram (int, optional): Maximum number of words per phrase. Defaults to 3.
+        cache_dir (Path | None, optional): Directory the per-document results are
+                                           persisted in. Defaults to None.
+
+    Returns:
+        KeyphraseExtractor: The extractor of the configured backend.
+    """
+    cache_path = (
+        cache_dir / f"keyphrases_{config.backend}.json"
+        if cache_dir is not None and config.cache
+        else None
+    )
+    return EXTRACTORS[config.backend](
+        config.top_n, max_ngram, cache_path, config.cache_max_size_mb
+    )
@@ -1,11 +1,15 @@
+import json
 from collections import defaultdict
+from concurrent.futures import Future
 from typing import List, Set
 
 import numpy as np
 from ollama import Client
-from sentence_transformers import SentenceTransformer
 
-from wrench.grouper.teleclass.core.config import LLMConfig
+from wrench.common.prompt_cache import PromptCache
+from wrench.grouper.teleclass.classifier.ann import IVFIndex
+from wrench.grouper.teleclass.core.config import ANNConfig, LLMConfig
+from wrench.grouper.teleclass.core.encoder import Encoder
 from wrench.grouper.teleclass.core.models import (
     Document,
     EnrichedClass,
@@ -16,10 +20,35 @@ from wrench.grouper.teleclass.core.taxonomy_manager import TaxonomyManager
 from wrench.log import logger
 
 from .base import Enricher
+from .llm_executor import LLMExecutor
+
+# rough number of characters per token, used to size batched prompts
+CHARS_PER_TOKEN = 4
+
+GROUP_TERMS_PROMPT = """
+Generate 10 specific urban sensor use case keywords for each of these subclasses of '{parent_class}':
+{classes}
+
+The keywords of a class should be relevant to it but not to the other classes listed. Be specific and relevant.
+Return a JSON object mapping every class name to the list of its keywords.
+"""  # noqa: E501
+
+CORE_CLASS_GUIDELINES = """Important guidelines:
+- Choose the class that is most specific to the document's content at each level
+- Exclude broad/general classes unless they are directly discussed
+- Only select ONE class maximum per level
+- If uncertain about a class, exclude it"""  # noqa: E501
 
 
 class LLMEnricher(Enricher):
-    def __init__(self, config: LLMConfig, taxonomy_manager: TaxonomyManager):
+    def __init__(
+        self,
+        config: LLMConfig,
+        taxonomy_manager: TaxonomyManager,
+        encoder: Encoder,
+        ann_config: ANNConfig | None = None,
+        prompt_cache: PromptCache | None = None,
+    ):
         """
         Initializes the LLM enrichment class.
 
@@ -28,20 +57,41 @@ class LLMEnricher(Enricher):
                                 such as host, model, temperature, and prompt.
             taxonomy_manager (TaxonomyManager): Manager for handling
                                                 taxonomy-related operations.
+            encoder (Encoder): The shared encoder for class terms.
+            ann_config (ANNConfig | None, optional): Settings for retrieving
+                                                candidate classes by approximate
+                                                nearest-neighbour search.
+                                                Defaults to None.
+            prompt_cache (PromptCache | None, optional): Persistent cache of LLM
+                                                responses. Defaults to None.
 
         Attributes:
             llm (Client): The LLM client initialized with the provided host.
+            executor (LLMExecutor): Sends the LLM requests concurrently.
             model (str): The model name to be used by the LLM.
             temperature (float): The temperature setting for the LLM.
             taxonomy_manager (TaxonomyManager): The taxonomy manager instance.
             prompt (str): The prompt template for generating keywords.
-            encoder (SentenceTransformer): The sentence transformer model for
-                                           encoding text.
+            encoder (Encoder): The encoder for class terms.
+            group_terms (bool): Whether the terms of all children of a parent
+                                are generated with one request.
+            core_class_batch_size (int): Maximum number of documents per core
+                                         class selection prompt.
+            core_class_token_budget (int): Approximate token budget of a batched
+                                           core class selection prompt.
             logger (Logger): Logger instance for logging within this class.
         """
-        self.llm = Client(host=config.host)
+        self.llm = Client(host=config.host, timeout=config.timeout)
         self.model = config.model
         self.temperature = config.temperature
+        self.executor = LLMExecutor(
+            self.llm,
+            self.model,
+            options={"temperature": self.temperature},
+            concurrency=config.concurrency,
+            retries=config.retries,
+            cache=prompt_cache,
+        )
         self.taxonomy_manager = taxonomy_manager
         self.prompt = (
             config.prompt
@@ -51,7 +101,11 @@ class LLMEnricher(Enricher):
             Respond with only the comma-separated terms, no explanations.
             """  # noqa: E501
         )
-        self.encoder = SentenceTransformer("all-mpnet-base-v2")
+        self.encoder = encoder
+        self.ann_config = ann_config or ANNConfig()
+        self.group_terms = config.group_terms
+        self.core_class_batch_size = config.core_class_batch_size
+        self.core_class_token_budget = config.core_class_token_budget
 
         self.logger = logger.getChild(self.__class__.__name__)
 
@@ -69,6 +123,10 @@ class LLMEnricher(Enricher):
             DocumentCoreClasses=document_with_core_classes,
         )
 
+    def close(self) -> None:
+        """Wait for pending LLM requests and stop the request threads."""
+        self.executor.shutdown()
+
     def enrich_classes_with_terms(
         self, enriched_classes: list[EnrichedClass]
     ) -> list[EnrichedClass]:
@@ -78,8 +136,11 @@ class LLMEnricher(Enricher):
         This method iterates over each class in the provided list, retrieves its parent
         and sibling nodes from the taxonomy manager, and enriches the class with
         additional terms based on its relationships. If the class has no parents (i.e.,
-        it is a root node), it is enriched without parent context. After enriching the
-        terms, embeddings are computed for the terms using the encoder.
+        it is a root node), it is enriched without parent context. With term
+        grouping, one request per parent generates the terms of all its children,
+        with the root classes forming one group. The requests of all classes are
+        sent concurrently. After enriching the terms, embeddings are computed for
+        the terms using the encoder.
 
 
         Args:
@@ -90,44 +151,206 @@ class LLMEnricher(Enricher):
             list[EnrichedClass]: The list of EnrichedClass objects with
                                  updated terms and embeddings.
         """
+        if self.group_terms:
+            self._enrich_sibling_groups(enriched_classes)
+        else:
+            self._enrich_each_class(enriched_classes)
+
+        for ec in enriched_classes:
+            # Compute embeddings for the terms
+            if ec.terms:
+                embeddings = self.encoder.encode(
+                    [term_score.term for term_score in ec.terms]
+                )
+                ec.embeddings = embeddings
+
+            self.logger.info("Enriched terms for %s: %s", ec.class_name, ec.terms)
+
+        return enriched_classes
+
+    def _enrich_each_class(self, enriched_classes: list[EnrichedClass]) -> None:
+        """Generate the terms of every class with one request per parent."""
+        requests: list[tuple[EnrichedClass, Future]] = []
         for ec in enriched_classes:
             # Get all nodes that are parents of the current node
             parents = list(self.taxonomy_manager.get_parents(ec.class_name))
             # Check if node is root (have no parents)
             if parents:
+                # Get all siblings of the node
+                siblings = self.taxonomy_manager.get_siblings(ec.class_name)
                 for parent in parents:
-                    # Get all siblings of the node
-                    siblings = self.taxonomy_manager.get_siblings(ec.class_name)
-
-                    terms = self.enrich_class(
-                        class_name=ec.class_name,
-                        class_description=ec.class_description,
-                        parent_class=parent,
-                        siblings=siblings,
+                    requests.append(
+                        (
+                            ec,
+                            self._submit_terms_request(
+                                ec.class_name, ec.class_description, parent, siblings
+                            ),
+                        )
                     )
-                    if terms:  # Only update if we got valid terms
-                        ec.terms.update(terms)
             else:
                 # Root node or node without parents
-                terms = self.enrich_class(
-                    class_name=ec.class_name,
-                    class_description=ec.class_description,
-                    parent_class="",
-                    siblings=set(),
+                requests.append(
+                    (
+                        ec,
+                        self._submit_terms_request(
+                            ec.class_name, ec.class_description, "", set()
+                        ),
+                    )
                 )
-                if terms:
-                    ec.terms.update(terms)
 
-            # Compute embeddings for the terms
-            if ec.terms:
-                embeddings = self.encoder.encode(
-                    [term_score.term for term_score in ec.terms]
+        for ec, future in requests:
+            terms = self._collect_terms(ec.class_name, future)
+            if terms:  # Only update if we got valid terms
+                ec.terms.update(terms)
+
+    def _enrich_sibling_groups(self, enriched_classes: list[EnrichedClass]) -> None:
+        """
+        Generate the terms of all children of each parent with one request.
+
+        The classes of a group whose answer cannot be parsed are enriched with
+        one request each, with the other classes of the group as siblings.
+        """
+        groups: defaultdict[str, list[EnrichedClass]] = defaultdict(list)
+        for ec in enriched_classes:
+            parents = self.taxonomy_manager.get_parents(ec.class_name)
+            for parent in parents or {""}:
+                groups[parent].append(ec)
+
+        requests = [
+            (parent, children, self._submit_group_terms_request(parent, children))
+            for parent, children in sorted(groups.items())
+        ]
+
+        fallback: list[tuple[EnrichedClass, Future]] = []
+        for parent, children, future in requests:
+            try:
+                group_terms = self._collect_group_terms(future, children)
+            except Exception as e:
+                self.logger.warning(
+                    "Group term generation for %s failed (%s), "
+                    "falling back to one request per class",
+                    parent or "root",
+                    e,
                 )
-                ec.embeddings = embeddings
+                names = {ec.class_name for ec in children}
+                fallback.extend(
+                    (
+                        ec,
+                        self._submit_terms_request(
+                            ec.class_name,
+                            ec.class_description,
+                            parent,
+                            names - {ec.class_name},
+                        ),
+                    )
+                    for ec in children
+                )
+                continue
+            for ec, terms in zip(children, group_terms):
+                ec.terms.update(terms)
+
+        for ec, future in fallback:
+            terms = self._collect_terms(ec.class_name, future)
+            if terms:
+                ec.terms.update(terms)
+
+    def _submit_group_terms_request(
+        self, parent_class: str, children: list[EnrichedClass]
+    ) -> Future:
+        """
+        Submit the term generation request of the children of a parent.
 
-            self.logger.info("Enriched terms for %s: %s", ec.class_name, ec.terms)
+        The response is constrained by a JSON schema to an object holding the
+        list of terms of every child class.
+        """
+        children = sorted(children, key=lambda ec: ec.class_name)
+        names = [ec.class_name for ec in children]
+        classes = "\n".join(
+            f"- {ec.class_name}: {ec.class_description}"
+            if ec.class_description
+            else f"- {ec.class_name}"
+            for ec in children
+        )
+        schema = {
+            "type": "object",
+            "properties": {
+                name: {"type": "array", "items": {"type": "string"}} for name in names
+            },
+            "required": names,
+        }
+        prompt = GROUP_TERMS_PROMPT.format(
+            parent_class=parent_class or "root", classes=classes
+        )
 
-        return enriched_classes
+        self.logger.info("Generating terms for classes: %s", names)
+
+        return self.executor.submit(
+            [{"role": "user", "content": prompt}],
+            schema,
+            lambda content: self._parse_group_terms(content, children),
+        )
+
+    def _collect_group_terms(
+        self, future: Future, children: list[EnrichedClass]
+    ) -> list[Set[TermScore]]:
+        """
+        Wait for a group term generation request and parse the terms per class.
+
+        Args:
+            future (Future): Future of the group request.
+            children (list[EnrichedClass]): The classes of the group.
+
+        Returns:
+            list[Set[TermScore]]: The generated terms of each class.
+
+        Raises:
+            ValueError: If the response is empty or does not hold a list of terms
+                        for every class.
+        """
+        response = future.result()
+        if not response:
+            raise ValueError("empty response")
+
+        group_terms = self._parse_group_terms(response["message"]["content"], children)
+        for ec, terms in zip(children, group_terms):
+            self.logger.info("Generated terms for %s: %s", ec.class_name, terms)
+        return group_terms
+
+    @staticmethod
+    def _parse_group_terms(
+        content: str, children: list[EnrichedClass]
+    ) -> list[Set[TermScore]]:
+        """
+        Parse the terms per class of a group term generation response.
+
+        Args:
+            content (str): The response content.
+            children (list[EnrichedClass]): The classes of the group.
+
+        Returns:
+            list[Set[TermScore]]: The generated terms of each class.
+
+        Raises:
+            ValueError: If the content does not hold a list of terms for every
+                        class.
+        """
+        answer = json.loads(content)
+        if not isinstance(answer, dict):
+            raise ValueError("response is not a JSON object")
+
+        group_terms: list[Set[TermScore]] = []
+        for ec in children:
+            terms = answer.get(ec.class_name)
+            if not isinstance(terms, list):
+                raise ValueError(f"no terms for class {ec.class_name}")
+            group_terms.append(
+                {
+                    TermScore(term=term.strip())
+                    for term in terms
+                    if isinstance(term, str) and term.strip()
+                }
+            )
+        return group_terms
 
     def enrich_class(
         self,
@@ -152,28 +375,43 @@ class LLMEnricher(Enricher):
             Exception: If there is an error during term generation,
             it logs the error and returns an empty set.
         """
-        try:
-            siblings_str = ", ".join(siblings) if siblings else "none"
-            parent_str = parent_class if parent_class else "root"
-
-            prompt = self.prompt.format(
-                class_name=class_name,
-                class_description=class_description,
-                parent_class=parent_str,
-                siblings=siblings_str,
-            )
+        return self._collect_terms(
+            class_name,
+            self._submit_terms_request(
+                class_name, class_description, parent_class, siblings
+            ),
+        )
 
-            self.logger.info(
-                "Generating terms for class: %s, with description: %s",
-                class_name,
-                class_description,
-            )
+    def _submit_terms_request(
+        self,
+        class_name: str,
+        class_description: str,
+        parent_class: str,
+        siblings: Set[str],
+    ) -> Future:
+        """Submit the term generation request of a class to the executor."""
+        siblings_str = ", ".join(sorted(siblings)) if siblings else "none"
+        parent_str = parent_class if parent_class else "root"
+
+        prompt = self.prompt.format(
+            class_name=class_name,
+            class_description=class_description,
+            parent_class=parent_str,
+            siblings=siblings_str,
+        )
 
-            response = self.llm.chat(
-                model=self.model,
-                messages=[{"role": "user", "content": prompt}],
-                options={"temperature": self.temperature},
-            )
+        self.logger.info(
+            "Generating terms for class: %s, with description: %s",
+            class_name,
+            class_description,
+        )
+
+        return self.executor.submit([{"role": "user", "content": prompt}])
+
+    def _collect_terms(self, class_name: str, future: Future) -> Set[TermScore]:
+        """Wait for a term generation request and parse the generated terms."""
+        try:
+            response = future.result()
 
             if not response:
                 self.logger.warning("Empty response from LLM for class: %s", class_name)
@@ -191,57 +429,271 @@ class LLMEnricher(Enricher):
     def assign_classes_to_docs(
         self, collection: List[Document], enriched_classes: list[EnrichedClass]
     ) -> List[Document]:
-        """Assign initial classes to documents."""
-        self.logger.info("Assigning initial classes")
+        """
+        Assign initial classes to documents.
 
-        for doc in collection:
-            candidates = self._select_candidates_for_document(
-                doc_embedding=doc.embeddings,
-                taxonomy_manager=self.taxonomy_manager,
-                enriched_classes=enriched_classes,
+        With a core class batch size above 1, the documents are packed into
+        prompts of several documents under the token budget, answered with one
+        JSON object. The documents of a batch whose answer cannot be parsed are
+        sent again with one prompt per document.
+        """
+        self.logger.info("Assigning initial classes")
+        allowed = self._retrieve_candidate_classes(collection, enriched_classes)
+
+        candidates: list[dict[int, set[str]]] = []
+        for i, doc in enumerate(collection):
+            candidates.append(
+                self._select_candidates_for_document(
+                    doc_embedding=doc.embeddings,
+                    taxonomy_manager=self.taxonomy_manager,
+                    enriched_classes=enriched_classes,
+                    allowed=allowed[i] if allowed is not None else None,
+                )
             )
+            self.logger.info("Candidates for document %s: %s", doc.id, candidates[i])
+
+        single: dict[int, Future] = {}
+        batched: list[tuple[list[int], Future]] = []
+        for batch in self._batch_documents(collection, candidates):
+            if len(batch) == 1:
+                i = batch[0]
+                single[i] = self._submit_core_classes_request(
+                    collection[i].content, candidates[i]
+                )
+            else:
+                batched.append(
+                    (
+                        batch,
+                        self._submit_core_classes_batch_request(
+                            [collection[i].content for i in batch],
+                            [candidates[i] for i in batch],
+                        ),
+                    )
+                )
+
+        # requests of all documents are in flight, collect them in order
+        core_classes: dict[int, List[str]] = {}
+        for batch, future in batched:
+            try:
+                selected = self._collect_core_classes_batch(
+                    future, [candidates[i] for i in batch]
+                )
+            except Exception as e:
+                self.logger.warning(
+                    "Batched core class selection failed (%s), "
+                    "falling back to one prompt per document",
+                    e,
+                )
+                for i in batch:
+                    single[i] = self._submit_core_classes_request(
+                        collection[i].content, candidates[i]
+                    )
+                continue
+            core_classes.update(zip(batch, selected))
 
-            self.logger.info("Candidates for document %s: %s", doc.id, candidates)
-            core_classes = self._select_core_classes(doc.content, candidates)
-            doc.core_classes = set(core_classes)
+        for i, future in single.items():
+            core_classes[i] = self._collect_core_classes(future)
+
+        for i, doc in enumerate(collection):
+            doc.core_classes = set(core_classes[i])
             self.logger.info(
-                "Assigned classes for document %s: %s", doc.id, core_classes
+                "Assigned classes for document %s: %s", doc.id, core_classes[i]
             )
 
         return collection
 
+    def _batch_documents(
+        self, collection: List[Document], candidates: list[dict[int, set[str]]]
+    ) -> list[list[int]]:
+        """
+        Group documents into core class selection prompts.
+
+        Consecutive documents are added to a batch until it holds the configured
+        number of documents or its estimated size exceeds the token budget. A
+        document larger than the budget forms a batch on its own.
+
+        Args:
+            collection (List[Document]): The documents to classify.
+            candidates (list[dict[int, set[str]]]): Candidate classes by level of
+                                                    each document.
+
+        Returns:
+            list[list[int]]: Positions in the collection of the documents of
+            each batch.
+        """
+        batches: list[list[int]] = []
+        batch: list[int] = []
+        tokens = 0
+        for i, doc in enumerate(collection):
+            section = self._format_document_section(1, doc.content, candidates[i])
+            size = len(section) // CHARS_PER_TOKEN + 1
+            if batch and (
+                len(batch) >= self.core_class_batch_size
+                or tokens + size > self.core_class_token_budget
+            ):
+                batches.append(batch)
+                batch, tokens = [], 0
+            batch.append(i)
+            tokens += size
+        if batch:
+            batches.append(batch)
+        return batches
+
     def _select_core_classes(
         self, doc: str, candidates: dict[int, set[str]]
     ) -> List[str]:
         """Select core classes from a list of candidates using LLM."""
-        try:
-            candidates_text = []
-            for level in sorted(candidates.keys()):
-                classes = sorted(candidates[level])
-                candidates_text.append(f"Level {level}: {', '.join(classes)}")
-            formatted_candidates = "\n".join(candidates_text)
+        return self._collect_core_classes(
+            self._submit_core_classes_request(doc, candidates)
+        )
 
-            prompt = f"""Given this document:
+    def _submit_core_classes_request(
+        self, doc: str, candidates: dict[int, set[str]]
+    ) -> Future:
+        """Submit the core class selection request of a document to the executor."""
+        prompt = f"""Given this document:
 "{doc}"
 
 And these possible classes by level:
-{formatted_candidates}
+{self._format_candidates(candidates)}
 
 
 Select ONLY the most specific and directly relevant class that best describe the main topics of this document.
-Important guidelines:
-- Choose the class that is most specific to the document's content at each level
-- Exclude broad/general classes unless they are directly discussed
-- Only select ONE class maximum per level
-- If uncertain about a class, exclude it
+{CORE_CLASS_GUIDELINES}
 
 Return only the selected class names separated by commas, nothing else."""  # noqa: E501
 
-            response = self.llm.chat(
-                model=self.model,
-                messages=[{"role": "user", "content": prompt}],
-                options={"temperature": self.temperature},
+        return self.executor.submit([{"role": "user", "content": prompt}])
+
+    def _submit_core_classes_batch_request(
+        self, docs: list[str], candidates: list[dict[int, set[str]]]
+    ) -> Future:
+        """
+        Submit one core class selection request for several documents.
+
+        The documents are numbered from 1 in the prompt, and the response is
+        constrained by a JSON schema to an object holding the list of selected
+        classes of every document number.
+        """
+        sections = "\n\n".join(
+            self._format_document_section(number, doc, doc_candidates)
+            for number, (doc, doc_candidates) in enumerate(zip(docs, candidates), 1)
+        )
+        numbers = [str(number) for number in range(1, len(docs) + 1)]
+        schema = {
+            "type": "object",
+            "properties": {
+                number: {"type": "array", "items": {"type": "string"}}
+                for number in numbers
+            },
+            "required": numbers,
+        }
+
+        prompt = f"""Given these {len(docs)} documents, each with its own possible classes by level:
+
+{sections}
+
+
+For EACH document, select ONLY the most specific and directly relevant class from its own possible classes that best describe the main topics of the document.
+{CORE_CLASS_GUIDELINES}
+
+Return a JSON object mapping every document number to the list of its selected class names."""  # noqa: E501
+
+        return self.executor.submit(
+            [{"role": "user", "content": prompt}],
+            schema,
+            lambda content: self._parse_core_classes_batch(content, candidates),
+        )
+
+    def _collect_core_classes_batch(
+        self, future: Future, candidates: list[dict[int, set[str]]]
+    ) -> list[List[str]]:
+        """
+        Wait for a batched core class selection request and parse the answers.
+
+        Selected classes that are not candidates of their document are dropped.
+
+        Args:
+            future (Future): Future of the batched request.
+            candidates (list[dict[int, set[str]]]): Candidate classes by level of
+                                                    each document of the batch.
+
+        Returns:
+            list[List[str]]: The selected classes of each document.
+
+        Raises:
+            ValueError: If the response is empty or does not hold a list of
+                        classes for every document.
+        """
+        response = future.result()
+        if not response:
+            raise ValueError("empty response")
+
+        selected = self._parse_core_classes_batch(
+            response["message"]["content"], candidates
+        )
+        self.logger.info("Selected core classes: %s", selected)
+        return selected
+
+    @staticmethod
+    def _parse_core_classes_batch(
+        content: str, candidates: list[dict[int, set[str]]]
+    ) -> list[List[str]]:
+        """
+        Parse the selected classes per document of a batched selection response.
+
+        Args:
+            content (str): The response content.
+            candidates (list[dict[int, set[str]]]): Candidate classes by level of
+                                                    each document of the batch.
+
+        Returns:
+            list[List[str]]: The selected candidate classes of each document.
+
+        Raises:
+            ValueError: If the content does not hold a list of classes for every
+                        document.
+        """
+        answer = json.loads(content)
+        if not isinstance(answer, dict):
+            raise ValueError("response is not a JSON object")
+
+        selected: list[List[str]] = []
+        for number, doc_candidates in enumerate(candidates, 1):
+            classes = answer.get(str(number))
+            if not isinstance(classes, list):
+                raise ValueError(f"no classes for document {number}")
+            allowed = set().union(*doc_candidates.values())
+            selected.append(
+                [
+                    name.strip()
+                    for name in classes
+                    if isinstance(name, str) and name.strip() in allowed
+                ]
             )
+        return selected
+
+    @staticmethod
+    def _format_candidates(candidates: dict[int, set[str]]) -> str:
+        """Format the candidate classes of a document, one line per level."""
+        return "\n".join(
+            f"Level {level}: {', '.join(sorted(candidates[level]))}"
+            for level in sorted(candidates.keys())
+        )
+
+    def _format_document_section(
+        self, number: int, doc: str, candidates: dict[int, set[str]]
+    ) -> str:
+        """Format a document and its candidate classes for a batched prompt."""
+        return f"""Document {number}:
+"{doc}"
+Possible classes by level:
+{self._format_candidates(candidates)}"""
+
+    def _collect_core_classes(self, future: Future) -> List[str]:
+        """Wait for a core class selection request and parse the selected classes."""
+        try:
+            response = future.result()
 
             if not response:
                 self.logger.warning(
@@ -258,15 +710,57 @@ Return only the selected class names separated by commas, nothing else."""  # no
             self.logger.error("Error selecting core classes: %s", str(e))
             return []
 
+    def _retrieve_candidate_classes(
+        self, collection: List[Document], enriched_classes: list[EnrichedClass]
+    ) -> list[set[str]] | None:
+        """
+        Retrieve candidate classes for all documents with an ANN index over terms.
+
+        The index holds the term embeddings of all classes. The classes of the
+        nearest terms of a document and their ancestors are its candidates.
+
+        Returns:
+            list[set[str]] | None: Candidate classes per document, None if ANN
+            retrieval is disabled or the taxonomy is too small.
+        """
+        classes: list[EnrichedClass] = []
+        term_embeddings: list[np.ndarray] = []
+        for ec in enriched_classes:
+            if ec.embeddings is not None:
+                classes.append(ec)
+                term_embeddings.append(np.atleast_2d(ec.embeddings))
+        if not self.ann_config.enabled or len(classes) < self.ann_config.min_classes:
+            return None
+
+        owners = np.repeat(np.arange(len(classes)), [len(e) for e in term_embeddings])
+        index = IVFIndex(
+            np.concatenate(term_embeddings),
+            self.ann_config.n_lists,
+            self.ann_config.n_probe,
+        )
+        ids, _ = index.search(
+            np.stack([doc.embeddings for doc in collection]), self.ann_config.top_k
+        )
+
+        retrieved: list[set[str]] = []
+        for row in ids:
+            names = {classes[owners[i]].class_name for i in row if i >= 0}
+            for name in list(names):
+                names |= self.taxonomy_manager.get_ancestors(name)
+            retrieved.append(names)
+        return retrieved
+
     def _select_candidates_for_document(
         self,
         doc_embedding: np.ndarray | None,
         taxonomy_manager: TaxonomyManager,
         enriched_classes: list[EnrichedClass],
+        allowed: set[str] | None = None,
     ) -> dict[int, set[str]]:
         """Select candidate classes for a document using level-wise traversal."""
         candidates = defaultdict(set)
         current_level = set(taxonomy_manager.root_nodes)
+        classes = {ec.class_name: ec for ec in enriched_classes}
 
         if doc_embedding is None:
             self.logger.error("document embedding is not calculated")
@@ -277,13 +771,15 @@ Return only the selected class names separated by commas, nothing else."""  # no
             if not current_level:
                 break
 
-            # Calculate similarities for current level
-            similarities = []
-            for ec in enriched_classes:
-                if ec.class_name in current_level:
-                    similarities.append(
-                        (ec.class_name, self._compute_similarity(doc_embedding, ec))
-                    )
+            # Calculate similarities for current level, restricted to retrieved
+            # classes if an ANN index is used
+            if allowed is not None:
+                current_level &= allowed
+            similarities = [
+                (name, self._compute_similarity(doc_embedding, classes[name]))
+                for name in current_level
+                if name in classes
+            ]
 
             # Select top candidates
             similarities.sort(key=lambda x: x[1], reverse=True)
@@ -322,9 +818,6 @@ Return only the selected class names separated by commas, nothing else."""  # no
             self.logger.error("Document embedding is None")
             return 0.0
 
-        return np.max(
-            [
-                self.encoder.similarity(embedding, term_embedding)
-                for term_embedding in enriched_class.embeddings
-            ]
+        return float(
+            np.max(self.encoder.similarity(embedding, enriched_class.embeddings))
         )
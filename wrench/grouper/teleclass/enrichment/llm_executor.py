@@ -0,0 +1,208 @@
+"""
+Concurrent execution of LLM chat requests.
+
+`LLMExecutor` sends chat requests from a thread pool, so up to `concurrency`
+requests are served by the LLM host in parallel. Failed requests are retried with
+exponential backoff, and identical requests that are in flight at the same time
+are coalesced into a single call. With a `PromptCache`, requests answered before
+are served from the cache without reaching the LLM. Requests submitted with a
+validator only cache responses it accepts, so a malformed answer is requested
+again instead of being served from the cache forever. The worker threads are
+started with the first request and stopped by `shutdown`.
+"""
+
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Literal, Mapping, Sequence
+
+from ollama import ChatResponse, Client, Message
+
+from wrench.common.prompt_cache import PromptCache, prompt_key
+from wrench.log import logger
+
+Messages = Sequence[Mapping[str, Any]]
+Validator = Callable[[str], Any]
+Format = Literal["", "json"] | dict[str, Any] | None
+
+
+class LLMExecutor:
+    """Sends chat requests concurrently, with retries and in-flight deduplication."""
+
+    def __init__(
+        self,
+        client: Client,
+        model: str,
+        options: Mapping[str, Any] | None = None,
+        concurrency: int = 4,
+        retries: int = 2,
+        backoff: float = 1.0,
+        cache: PromptCache | None = None,
+    ):
+        """
+        Initializes the executor.
+
+        Args:
+            client (Client): The Ollama client, which sets the request timeout.
+            model (str): Name of the model.
+            options (Mapping[str, Any] | None, optional): Generation options of
+                                                         all requests.
+                                                         Defaults to None.
+            concurrency (int, optional): Maximum number of requests in flight.
+                                         Defaults to 4.
+            retries (int, optional): Number of retries of a failed request.
+                                     Defaults to 2.
+            backoff (float, optional): Delay before the first retry in seconds,
+                                       doubled for every further retry.
+                                       Defaults to 1.0.
+            cache (PromptCache | None, optional): Persistent cache of responses.
+                                       Defaults to None.
+        """
+        self.client = client
+        self.model = model
+        self.options = dict(options or {})
+        self.retries = retries
+        self.backoff = backoff
+        self.cache = cache
+        self.concurrency = concurrency
+        self._pool: ThreadPoolExecutor | None = None
+        self._in_flight: dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self.logger = logger.getChild(self.__class__.__name__)
+
+    def submit(
+        self,
+        messages: Messages,
+        format: Format = None,
+        validate: Validator | None = None,
+    ) -> Future:
+        """
+        Submit a chat request.
+
+        A cached request completes immediately, and a request identical to one
+        that is still in flight shares its future.
+
+        Args:
+            messages (Messages): The chat messages.
+            format (Format, optional): Output format, "json"
+                or a JSON schema. Defaults to None (free text).
+            validate (Validator | None, optional): Parses the response content
+                and raises if it is malformed. Rejected responses are still
+                returned, but neither cached nor served from the cache.
+                Defaults to None (any non-empty response is cached).
+
+        Returns:
+            Future: Future of the chat response.
+        """
+        key = prompt_key(self.model, messages, self.options, format)
+        content = self.cache.get(key) if self.cache is not None else None
+        if content is not None and self._is_valid(content, validate):
+            cached: Future = Future()
+            cached.set_result(
+                ChatResponse(
+                    model=self.model,
+                    message=Message(role="assistant", content=content),
+                    done=True,
+                )
+            )
+            return cached
+
+        with self._lock:
+            in_flight = self._in_flight.get(key)
+            if in_flight is not None:
+                self.logger.debug("Joining identical in-flight request")
+                return in_flight
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self.concurrency, thread_name_prefix="llm"
+                )
+            future = self._pool.submit(self._chat, key, messages, format, validate)
+            self._in_flight[key] = future
+
+        future.add_done_callback(lambda _: self._release(key))
+        return future
+
+    def chat(
+        self,
+        messages: Messages,
+        format: Format = None,
+        validate: Validator | None = None,
+    ) -> Any:
+        """
+        Send a chat request and wait for the response.
+
+        Args:
+            messages (Messages): The chat messages.
+            format (Format, optional): Output format, "json"
+                or a JSON schema. Defaults to None (free text).
+            validate (Validator | None, optional): Parses the response content
+                and raises if it is malformed, see `submit`. Defaults to None.
+
+        Returns:
+            Any: The chat response.
+
+        Raises:
+            Exception: The error of the last attempt if all attempts failed.
+        """
+        return self.submit(messages, format, validate).result()
+
+    def shutdown(self) -> None:
+        """
+        Wait for pending requests and stop the worker threads.
+
+        The executor stays usable, a later request starts new worker threads.
+        """
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True)
+
+    def _release(self, key: str) -> None:
+        """Forget a completed request, so it is sent again when resubmitted."""
+        with self._lock:
+            self._in_flight.pop(key, None)
+
+    def _is_valid(self, content: str, validate: Validator | None) -> bool:
+        """Whether a response content is accepted by the validator, if any."""
+        if validate is None:
+            return True
+        try:
+            validate(content)
+        except Exception as e:
+            self.logger.warning("Malformed LLM response is not cached: %s", e)
+            return False
+        return True
+
+    def _chat(
+        self,
+        key: str,
+        messages: Messages,
+        format: Format,
+        validate: Validator | None,
+    ) -> Any:
+        """Send a request, retrying failures, and cache a valid response."""
+        for attempt in range(self.retries + 1):
+            try:
+                response = self.client.chat(
+                    model=self.model,
+                    messages=messages,
+                    options=self.options,
+                    format=format,
+                )
+            except Exception as e:
+                if attempt == self.retries:
+                    raise
+                delay = self.backoff * 2**attempt
+                self.logger.warning(
+                    "LLM request failed (%s), retrying in %.1fs", e, delay
+                )
+                time.sleep(delay)
+                continue
+
+            content = response["message"]["content"] if response else None
+            if self.cache is not None and content:
+                if self._is_valid(content, validate):
+                    self.cache.put(key, content)
+                else:
+                    self.cache.delete(key)
+            return response
@@ -0,0 +1,149 @@
+"""
+Resumable checkpoints for paginated harvests.
+
+Long harvests store the raw items of completed pages in a local spool together
+with the state needed to continue (next link, page count and remaining limit). If
+a harvest is interrupted, the next run reuses the spooled pages and continues from
+the last checkpoint instead of starting again at the first page.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+from pathlib import Path
+from typing import Any
+
+from pydantic import BaseModel, Field
+
+from wrench.log import logger
+
+
+class CheckpointState(BaseModel):
+    """Progress of a paginated harvest."""
+
+    url: str = Field(description="URL of the first page of the harvest")
+    next_url: str | None = Field(description="URL of the next page to fetch")
+    page_count: int = Field(description="Number of the next page to fetch")
+    remaining_items: int | None = Field(description="Remaining item limit")
+    spooled_pages: int = Field(default=0, description="Number of spooled pages")
+
+
+class HarvestCheckpoint:
+    """Stores harvest progress and completed pages in a spool directory."""
+
+    def __init__(self, directory: str | Path, url: str, limit: int, interval: int):
+        """
+        Initializes the checkpoint of a harvest.
+
+        Args:
+            directory (str | Path): Base directory for checkpoints.
+            url (str): URL of the first page of the harvest.
+            limit (int): Item limit of the harvest, part of the checkpoint key.
+            interval (int): Number of pages between writes to disk.
+
+        Attributes:
+            path (Path): Directory of this harvest's checkpoint.
+        """
+        key = hashlib.sha256(f"{url}|{limit}".encode()).hexdigest()[:16]
+        self.path = Path(directory) / key
+        self.url = url
+        self.interval = max(1, interval)
+        self.state: CheckpointState | None = None
+        self._pending: list[list[dict[str, Any]]] = []
+        self.logger = logger.getChild(self.__class__.__name__)
+
+    @property
+    def _state_path(self) -> Path:
+        return self.path / "state.json"
+
+    def _page_path(self, index: int) -> Path:
+        return self.path / f"page_{index:06d}.json"
+
+    @staticmethod
+    def _write_atomic(path: Path, content: str) -> None:
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text(content)
+        os.replace(tmp_path, path)
+
+    def load(self) -> tuple[CheckpointState | None, list[dict[str, Any]]]:
+        """
+        Load the state and spooled items of an interrupted harvest.
+
+        Returns:
+            tuple[CheckpointState | None, list[dict[str, Any]]]: The saved state and
+            the raw items of all spooled pages, `(None, [])` if there is none.
+        """
+        if not self._state_path.exists():
+            return None, []
+
+        try:
+            state = CheckpointState.model_validate_json(self._state_path.read_text())
+            items: list[dict[str, Any]] = []
+            for index in range(state.spooled_pages):
+                items.extend(json.loads(self._page_path(index).read_text()))
+        except (OSError, ValueError) as e:
+            self.logger.warning("Discarding unreadable checkpoint %s: %s", self.path, e)
+            self.clear()
+            return None, []
+
+        if state.url != self.url:
+            self.logger.warning("Discarding checkpoint of another harvest")
+            self.clear()
+            return None, []
+
+        self.state = state
+        return state, items
+
+    def add_page(
+        self,
+        items: list[dict[str, Any]],
+        next_url: str | None,
+        page_count: int,
+        remaining_items: int | None,
+    ) -> None:
+        """
+        Record a completed page, writing to disk every `interval` pages.
+
+        Args:
+            items (list[dict[str, Any]]): Raw data of the validated items of the page.
+            next_url (str | None): URL of the next page.
+            page_count (int): Number of the next page.
+            remaining_items (int | None): Remaining item limit.
+        """
+        spooled = self.state.spooled_pages if self.state else 0
+        self._pending.append(items)
+        self.state = CheckpointState(
+            url=self.url,
+            next_url=next_url,
+            page_count=page_count,
+            remaining_items=remaining_items,
+            spooled_pages=spooled,
+        )
+        if len(self._pending) >= self.interval:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write pending pages and the current state to disk."""
+        if self.state is None or not self._pending:
+            return
+
+        self.path.mkdir(parents=True, exist_ok=True)
+        # pages first, the state only references pages which are fully written
+        for page in self._pending:
+            self._write_atomic(
+                self._page_path(self.state.spooled_pages), json.dumps(page)
+            )
+            self.state.spooled_pages += 1
+        self._pending.clear()
+
+        self._write_atomic(self._state_path, self.state.model_dump_json())
+        self.logger.debug(
+            "Saved checkpoint with %d pages at %s", self.state.spooled_pages, self.path
+        )
+
+    def clear(self) -> None:
+        """Remove the checkpoint after the harvest completed."""
+        self._pending.clear()
+        self.state = None
+        shutil.rmtree(self.path, ignore_errors=True)
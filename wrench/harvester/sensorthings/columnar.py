@@ -0,0 +1,438 @@
+"""
+Columnar in-memory representation of harvested Things.
+
+Downstream stages only need a few columns per Thing. The `ThingTable` keeps them
+in flat NumPy arrays: coordinates and epoch time bounds as float arrays, repeated
+strings as integer codes into a table of unique values, and variable-length
+location and datastream lists as offsets into flat child arrays. Extent, time range
+and filters are computed with vectorized operations, so they scale to millions of
+rows.
+
+Requires the `columnar` extra (`numpy`, and `pyarrow` for Arrow/Parquet export).
+"""
+
+from array import array
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterable
+
+import numpy as np
+from numpy.dtypes import StringDType
+
+from .models import Thing
+
+
+def _to_epoch(value: str) -> float:
+    """Convert an ISO 8601 timestamp to seconds since epoch, naive times as UTC."""
+    timestamp = datetime.fromisoformat(value)
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=timezone.utc)
+    return timestamp.timestamp()
+
+
+@dataclass(frozen=True)
+class InternedStrings:
+    """
+    String column stored as integer codes into an array of unique values.
+
+    Attributes:
+        codes (np.ndarray): int32 code per row, -1 for missing values.
+        values (np.ndarray): Unique string values.
+    """
+
+    codes: np.ndarray
+    values: np.ndarray
+
+    def __len__(self) -> int:
+        """Returns the number of rows."""
+        return len(self.codes)
+
+    def __getitem__(self, index: int) -> str | None:
+        """Returns the string of a row."""
+        code = self.codes[index]
+        return None if code < 0 else str(self.values[code])
+
+    def decode(self) -> list[str | None]:
+        """Returns all rows as Python strings."""
+        return [self[i] for i in range(len(self))]
+
+    def take(self, indices: np.ndarray) -> "InternedStrings":
+        """Returns the rows at the given indices, sharing the unique values."""
+        return InternedStrings(codes=self.codes[indices], values=self.values)
+
+    def code_of(self, value: str) -> int:
+        """Returns the code of a value, -1 if the value does not occur."""
+        matches = np.flatnonzero(self.values == value)
+        return int(matches[0]) if len(matches) else -1
+
+
+class _StringPool:
+    def __init__(self):
+        self.index: dict[str, int] = {}
+        self.codes = array("i")
+
+    def append(self, value: str | None) -> None:
+        if value is None:
+            self.codes.append(-1)
+            return
+        self.codes.append(self.index.setdefault(value, len(self.index)))
+
+    def build(self) -> InternedStrings:
+        return InternedStrings(
+            codes=_as_array(self.codes, np.int32),
+            values=np.array(list(self.index), dtype=StringDType()),
+        )
+
+
+@dataclass(frozen=True)
+class ThingTable:
+    """
+    Columnar table with one row per Thing.
+
+    Locations and datastreams are stored in flat child arrays; the locations of
+    row `i` are `location_offsets[i]:location_offsets[i + 1]`, likewise for
+    datastreams. Times are seconds since epoch (UTC), NaN where unknown.
+    """
+
+    ids: np.ndarray
+    names: InternedStrings
+    descriptions: InternedStrings
+    start_times: np.ndarray
+    end_times: np.ndarray
+    location_offsets: np.ndarray
+    longitudes: np.ndarray
+    latitudes: np.ndarray
+    datastream_offsets: np.ndarray
+    datastream_start_times: np.ndarray
+    datastream_end_times: np.ndarray
+    observed_properties: InternedStrings
+
+    @classmethod
+    def from_things(cls, things: Iterable[Thing]) -> "ThingTable":
+        """
+        Build a table from Things.
+
+        Args:
+            things (Iterable[Thing]): The Things to add to the table.
+
+        Returns:
+            ThingTable: The columnar table.
+        """
+        builder = ThingTableBuilder()
+        for thing in things:
+            builder.append(thing)
+        return builder.build()
+
+    def __len__(self) -> int:
+        """Returns the number of Things in the table."""
+        return len(self.ids)
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory used by the numeric columns in bytes."""
+        arrays = [
+            self.start_times,
+            self.end_times,
+            self.location_offsets,
+            self.longitudes,
+            self.latitudes,
+            self.datastream_offsets,
+            self.datastream_start_times,
+            self.datastream_end_times,
+            self.names.codes,
+            self.descriptions.codes,
+            self.observed_properties.codes,
+        ]
+        return sum(a.nbytes for a in arrays)
+
+    def extent(self) -> tuple[float, float, float, float]:
+        """
+        Calculate the bounding box of all locations.
+
+        Returns:
+            tuple[float, float, float, float]: min longitude, min latitude, max
+            longitude and max latitude. Infinite bounds if there are no locations.
+        """
+        if not len(self.longitudes):
+            return float("inf"), float("inf"), float("-inf"), float("-inf")
+        return (
+            float(self.longitudes.min()),
+            float(self.latitudes.min()),
+            float(self.longitudes.max()),
+            float(self.latitudes.max()),
+        )
+
+    def time_range(self) -> tuple[datetime, datetime]:
+        """
+        Calculate the overall phenomenon time range of all datastreams.
+
+        Returns:
+            tuple[datetime, datetime]: Earliest start and latest end time in UTC.
+            `datetime.max` and `datetime.min` if no datastream has a phenomenon time.
+        """
+        earliest = datetime.max.replace(tzinfo=timezone.utc)
+        latest = datetime.min.replace(tzinfo=timezone.utc)
+        if np.any(~np.isnan(self.start_times)):
+            earliest = datetime.fromtimestamp(
+                np.nanmin(self.start_times), tz=timezone.utc
+            )
+        if np.any(~np.isnan(self.end_times)):
+            latest = datetime.fromtimestamp(np.nanmax(self.end_times), tz=timezone.utc)
+        return earliest, latest
+
+    def _row_of_children(self, offsets: np.ndarray) -> np.ndarray:
+        """Map every child element to the index of its Thing row."""
+        return np.repeat(np.arange(len(self)), np.diff(offsets))
+
+    def within(
+        self, min_lng: float, min_lat: float, max_lng: float, max_lat: float
+    ) -> np.ndarray:
+        """
+        Mask of Things with at least one location inside a bounding box.
+
+        Returns:
+            np.ndarray: Boolean mask over the rows.
+        """
+        inside = (
+            (self.longitudes >= min_lng)
+            & (self.longitudes <= max_lng)
+            & (self.latitudes >= min_lat)
+            & (self.latitudes <= max_lat)
+        )
+        mask = np.zeros(len(self), dtype=bool)
+        mask[self._row_of_children(self.location_offsets)[inside]] = True
+        return mask
+
+    def active_between(self, start: datetime, end: datetime) -> np.ndarray:
+        """
+        Mask of Things whose phenomenon time overlaps a time interval.
+
+        Returns:
+            np.ndarray: Boolean mask over the rows.
+        """
+        return (self.start_times <= end.timestamp()) & (
+            self.end_times >= start.timestamp()
+        )
+
+    def observing(self, observed_property: str) -> np.ndarray:
+        """
+        Mask of Things with a datastream observing the given property.
+
+        Returns:
+            np.ndarray: Boolean mask over the rows.
+        """
+        code = self.observed_properties.code_of(observed_property)
+        mask = np.zeros(len(self), dtype=bool)
+        if code < 0:
+            return mask
+        matches = self.observed_properties.codes == code
+        mask[self._row_of_children(self.datastream_offsets)[matches]] = True
+        return mask
+
+    def filter(self, mask: np.ndarray) -> "ThingTable":
+        """
+        Select the rows of a boolean mask.
+
+        Args:
+            mask (np.ndarray): Boolean mask over the rows.
+
+        Returns:
+            ThingTable: A new table with the selected rows.
+        """
+        rows = np.flatnonzero(mask)
+        location_mask = mask[self._row_of_children(self.location_offsets)]
+        datastream_mask = mask[self._row_of_children(self.datastream_offsets)]
+
+        def offsets(old: np.ndarray) -> np.ndarray:
+            counts = np.diff(old)[rows]
+            return np.concatenate(([0], np.cumsum(counts))).astype(np.int64)
+
+        return ThingTable(
+            ids=self.ids[rows],
+            names=self.names.take(rows),
+            descriptions=self.descriptions.take(rows),
+            start_times=self.start_times[rows],
+            end_times=self.end_times[rows],
+            location_offsets=offsets(self.location_offsets),
+            longitudes=self.longitudes[location_mask],
+            latitudes=self.latitudes[location_mask],
+            datastream_offsets=offsets(self.datastream_offsets),
+            datastream_start_times=self.datastream_start_times[datastream_mask],
+            datastream_end_times=self.datastream_end_times[datastream_mask],
+            observed_properties=InternedStrings(
+                codes=self.observed_properties.codes[datastream_mask],
+                values=self.observed_properties.values,
+            ),
+        )
+
+    def to_arrow(self):
+        """
+        Convert the table to an Arrow table.
+
+        Names, descriptions and observed properties become dictionary arrays,
+        locations and observed properties list columns.
+
+        Returns:
+            pyarrow.Table: The Arrow table.
+
+        Raises:
+            ImportError: If pyarrow is not installed.
+        """
+        import pyarrow as pa
+
+        def dictionary(strings: InternedStrings) -> pa.DictionaryArray:
+            return pa.DictionaryArray.from_arrays(
+                pa.array(strings.codes, mask=strings.codes < 0),
+                pa.array(strings.values.astype(object), type=pa.string()),
+            )
+
+        def timestamps(values: np.ndarray) -> pa.Array:
+            return pa.array(
+                np.where(np.isnan(values), 0, values * 1e6).astype(np.int64),
+                type=pa.timestamp("us", tz="UTC"),
+                mask=np.isnan(values),
+            )
+
+        locations = pa.ListArray.from_arrays(
+            pa.array(self.location_offsets.astype(np.int32)),
+            pa.StructArray.from_arrays(
+                [pa.array(self.longitudes), pa.array(self.latitudes)],
+                names=["longitude", "latitude"],
+            ),
+        )
+        observed_properties = pa.ListArray.from_arrays(
+            pa.array(self.datastream_offsets.astype(np.int32)),
+            dictionary(self.observed_properties),
+        )
+
+        return pa.table(
+            {
+                "id": pa.array(self.ids.astype(object), type=pa.string()),
+                "name": dictionary(self.names),
+                "description": dictionary(self.descriptions),
+                "start_time": timestamps(self.start_times),
+                "end_time": timestamps(self.end_times),
+                "locations": locations,
+                "observed_properties": observed_properties,
+            }
+        )
+
+    def write_ipc(self, path: str | Path) -> None:
+        """
+        Write the table to an Arrow IPC file.
+
+        Args:
+            path (str | Path): The target file path.
+        """
+        import pyarrow as pa
+
+        table = self.to_arrow()
+        with pa.OSFile(str(path), "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+
+    def write_parquet(self, path: str | Path) -> None:
+        """
+        Write the table to a Parquet file.
+
+        Args:
+            path (str | Path): The target file path.
+        """
+        import pyarrow.parquet as pq
+
+        pq.write_table(self.to_arrow(), str(path))
+
+
+class ThingTableBuilder:
+    """Accumulates Things row by row into compact buffers for a `ThingTable`."""
+
+    def __init__(self):
+        """Initializes empty column buffers."""
+        self._ids: list[str] = []
+        self._names = _StringPool()
+        self._descriptions = _StringPool()
+        self._location_offsets = array("q", [0])
+        self._longitudes = array("d")
+        self._latitudes = array("d")
+        self._datastream_offsets = array("q", [0])
+        self._datastream_start_times = array("d")
+        self._datastream_end_times = array("d")
+        self._observed_properties = _StringPool()
+
+    def append(self, thing: Thing) -> None:
+        """
+        Add a Thing as new row.
+
+        Args:
+            thing (Thing): The Thing to add.
+        """
+        self._ids.append(thing.id)
+        self._names.append(thing.name)
+        self._descriptions.append(thing.description)
+
+        for loc in thing.location or []:
+            lng, lat = loc.get_coordinates()
+            self._longitudes.append(lng)
+            self._latitudes.append(lat)
+        self._location_offsets.append(len(self._longitudes))
+
+        for datastream in thing.datastreams or []:
+            start = end = float("nan")
+            if datastream.phenomenon_time:
+                start_str, end_str = datastream.phenomenon_time.split("/")
+                start, end = _to_epoch(start_str), _to_epoch(end_str)
+            self._datastream_start_times.append(start)
+            self._datastream_end_times.append(end)
+            self._observed_properties.append(
+                datastream.observed_property.name
+                if datastream.observed_property
+                else None
+            )
+        self._datastream_offsets.append(len(self._datastream_start_times))
+
+    def build(self) -> ThingTable:
+        """
+        Create the table from the accumulated rows.
+
+        Returns:
+            ThingTable: The columnar table.
+        """
+        datastream_offsets = _as_array(self._datastream_offsets, np.int64)
+        datastream_start_times = _as_array(self._datastream_start_times, np.float64)
+        datastream_end_times = _as_array(self._datastream_end_times, np.float64)
+
+        return ThingTable(
+            ids=np.array(self._ids, dtype=StringDType()),
+            names=self._names.build(),
+            descriptions=self._descriptions.build(),
+            start_times=_reduce_segments(
+                np.fmin, datastream_start_times, datastream_offsets
+            ),
+            end_times=_reduce_segments(
+                np.fmax, datastream_end_times, datastream_offsets
+            ),
+            location_offsets=_as_array(self._location_offsets, np.int64),
+            longitudes=_as_array(self._longitudes, np.float64),
+            latitudes=_as_array(self._latitudes, np.float64),
+            datastream_offsets=datastream_offsets,
+            datastream_start_times=datastream_start_times,
+            datastream_end_times=datastream_end_times,
+            observed_properties=self._observed_properties.build(),
+        )
+
+
+def _as_array(buffer: array, dtype: type) -> np.ndarray:
+    """Copy an `array.array` buffer into a NumPy array of the given dtype."""
+    return np.frombuffer(buffer, dtype=dtype).copy()
+
+
+def _reduce_segments(
+    ufunc: np.ufunc, values: np.ndarray, offsets: np.ndarray
+) -> np.ndarray:
+    """Reduce consecutive segments of `values`, NaN for empty segments."""
+    result = np.full(len(offsets) - 1, np.nan)
+    non_empty = np.flatnonzero(np.diff(offsets) > 0)
+    if len(non_empty):
+        result[non_empty] = ufunc.reduceat(values, offsets[non_empty])
+    return result
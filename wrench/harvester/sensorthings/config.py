@@ -21,6 +21,35 @@ class TranslatorConfig(BaseModel):
     source_lang: str | None = Field(default=None, description="Source language code")
 
 
+class TrustedSourceConfig(BaseModel):
+    """Configuration for harvesting servers with known well-formed payloads."""
+
+    enabled: bool = Field(
+        default=False,
+        description="Construct models without full validation for this server",
+    )
+    sample_rate: float = Field(
+        default=0.01,
+        ge=0.0,
+        le=1.0,
+        description="Fraction of items which are still fully validated",
+    )
+
+
+class CheckpointConfig(BaseModel):
+    """Configuration for resumable harvests."""
+
+    enabled: bool = Field(
+        default=False, description="Save progress to resume interrupted harvests"
+    )
+    directory: str = Field(
+        default=".harvest_checkpoints", description="Directory for checkpoint files"
+    )
+    interval: int = Field(
+        default=10, ge=1, description="Number of pages between checkpoint writes"
+    )
+
+
 class SensorThingsConfig(BaseModel):
     """Main configuration for SensorThings harvester."""
 
@@ -66,6 +95,33 @@ class SensorThingsConfig(BaseModel):
     pagination: PaginationConfig = Field(
         default_factory=PaginationConfig, description="Pagination settings"
     )
+    checkpoint: CheckpointConfig = Field(
+        default_factory=CheckpointConfig, description="Resumable harvest settings"
+    )
+    trusted_source: TrustedSourceConfig = Field(
+        default_factory=TrustedSourceConfig,
+        description="Settings for skipping validation on trusted servers",
+    )
+    intern_entities: bool = Field(
+        default=False,
+        description="Share one instance of Sensors, ObservedProperties and Locations "
+        "between all Things referencing them",
+    )
+    columnar: bool = Field(
+        default=False,
+        description="Build a columnar table of the harvested Things, "
+        "requires the 'columnar' extra",
+    )
+    keep_things: bool = Field(
+        default=True,
+        description="Keep the harvested Thing objects in columnar mode, "
+        "otherwise only the table is kept",
+    )
+    harvest_on_init: bool = Field(
+        default=True,
+        description="Fetch all Things when the harvester is created, "
+        "otherwise on first access",
+    )
     default_limit: int = Field(
         default=-1, description="Default limit for fetching items (-1 for no limit)"
     )
@@ -0,0 +1,188 @@
+"""
+Fast model construction for trusted SensorThings servers.
+
+Full pydantic validation of every entity is the dominant CPU cost when harvesting
+large servers. For servers whose payloads are known to be well-formed, models can
+be built with `model_construct` instead. The alias lookups, nested model types and
+coercions needed for that are resolved once per model class and reused for every
+item.
+"""
+
+import random
+from dataclasses import dataclass
+from enum import Enum
+from functools import cache
+from types import NoneType, UnionType
+from typing import Any, Union, get_args, get_origin
+
+from pydantic import BaseModel, ValidationError
+
+from wrench.log import logger
+
+
+class _FieldKind(Enum):
+    PLAIN = "plain"
+    STR = "str"
+    TUPLE = "tuple"
+    MODEL = "model"
+    MODEL_LIST = "model_list"
+
+
+@dataclass(frozen=True, slots=True)
+class _FieldPlan:
+    name: str
+    keys: tuple[str, ...]
+    kind: _FieldKind
+    model: type[BaseModel] | None = None
+
+
+def _unwrap_optional(annotation: Any) -> Any:
+    """Strip `None` from `X | None` annotations."""
+    if get_origin(annotation) in (Union, UnionType):
+        args = [arg for arg in get_args(annotation) if arg is not NoneType]
+        if len(args) == 1:
+            return args[0]
+    return annotation
+
+
+def _is_model(annotation: Any) -> bool:
+    return isinstance(annotation, type) and issubclass(annotation, BaseModel)
+
+
+@cache
+def _compile(model_class: type[BaseModel]) -> tuple[_FieldPlan, ...]:
+    """
+    Resolve the construction plan for a model class.
+
+    Args:
+        model_class (type[BaseModel]): The model class to compile.
+
+    Returns:
+        tuple[_FieldPlan, ...]: One plan per model field, in declaration order.
+    """
+    plans = []
+    for name, field in model_class.model_fields.items():
+        # alias first, the field name is accepted as well (populate_by_name)
+        keys = tuple(dict.fromkeys(key for key in (field.alias, name) if key))
+        annotation = _unwrap_optional(field.annotation)
+        origin = get_origin(annotation)
+
+        if _is_model(annotation):
+            plans.append(_FieldPlan(name, keys, _FieldKind.MODEL, annotation))
+        elif (
+            origin is list
+            and get_args(annotation)
+            and _is_model(get_args(annotation)[0])
+        ):
+            plans.append(
+                _FieldPlan(name, keys, _FieldKind.MODEL_LIST, get_args(annotation)[0])
+            )
+        elif annotation is str:
+            plans.append(_FieldPlan(name, keys, _FieldKind.STR))
+        elif origin is tuple:
+            plans.append(_FieldPlan(name, keys, _FieldKind.TUPLE))
+        else:
+            plans.append(_FieldPlan(name, keys, _FieldKind.PLAIN))
+
+    return tuple(plans)
+
+
+def fast_construct[M: BaseModel](model_class: type[M], data: dict[str, Any]) -> M:
+    """
+    Build a model from raw data without running pydantic validation.
+
+    Nested models and lists of models are constructed recursively, numbers in
+    string fields are converted to strings (mirroring `coerce_numbers_to_str`) and
+    tuple fields are converted from JSON arrays. Unknown keys are ignored.
+
+    Args:
+        model_class (type[M]): The model class to construct.
+        data (dict[str, Any]): Raw item data keyed by alias or field name.
+
+    Returns:
+        M: The constructed, unvalidated model instance.
+    """
+    values: dict[str, Any] = {}
+    for plan in _compile(model_class):
+        for key in plan.keys:
+            if key in data:
+                value = data[key]
+                break
+        else:
+            continue
+
+        if value is not None:
+            match plan.kind:
+                case _FieldKind.MODEL if isinstance(value, dict):
+                    value = fast_construct(plan.model, value)  # type: ignore[arg-type]
+                case _FieldKind.MODEL_LIST:
+                    value = [
+                        fast_construct(plan.model, v)  # type: ignore[arg-type]
+                        if isinstance(v, dict)
+                        else v
+                        for v in value
+                    ]
+                case _FieldKind.STR if isinstance(value, (int, float)):
+                    value = str(value)
+                case _FieldKind.TUPLE if isinstance(value, list):
+                    value = tuple(value)
+
+        values[plan.name] = value
+
+    return model_class.model_construct(**values)
+
+
+class TrustedModelFactory[M: BaseModel]:
+    """
+    Builds models with `fast_construct`, validating a sample of the items.
+
+    The first item and a random fraction of the following items are fully
+    validated, so changes in the server's schema surface as validation errors
+    instead of silently producing broken models.
+    """
+
+    def __init__(
+        self, model_class: type[M], sample_rate: float, seed: int | None = None
+    ):
+        """
+        Initializes the factory for the given model class.
+
+        Args:
+            model_class (type[M]): The model class to build.
+            sample_rate (float): Fraction of items that are fully validated.
+            seed (int | None, optional): Seed for the sampling. Defaults to None.
+        """
+        self.model_class = model_class
+        self.sample_rate = sample_rate
+        self.validated_count = 0
+        self.constructed_count = 0
+        self._rng = random.Random(seed)
+        self.logger = logger.getChild(self.__class__.__name__)
+
+    def __call__(self, data: dict[str, Any]) -> M:
+        """
+        Build a model instance from raw item data.
+
+        Args:
+            data (dict[str, Any]): Raw item data from the API response.
+
+        Returns:
+            M: The model instance.
+
+        Raises:
+            ValidationError: If a sampled item does not match the model schema.
+        """
+        if self.validated_count == 0 or self._rng.random() < self.sample_rate:
+            self.validated_count += 1
+            try:
+                return self.model_class.model_validate(data)
+            except ValidationError:
+                self.logger.error(
+                    "Sampled %s failed validation, the server schema may have "
+                    "changed; disable the trusted source mode for this server",
+                    self.model_class.__name__,
+                )
+                raise
+
+        self.constructed_count += 1
+        return fast_construct(self.model_class, data)
@@ -1,18 +1,31 @@
+import math
+import random
 import time
+from collections.abc import Callable
 from datetime import datetime, timezone
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 import requests
 from geojson import Polygon
 
+from wrench.exceptions import HarvesterError
 from wrench.harvester.base import BaseHarvester
 from wrench.log import logger
 from wrench.models import CommonMetadata, Item, TimeFrame
 
+from .checkpoint import HarvestCheckpoint
 from .config import SensorThingsConfig
+from .construct import TrustedModelFactory
+from .interning import EntityInterner
 from .models import GenericLocation, Location, SensorThingsBase, Thing
+from .querybuilder import ThingQuery
+from .quickscan import ExtentConfidence, QuickScanResult
 from .translator import LibreTranslateService
 
+if TYPE_CHECKING:
+    from .columnar import ThingTable
+
 
 class SensorThingsHarvester(BaseHarvester):
     """
@@ -39,7 +52,12 @@ class SensorThingsHarvester(BaseHarvester):
             logger (Logger): Logger instance.
             translator (LibreTranslateService | None): Translator service if configured.
             location_model (type[GenericLocation]): Location model.
-            things (list): Fetched things based on default limit.
+            interner (EntityInterner | None): Shares the sub-entities of the
+                harvested things if configured.
+            things (list): Fetched things based on default limit, harvested on
+                first access if `harvest_on_init` is disabled. Not kept in
+                columnar mode with `keep_things` disabled.
+            table (ThingTable | None): Columnar view of the things if configured.
         """
         # Load config if path is provided
         if isinstance(config, (str, Path)):
@@ -57,8 +75,73 @@ class SensorThingsHarvester(BaseHarvester):
         )
 
         self.location_model = location_model
+        self.interner = EntityInterner() if self.config.intern_entities else None
+
+        self._things: list[Thing] | None = None
+        self.table: "ThingTable | None" = None
+
+        if self.config.harvest_on_init:
+            self.harvest()
+
+    @property
+    def keeps_things(self) -> bool:
+        """Whether the harvested Thing objects are kept."""
+        return not self.config.columnar or self.config.keep_things
+
+    @property
+    def things(self) -> list[Thing]:
+        """
+        Things fetched based on default limit, harvested on first access.
+
+        Raises:
+            HarvesterError: If only the columnar table is kept.
+        """
+        if not self.keeps_things:
+            raise HarvesterError(
+                "Things are not kept in columnar mode with 'keep_things' disabled, "
+                "use the table instead"
+            )
+        if self._things is None:
+            self.harvest()
+        return self._things  # type: ignore[return-value]
+
+    def harvest(self) -> list[Thing]:
+        """
+        Fetches all Things based on the default limit.
+
+        Builds the columnar table as well if configured, filling it page by page.
+        With `keep_things` disabled, the Things of a page are dropped once they
+        are added to the table.
+
+        Returns:
+            list[Thing]: The harvested Things, empty if they are not kept.
+        """
+        self.interner = EntityInterner() if self.config.intern_entities else None
+        builder = None
+        if self.config.columnar:
+            from . import columnar
+
+            builder = columnar.ThingTableBuilder()
+
+        def prepare(things: list[Thing]) -> list[Thing]:
+            things = self._prepare_things(things, self.interner)
+            if builder is None:
+                return things
+            for thing in things:
+                builder.append(thing)
+            return things if self.keeps_things else []
 
-        self.things = self.fetch_things(limit=self.config.default_limit)
+        self._things = self._fetch_things(self.config.default_limit, prepare)
+
+        if builder is not None:
+            self.table = builder.build()
+            self.logger.debug(
+                "Built columnar table with %d rows, %d bytes",
+                len(self.table),
+                self.table.nbytes,
+            )
+
+        return self._things
 
     def get_metadata(self) -> CommonMetadata:
         """
@@ -73,16 +156,19 @@ class SensorThingsHarvester(BaseHarvester):
                             identifier, description, spatial extent, temporal extent,
                             source type, and last updated time.
         """
-        # get locations of each thing, put them into a set to avoid duplicates
-        locations = {
-            loc.get_coordinates()
-            for thing in self.things
-            if thing.location
-            for loc in thing.location
-        }
-
-        geographic_extent = self._calculate_geographic_extent(locations)
-        timeframe = self._calculate_timeframe(self.things)
+        if self._things is None:
+            self.harvest()
+
+        if self.table is not None:
+            # vectorized over the columnar table
+            geographic_extent = self._bounding_box(*self.table.extent())
+            start_time, latest_time = self.table.time_range()
+            timeframe = TimeFrame(start_time=start_time, latest_time=latest_time)
+        else:
+            things = self.things
+            locations = self._distinct_locations(things, self.interner)
+            geographic_extent = self._calculate_geographic_extent(locations)
+            timeframe = self._calculate_timeframe(things)
 
         return CommonMetadata(
             endpoint_url=self.config.base_url,
@@ -117,22 +203,111 @@ class SensorThingsHarvester(BaseHarvester):
         Raises:
             Exception: Logs error and returns original Thing if translation fails.
         """
+        interner = EntityInterner() if self.config.intern_entities else None
+        return self._fetch_things(
+            limit, lambda things: self._prepare_things(things, interner)
+        )
+
+    def _fetch_things(
+        self, limit: int, prepare: Callable[[list[Thing]], list[Thing]]
+    ) -> list[Thing]:
+        """
+        Fetches Things, preparing the Things of every page as soon as it arrives.
+
+        Args:
+            limit (int): Max number of Things to fetch, -1 for no limit.
+            prepare (Callable[[list[Thing]], list[Thing]]): Prepares the Things of
+                a page and returns the Things to keep.
+
+        Returns:
+            list[Thing]: The kept Things.
+        """
         self.logger.debug("Fetching %d things", limit if limit != -1 else 0)
-        things = self._fetch_paginated(
-            "Things?$expand=Locations,Datastreams($expand=Sensor)",
+        return self._fetch_paginated(
+            "Things?$expand=Locations,Datastreams($expand=Sensor,ObservedProperty)",
             Thing,
             limit=limit,
+            prepare=prepare,
         )
 
-        if not self.translator:
+    def _prepare_things(
+        self, things: list[Thing], interner: EntityInterner | None = None
+    ) -> list[Thing]:
+        """
+        Translates and interns fetched Things if configured.
+
+        Called for every page, so duplicate sub-entities of a page are released
+        before the next page is fetched.
+
+        Args:
+            things (list[Thing]): Fetched Things.
+            interner (EntityInterner | None, optional): Interner sharing the
+                sub-entities. Defaults to None (no interning).
+
+        Returns:
+            list[Thing]: The prepared Things.
+        """
+        if self.translator:
+            things = self._translate_things(things)
+
+        if interner is not None:
+            things = [interner.intern_thing(thing) for thing in things]
+            self.logger.debug(
+                "Interned %d shared entities, replaced %d references",
+                len(interner),
+                interner.hits,
+            )
+
+        return things
+
+    @staticmethod
+    def _distinct_locations(
+        things: list[Thing], interner: EntityInterner | None
+    ) -> set[tuple[float, float]]:
+        """
+        Collect the distinct coordinates of Things.
+
+        With interning, the coordinates are read from the views of the interned
+        Locations instead of walking the Location lists of every Thing.
+
+        Args:
+            things (list[Thing]): The Things.
+            interner (EntityInterner | None): Interner of the Things, if any.
+
+        Returns:
+            set[tuple[float, float]]: The distinct coordinates.
+        """
+        if interner is not None:
+            return {
+                view.get_coordinates() for view in interner.location_views().values()
+            }
+        return {
+            loc.get_coordinates()
+            for thing in things
+            if thing.location
+            for loc in thing.location
+        }
+
+    def _translate_things(self, things: list[Thing]) -> list[Thing]:
+        """
+        Translates a list of Things with the configured translator.
+
+        Args:
+            things (list[Thing]): Things to translate.
+
+        Returns:
+            list[Thing]: Translated Things, the original Thing if translation fails,
+            the Things unchanged without a translator.
+        """
+        translator = self.translator
+        if translator is None:
             return things
 
-        # Run translation if translator exists
         self.logger.debug("Translator was configured, starting translation")
         translated_things = []
         for thing in things:
             try:
-                translated_thing = self.translator.translate(thing)
+                translated_thing = translator.translate(thing)
                 translated_things.append(translated_thing)
             except Exception as e:
                 self.logger.error("Translation failed for thing %s: %s", thing.id, e)
@@ -140,6 +315,128 @@ class SensorThingsHarvester(BaseHarvester):
 
         return translated_things
 
+    def quick_scan(
+        self,
+        sample_size: int = 500,
+        max_requests: int = 5,
+        confidence_level: float = 0.95,
+        seed: int | None = None,
+    ) -> QuickScanResult:
+        """
+        Estimates the server metadata from a random sample of Things.
+
+        The number of Things is requested with `$count`, then `max_requests` windows
+        of consecutive Things at random, non-overlapping `$skip` offsets are
+        fetched, ordered by id so that the windows partition the same sequence in
+        every request. Extent and timeframe of the sample are returned as estimated
+        metadata together with order-statistics confidence information. Since
+        Things within one window are not independent, the confidence counts the
+        windows contributing values, not the Things; more requests with smaller
+        windows give a more representative sample and a tighter confidence.
+
+        Args:
+            sample_size (int, optional): Number of Things to sample. Defaults to 500.
+            max_requests (int, optional): Maximum number of page requests.
+                                          Defaults to 5.
+            confidence_level (float, optional): Confidence level of the extent
+                                                estimates. Defaults to 0.95.
+            seed (int | None, optional): Seed for choosing the offsets.
+
+        Returns:
+            QuickScanResult: Estimated metadata, the sampled Things and confidence
+            information. The sample can be used to train the TELEClassGrouper.
+
+        Raises:
+            HarvesterError: If the server does not report the number of Things.
+        """
+        total = self._fetch_count(ThingQuery())
+        window = max(1, math.ceil(min(sample_size, total) / max(1, max_requests)))
+        slots = math.ceil(total / window)
+        offsets = sorted(
+            random.Random(seed).sample(range(slots), min(slots, max_requests))
+        )
+        self.logger.info(
+            "Quick scan of %d things with %d requests of %d things",
+            total,
+            len(offsets),
+            window,
+        )
+
+        build_item = self._model_builder(Thing)
+        interner = EntityInterner() if self.config.intern_entities else None
+        sample: list[Thing] = []
+        located_windows = timed_windows = 0
+        for slot in offsets:
+            query = (
+                ThingQuery()
+                .expand("Locations")
+                .expand("Datastreams", {"Sensor", "ObservedProperty"})
+                .order_by("id")
+                .limit(window)
+                .skip(slot * window)
+            )
+            page_data = self._fetch_page(
+                f"{self.config.base_url}/{query.build()}"
+            ).json()
+            things = self._prepare_things(
+                self._process_page_items(
+                    page_data.get("value", []), Thing, window, build_item
+                ),
+                interner,
+            )
+            located_windows += any(thing.location for thing in things)
+            timed_windows += any(
+                ds.phenomenon_time for thing in things for ds in thing.datastreams or []
+            )
+            sample.extend(things)
+            time.sleep(self.config.pagination.page_delay)
+
+        locations = self._distinct_locations(sample, interner)
+        timeframe = self._calculate_timeframe(sample)
+
+        metadata = CommonMetadata(
+            endpoint_url=self.config.base_url,
+            title=self.config.title,
+            identifier=self.config.identifier,
+            description=self.config.description,
+            spatial_extent=str(self._calculate_geographic_extent(locations)),
+            temporal_extent=timeframe,
+            source_type="sensorthings",
+            last_updated=timeframe.latest_time,
+        )
+
+        return QuickScanResult(
+            metadata=metadata,
+            sample=sample,
+            total_count=total,
+            requests=len(offsets) + 1,
+            spatial_confidence=ExtentConfidence.from_sample(
+                located_windows, confidence_level
+            ),
+            temporal_confidence=ExtentConfidence.from_sample(
+                timed_windows, confidence_level
+            ),
+        )
+
+    def _fetch_count(self, query: ThingQuery) -> int:
+        """
+        Fetch the number of entities matching a query.
+
+        Args:
+            query: Query for the entities to count
+
+        Returns:
+            int: Number of matching entities reported by the server
+
+        Raises:
+            HarvesterError: If the server does not report a count
+        """
+        url = f"{self.config.base_url}/{query.count().limit(0).build()}"
+        page_data = self._fetch_page(url).json()
+        if "@iot.count" not in page_data:
+            raise HarvesterError(f"Server did not return '@iot.count' for {url}")
+        return int(page_data["@iot.count"])
+
     def fetch_locations(self, limit: int = -1) -> list[GenericLocation]:
         """
         Fetches a list of locations from the SensorThings API.
@@ -156,7 +453,11 @@ class SensorThingsHarvester(BaseHarvester):
         return self._fetch_paginated("Locations", self.location_model, limit=limit)
 
     def _fetch_paginated[T: SensorThingsBase](
-        self, endpoint: str, model_class: type[T], limit: int = -1
+        self,
+        endpoint: str,
+        model_class: type[T],
+        limit: int = -1,
+        prepare: Callable[[list[T]], list[T]] | None = None,
     ) -> list[T]:
         """
         Fetch paginated data from a SensorThings API endpoint.
@@ -165,59 +466,127 @@ class SensorThingsHarvester(BaseHarvester):
             endpoint: API endpoint path to fetch from
             model_class: Pydantic model class to validate response data
             limit: Maximum number of items to fetch (-1 for no limit)
+            prepare: Called with the items of every page, returns the items to
+                keep (all items if not set)
 
         Returns:
             list[SensorThingsBase]: List of validated model instances
         """
         items: list[T] = []
+        fetched = 0
+        prepare = prepare or (lambda page_items: page_items)
         page_count = 1
-        current_url = f"{self.config.base_url}/{endpoint}"
+        first_url = f"{self.config.base_url}/{endpoint}"
+        # None once the last page was fetched, also in a resumed checkpoint
+        current_url: str | None = first_url
         remaining_items = limit if limit != -1 else None
-
-        while current_url and (remaining_items is None or remaining_items > 0):
-            self.logger.info("Fetching page %d", page_count)
-
-            try:
-                # Fetch and parse page data
-                response = self._fetch_page(current_url)
-                page_data = response.json()
-
-                # Check for valid response structure
-                if "value" not in page_data:
-                    self.logger.warning(
-                        "No 'value' field in response, stopping pagination"
-                    )
-                    break
-
-                # Process items from current page
-                new_items = self._process_page_items(
-                    page_data["value"], model_class, remaining_items
+        build_item = self._model_builder(model_class)
+
+        checkpoint = self._checkpoint(first_url, limit)
+        if checkpoint is not None:
+            state, spooled_items = checkpoint.load()
+            if state is not None:
+                resumed = self._process_page_items(
+                    spooled_items, model_class, build_item=build_item
                 )
-                items.extend(new_items)
-
+                fetched = len(resumed)
+                items = prepare(resumed)
+                current_url = state.next_url
+                page_count = state.page_count
+                remaining_items = state.remaining_items
                 self.logger.info(
-                    "Added %d items from page %d", len(new_items), page_count
+                    "Resuming from checkpoint at page %d with %d items",
+                    page_count,
+                    fetched,
                 )
 
-                # Update remaining items count
-                if remaining_items is not None:
-                    remaining_items -= len(new_items)
-                    self.logger.debug("Remaining items to fetch: %d", remaining_items)
-
-                # Prepare for next page
-                current_url = page_data.get("@iot.nextLink")
-                if current_url:
-                    time.sleep(self.config.pagination.page_delay)
+        completed = False
+        try:
+            while current_url and (remaining_items is None or remaining_items > 0):
+                self.logger.info("Fetching page %d", page_count)
+
+                try:
+                    # Fetch and parse page data
+                    response = self._fetch_page(current_url)
+                    page_data = response.json()
+
+                    # Check for valid response structure
+                    if "value" not in page_data:
+                        self.logger.warning(
+                            "No 'value' field in response, stopping pagination"
+                        )
+                        break
+
+                    # Process items from current page
+                    new_items = self._process_page_items(
+                        page_data["value"], model_class, remaining_items, build_item
+                    )
+                    fetched += len(new_items)
+                    items.extend(prepare(new_items))
 
-                page_count += 1
+                    self.logger.info(
+                        "Added %d items from page %d", len(new_items), page_count
+                    )
 
-            except requests.RequestException as e:
-                self.logger.error("Failed to fetch page %d: %s", page_count, e)
-                break
+                    # Update remaining items count
+                    if remaining_items is not None:
+                        remaining_items -= len(new_items)
+                        self.logger.debug(
+                            "Remaining items to fetch: %d", remaining_items
+                        )
+
+                    # Prepare for next page
+                    current_url = page_data.get("@iot.nextLink")
+                    if checkpoint is not None:
+                        checkpoint.add_page(
+                            page_data["value"][: len(new_items)],
+                            current_url,
+                            page_count + 1,
+                            remaining_items,
+                        )
+                    if current_url:
+                        time.sleep(self.config.pagination.page_delay)
+
+                    page_count += 1
+
+                except requests.RequestException as e:
+                    self.logger.error("Failed to fetch page %d: %s", page_count, e)
+                    break
+            else:
+                completed = True
+        finally:
+            if checkpoint is not None:
+                if completed:
+                    checkpoint.clear()
+                else:
+                    checkpoint.flush()
+                    self.logger.info(
+                        "Saved progress in %s, harvest again to resume at page %d",
+                        checkpoint.path,
+                        page_count,
+                    )
 
-        self.logger.info("Finished fetching data, retrieved %d items", len(items))
+        self.logger.info("Finished fetching data, retrieved %d items", fetched)
         return items
 
+    def _checkpoint(self, url: str, limit: int) -> HarvestCheckpoint | None:
+        """
+        Create the checkpoint for a paginated harvest if configured.
+
+        Args:
+            url: URL of the first page
+            limit: Maximum number of items to fetch
+
+        Returns:
+            HarvestCheckpoint | None: The checkpoint, None if disabled
+        """
+        checkpoint_config = self.config.checkpoint
+        if not checkpoint_config.enabled:
+            return None
+        return HarvestCheckpoint(
+            checkpoint_config.directory, url, limit, checkpoint_config.interval
+        )
+
     def _fetch_page(self, url: str) -> requests.Response:
         """
         Fetch a single page of data from the API.
@@ -235,11 +604,36 @@ class SensorThingsHarvester(BaseHarvester):
         response.raise_for_status()
         return response
 
+    def _model_builder[T: SensorThingsBase](
+        self, model_class: type[T]
+    ) -> Callable[[dict], T]:
+        """
+        Select how items of a model class are built from raw data.
+
+        Args:
+            model_class: Pydantic model class to build
+
+        Returns:
+            Callable[[dict], T]: Full validation, or sampled validation with fast
+            construction if the server is configured as trusted source.
+        """
+        trusted = self.config.trusted_source
+        if not trusted.enabled:
+            return model_class.model_validate
+
+        self.logger.debug(
+            "Trusted source mode, validating %.1f%% of %s items",
+            trusted.sample_rate * 100,
+            model_class.__name__,
+        )
+        return TrustedModelFactory(model_class, trusted.sample_rate)
+
     def _process_page_items[T: SensorThingsBase](
         self,
         items: list[dict],
         model_class: type[T],
         remaining_limit: int | None = None,
+        build_item: Callable[[dict], T] | None = None,
     ) -> list[T]:
         """
         Process and validate items from a page.
@@ -248,17 +642,19 @@ class SensorThingsHarvester(BaseHarvester):
             items: Raw item data from API response
             model_class: Pydantic model class for validation
             remaining_limit: Maximum items to process (None for no limit)
+            build_item: Builder for model instances, defaults to full validation
 
         Returns:
             list[SensorThingsBase]: List of validated model instances
         """
         processed_items: list[T] = []
+        build_item = build_item or model_class.model_validate
 
         for item in items:
             if remaining_limit is not None and len(processed_items) >= remaining_limit:
                 break
 
-            validated_item = model_class.model_validate(item)
+            validated_item = build_item(item)
             processed_items.append(validated_item)
 
         return processed_items
@@ -290,13 +686,27 @@ class SensorThingsHarvester(BaseHarvester):
             bounds["min_lng"] = min(bounds["min_lng"], lng)
             bounds["max_lng"] = max(bounds["max_lng"], lng)
 
+        return self._bounding_box(
+            bounds["min_lng"], bounds["min_lat"], bounds["max_lng"], bounds["max_lat"]
+        )
+
+    @staticmethod
+    def _bounding_box(
+        min_lng: float, min_lat: float, max_lng: float, max_lat: float
+    ) -> Polygon:
+        """
+        Create the polygon of a bounding box.
+
+        Returns:
+            Polygon: GeoJSON polygon representing the bounding box
+        """
         # Create polygon coordinates
         coordinates = [
-            (bounds["min_lat"], bounds["min_lng"]),
-            (bounds["min_lat"], bounds["max_lng"]),
-            (bounds["max_lat"], bounds["max_lng"]),
-            (bounds["max_lat"], bounds["min_lng"]),
-            (bounds["min_lat"], bounds["min_lng"]),  # Close the polygon
+            (min_lat, min_lng),
+            (min_lat, max_lng),
+            (max_lat, max_lng),
+            (max_lat, min_lng),
+            (min_lat, min_lng),  # Close the polygon
         ]
 
         return Polygon([coordinates])
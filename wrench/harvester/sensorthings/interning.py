@@ -0,0 +1,229 @@
+"""
+Interning of shared SensorThings sub-entities.
+
+Within one server many Datastreams reference the same Sensor and ObservedProperty,
+and co-located Things share the same Location. The API expands them into separate
+copies for every reference. The interner replaces these copies with one canonical
+instance per entity, so all references share the same object and properties dict.
+"""
+
+import hashlib
+from types import MappingProxyType
+from typing import Any, Mapping
+
+from .models import GenericLocation, ObservedProperty, Sensor, SensorThingsBase, Thing
+
+
+class EntityView:
+    """
+    Lightweight read-only view of an interned SensorThings entity.
+
+    Uses `__slots__` instead of a pydantic model, for consumers which only read
+    entity attributes of large harvests.
+    """
+
+    __slots__ = ("id", "name", "description", "properties")
+
+    id: str
+    name: str
+    description: str
+    properties: Mapping[str, Any] | None
+
+    def __init__(self, entity: SensorThingsBase):
+        """
+        Creates a view from a SensorThings entity.
+
+        Args:
+            entity (SensorThingsBase): The entity to view.
+        """
+        object.__setattr__(self, "id", entity.id)
+        object.__setattr__(self, "name", entity.name)
+        object.__setattr__(self, "description", entity.description)
+        object.__setattr__(
+            self,
+            "properties",
+            MappingProxyType(entity.properties) if entity.properties else None,
+        )
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        """Prevent modification of the view."""
+        raise AttributeError(f"{self.__class__.__name__} is read-only")
+
+    def __repr__(self) -> str:
+        """Returns a short representation with id and name."""
+        return f"{self.__class__.__name__}(id={self.id!r}, name={self.name!r})"
+
+
+class SensorView(EntityView):
+    __slots__ = ("encoding_type",)
+
+    encoding_type: str
+
+    def __init__(self, entity: Sensor):
+        """
+        Creates a view from a Sensor.
+
+        Args:
+            entity (Sensor): The sensor to view.
+        """
+        super().__init__(entity)
+        object.__setattr__(self, "encoding_type", entity.encoding_type)
+
+
+class ObservedPropertyView(EntityView):
+    __slots__ = ()
+
+
+class LocationView(EntityView):
+    __slots__ = ("encoding_type", "coordinates")
+
+    encoding_type: str
+    coordinates: tuple[float, float]
+
+    def __init__(self, entity: GenericLocation):
+        """
+        Creates a view from a Location.
+
+        Args:
+            entity (GenericLocation): The location to view.
+        """
+        super().__init__(entity)
+        object.__setattr__(self, "encoding_type", entity.encoding_type)
+        object.__setattr__(self, "coordinates", tuple(entity.get_coordinates()))
+
+    def get_coordinates(self) -> tuple[float, float]:
+        """
+        Retrieves the coordinates of the location.
+
+        Returns:
+            tuple[float, float]: Tuple with longitude and latitude of the location.
+        """
+        return self.coordinates
+
+
+def as_view(entity: SensorThingsBase) -> EntityView:
+    """
+    Creates the matching read-only view for an entity.
+
+    Args:
+        entity (SensorThingsBase): The entity to view.
+
+    Returns:
+        EntityView: The view for the entity.
+    """
+    if isinstance(entity, GenericLocation):
+        return LocationView(entity)
+    if isinstance(entity, ObservedProperty):
+        return ObservedPropertyView(entity)
+    if isinstance(entity, Sensor):
+        return SensorView(entity)
+    return EntityView(entity)
+
+
+class EntityInterner:
+    """
+    Deduplicates Sensors, ObservedProperties and Locations of harvested Things.
+
+    Entities are keyed by their type and `@iot.id`. Entities without an id are
+    keyed by a hash of their content instead.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initializes an empty interner.
+
+        Attributes:
+            hits (int): Number of references replaced by a canonical instance.
+        """
+        self._entities: dict[tuple[type, str], SensorThingsBase] = {}
+        self._views: dict[tuple[type, str], EntityView] = {}
+        self.hits = 0
+
+    def __len__(self) -> int:
+        """Returns the number of distinct interned entities."""
+        return len(self._entities)
+
+    @staticmethod
+    def _key(entity: SensorThingsBase) -> tuple[type, str]:
+        if entity.id:
+            return type(entity), entity.id
+
+        content = entity.model_dump_json().encode()
+        return type(entity), hashlib.blake2b(content, digest_size=16).hexdigest()
+
+    def intern[E: SensorThingsBase](self, entity: E) -> E:
+        """
+        Returns the canonical instance for an entity.
+
+        Args:
+            entity (E): The entity to intern.
+
+        Returns:
+            E: The canonical instance, `entity` itself if it was not seen before.
+        """
+        canonical = self._entities.setdefault(self._key(entity), entity)
+        if canonical is not entity:
+            self.hits += 1
+        return canonical  # type: ignore[return-value]
+
+    def intern_thing(self, thing: Thing) -> Thing:
+        """
+        Replaces the sub-entities of a Thing with their canonical instances.
+
+        The Thing is modified in place.
+
+        Args:
+            thing (Thing): The Thing to intern.
+
+        Returns:
+            Thing: The same Thing, referencing only canonical sub-entities.
+        """
+        for datastream in thing.datastreams or []:
+            datastream.sensor = self.intern(datastream.sensor)
+            if datastream.observed_property:
+                datastream.observed_property = self.intern(datastream.observed_property)
+
+        if thing.location:
+            thing.location = [self.intern(loc) for loc in thing.location]
+
+        return thing
+
+    def views[E: SensorThingsBase](self, entity_type: type[E]) -> dict[str, EntityView]:
+        """
+        Returns read-only views of all interned entities of a type.
+
+        Views are created once and reused on later calls.
+
+        Args:
+            entity_type (type[E]): The entity type, e.g. `Sensor` or `Location`.
+
+        Returns:
+            dict[str, EntityView]: Views keyed by entity id (or content hash).
+        """
+        return {
+            key[1]: self._view(key)
+            for key in self._entities
+            if issubclass(key[0], entity_type)
+        }
+
+    def location_views(self) -> dict[str, LocationView]:
+        """
+        Returns read-only views of all interned Locations of any encoding.
+
+        Returns:
+            dict[str, LocationView]: Views keyed by entity id (or content hash).
+        """
+        views: dict[str, LocationView] = {}
+        for key in self._entities:
+            if not issubclass(key[0], GenericLocation):
+                continue
+            view = self._view(key)
+            if isinstance(view, LocationView):
+                views[key[1]] = view
+        return views
+
+    def _view(self, key: tuple[type, str]) -> EntityView:
+        """Returns the view of an interned entity, creating it on first use."""
+        if key not in self._views:
+            self._views[key] = as_view(self._entities[key])
+        return self._views[key]
@@ -251,6 +251,7 @@ class QueryOptions(BaseModel):
     skip: int | None = None
     orderby: str | None = None
     filter: str | None = None
+    count: bool = False
 
 
 class Query(ABC):
@@ -362,6 +363,42 @@ class Query(ABC):
         self.options.limit = n
         return self
 
+    def skip(self, n: int) -> "Query":
+        """
+        Sets the number of records to skip before returning results.
+
+        Args:
+            n (int): The number of records to skip.
+
+        Returns:
+            Query: The current query instance with the skip applied.
+        """
+        self.options.skip = n
+        return self
+
+    def order_by(self, expression: str) -> "Query":
+        """
+        Sets the order of the returned records.
+
+        Args:
+            expression (str): The ordering, e.g. "id" or "name desc".
+
+        Returns:
+            Query: The current query instance with the ordering applied.
+        """
+        self.options.orderby = expression
+        return self
+
+    def count(self) -> "Query":
+        """
+        Requests the total number of matching records in the response.
+
+        Returns:
+            Query: The current query instance with the count applied.
+        """
+        self.options.count = True
+        return self
+
     def filter(self, expression: FilterExpression) -> "Query":
         """Add a filter expression to the query."""
         self.options.filter = str(expression)
@@ -379,16 +416,18 @@ class Query(ABC):
         # Handle expansions
         if self.expansions:
             expand_parts = []
-            for exp in self.expansions:
+            # sorted, so equal queries always build the same URL
+            for exp in sorted(self.expansions):
                 if exp in self.nested_expansions and self.nested_expansions[exp]:
-                    nested = f"{exp}($expand={','.join(self.nested_expansions[exp])})"
+                    nested_names = ",".join(sorted(self.nested_expansions[exp]))
+                    nested = f"{exp}($expand={nested_names})"
                     expand_parts.append(nested)
                 else:
                     expand_parts.append(exp)
             params["$expand"] = ",".join(expand_parts)
 
         # Add other query options
-        if self.options.limit:
+        if self.options.limit is not None:
             params["$top"] = self.options.limit
         if self.options.skip:
             params["$skip"] = self.options.skip
@@ -396,6 +435,8 @@ class Query(ABC):
             params["$orderby"] = self.options.orderby
         if self.options.filter:
             params["$filter"] = self.options.filter
+        if self.options.count:
+            params["$count"] = "true"
 
         param_url = urlencode(params)
 
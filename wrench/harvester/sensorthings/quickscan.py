@@ -0,0 +1,89 @@
+"""
+Result models for sampled quick scans of SensorThings servers.
+
+A quick scan estimates the metadata of a server from a random sample of Things
+instead of a full harvest. The sample consists of windows of consecutive Things at
+random offsets. Things within a window are not independent, so the confidence
+attached to the estimated extents treats every window as one sample and is based
+on order statistics: for `n` independent windows, the sample maximum exceeds the
+`q`-quantile of the window maxima with probability `1 - q**n`.
+"""
+
+import math
+
+from pydantic import BaseModel, ConfigDict, Field, computed_field
+
+from wrench.models import CommonMetadata
+
+from .models import Thing
+
+
+def extreme_quantile(sample_size: int, confidence_level: float) -> float:
+    """
+    Calculate the quantile a sample extreme exceeds with the given confidence.
+
+    Args:
+        sample_size (int): Number of independent samples.
+        confidence_level (float): Desired confidence, e.g. 0.95.
+
+    Returns:
+        float: The quantile `q`, such that the sample maximum is at least the
+        population's `q`-quantile (and the minimum at most its `1 - q`-quantile)
+        with probability `confidence_level`. 0.0 for an empty sample.
+    """
+    if sample_size <= 0:
+        return 0.0
+    return math.pow(1.0 - confidence_level, 1.0 / sample_size)
+
+
+class ExtentConfidence(BaseModel):
+    """Confidence information for an extent estimated from a sample."""
+
+    confidence_level: float = Field(description="Probability the bounds hold")
+    sample_size: int = Field(
+        description="Number of independently sampled windows contributing values "
+        "to the extent"
+    )
+    quantile: float = Field(
+        description="Each estimated bound lies beyond this quantile of the window "
+        "extremes (1 - quantile for lower bounds) with the confidence level"
+    )
+
+    @classmethod
+    def from_sample(
+        cls, sample_size: int, confidence_level: float
+    ) -> "ExtentConfidence":
+        """
+        Create the confidence information for a sample.
+
+        Args:
+            sample_size (int): Number of independent windows with values.
+            confidence_level (float): Desired confidence, e.g. 0.95.
+
+        Returns:
+            ExtentConfidence: The confidence information.
+        """
+        return cls(
+            confidence_level=confidence_level,
+            sample_size=sample_size,
+            quantile=extreme_quantile(sample_size, confidence_level),
+        )
+
+
+class QuickScanResult(BaseModel):
+    """Estimated metadata and representative Things from a sampled scan."""
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    metadata: CommonMetadata = Field(description="Metadata estimated from the sample")
+    sample: list[Thing] = Field(description="Randomly sampled Things")
+    total_count: int = Field(description="Number of Things on the server")
+    requests: int = Field(description="Number of requests used for the scan")
+    spatial_confidence: ExtentConfidence
+    temporal_confidence: ExtentConfidence
+
+    @computed_field  # type: ignore[prop-decorator]
+    @property
+    def sample_fraction(self) -> float:
+        """Fraction of the server's Things contained in the sample."""
+        return len(self.sample) / self.total_count if self.total_count else 1.0